@@ -1,42 +1,28 @@
 import streamlit as st
 import pandas as pd
-import calendar
-from datetime import datetime, date
-
-# --- KONSTANTEN ---
-MINDESTLOHN = 12.82
-MINIJOB_GRENZE = 556.0
-
-# Steuersätze und Zuschlagsraten
-RATES = {
-    "rentenversicherung_minijob": 0.036,
-    "sf_zuschlag_rate": 0.30,  # 30% SF-Zuschlag
-    "nacht_zuschlag_rate": 0.25, # 25% Nacht-Zuschlag
-    "pauschale_abzuege_ueber_minijob": 0.30 # 30% pauschale Abzüge bei Überschreitung
-}
-
-MONATE = [
-    'Januar', 'Februar', 'März', 'April', 'Mai', 'Juni',
-    'Juli', 'August', 'September', 'Oktober', 'November', 'Dezember'
-]
-
-# Feiertage NRW 2025 mit genauen Daten
-FEIERTAGE_NRW_2025 = {
-    (1, 1): 'Neujahr',
-    (4, 18): 'Karfreitag',
-    (4, 21): 'Ostermontag',
-    (5, 1): 'Tag der Arbeit',
-    (5, 29): 'Christi Himmelfahrt',
-    (6, 9): 'Pfingstmontag',
-    (6, 19): 'Fronleichnam',
-    (10, 3): 'Tag der Deutschen Einheit',
-    (11, 1): 'Allerheiligen',
-    (12, 25): '1. Weihnachtstag',
-    (12, 26): '2. Weihnachtstag'
-}
+import numpy as np
+import io
+import sys
+import zipfile
+from datetime import datetime
+from functools import wraps
+
+from lohnrechner import (
+    MONATE, BUNDESLAENDER, saetze_fuer_monat, saetze_fuer_ordinale, rates_und_grenze,
+    calculate_salary, get_feiertage, get_month_calendar_html,
+    MonatsDaten, Ueberschreitungen, monatsdaten_array, update_monthly_overview,
+    zeitjahr_auswerten, ordinal_als_datum, stunden_verteilung, simulate_status_risk, plan_year, scenario_grid,
+    kalender_statistik, kalender_statistik_monat, CSVFormatFehler, export_monthly_csv, import_monthly_csv,
+    monthly_data_to_frame, over_limits_to_frame, save_parquet, load_parquet, frame_to_session, LohnDatenbank,
+    write_payslips, run_cli, PROFIL
+)
 
 # --- HILFSFUNKTIONEN ---
 
+def als_prozent(satz: float) -> str:
+    """Satz als deutsche Prozentangabe, z. B. 0.036 -> '3,6%'."""
+    return f"{satz * 100:g}".replace('.', ',') + "%"
+
 def get_status_color(prozent: float) -> str:
     """Gibt die Farbe basierend auf dem Prozentsatz zurück."""
     if prozent > 100:
@@ -61,201 +47,136 @@ def get_thermometer_html(prozent: float) -> str:
         </div>
     """
 
-def get_month_calendar_html(year: int, month: int, feiertage: dict) -> str:
-    """Erstellt einen HTML-Kalender mit markierten Feiertagen."""
-    cal = calendar.monthcalendar(year, month)
-    month_name = MONATE[month-1]
-    
-    # Kalenderstile
-    styles = """
-    <style>
-        .calendar {
-            width: 100%;
-            border-collapse: collapse;
-            font-family: Arial, sans-serif;
-        }
-        .calendar th {
-            background-color: #f8f9fa;
-            padding: 10px;
-            text-align: center;
-            border: 1px solid #dee2e6;
-        }
-        .calendar td {
-            padding: 10px;
-            text-align: center;
-            border: 1px solid #dee2e6;
-        }
-        .holiday {
-            background-color: #ffebee;
-            color: #c62828;
-            font-weight: bold;
-        }
-        .today {
-            background-color: #e3f2fd;
-            font-weight: bold;
-        }
-        .month-title {
-            font-size: 1.2em;
-            font-weight: bold;
-            margin-bottom: 10px;
-            text-align: center;
-        }
-    </style>
-    """
-    
-    # Kalender HTML
-    html = f"{styles}<div class='month-title'>{month_name} {year}</div>"
-    html += "<table class='calendar'>"
-    html += "<tr><th>Mo</th><th>Di</th><th>Mi</th><th>Do</th><th>Fr</th><th>Sa</th><th>So</th></tr>"
-    
-    today = date.today()
-    
-    for week in cal:
-        html += "<tr>"
-        for day in week:
-            if day == 0:
-                html += "<td></td>"
-            else:
-                is_holiday = (month, day) in feiertage
-                holiday_name = feiertage.get((month, day), '')
-                
-                is_today = (day == today.day and month == today.month and year == today.year)
-                
-                cell_class = 'holiday' if is_holiday else 'today' if is_today else ''
-                
-                title_attr = f" title='{holiday_name}'" if is_holiday else ''
-                
-                html += f"<td class='{cell_class}'{title_attr}>{day}</td>"
-        html += "</tr>"
-    html += "</table>"
-    
-    return html
-
-def calculate_salary(grundlohn: float, stunden: float,
-                     sf_zuschlag: bool, sf_zuschlag_stunden: float,
-                     nacht_zuschlag: bool, nacht_zuschlag_stunden: float) -> dict: # Urlaubsentgelt entfernt
-    """Berechnet das Gehalt mit allen Zuschlägen und Abzügen."""
-    
-    brutto_grundlohn_stunden = grundlohn * stunden
-    brutto_grundlohn_fuer_grenze = brutto_grundlohn_stunden # Urlaubsentgelt nicht mehr enthalten
-    
-    zuschlage = 0.0
-    if sf_zuschlag:
-        sf_stunden = min(sf_zuschlag_stunden, stunden)
-        zuschlage += grundlohn * sf_stunden * RATES["sf_zuschlag_rate"]
-        
-    if nacht_zuschlag:
-        nacht_stunden = min(nacht_zuschlag_stunden, stunden)
-        zuschlage += grundlohn * nacht_stunden * RATES["nacht_zuschlag_rate"]
-            
-    brutto_gesamt = brutto_grundlohn_fuer_grenze + zuschlage 
-    
-    rentenversicherung_abzug = 0.0
-    pauschale_abzuege = 0.0
-    gesamte_abzuege = 0.0
-    
-    if brutto_grundlohn_fuer_grenze <= MINIJOB_GRENZE: 
-        rentenversicherung_abzug = brutto_grundlohn_fuer_grenze * RATES["rentenversicherung_minijob"]
-        gesamte_abzuege = rentenversicherung_abzug
-    else:
-        pauschale_abzuege = brutto_grundlohn_fuer_grenze * RATES["pauschale_abzuege_ueber_minijob"]
-        gesamte_abzuege = pauschale_abzuege
-            
-    netto = brutto_gesamt - gesamte_abzuege
-    
-    freibetrag_rest = max(0, MINIJOB_GRENZE - brutto_grundlohn_fuer_grenze)
-    rest_stunden = int(freibetrag_rest / grundlohn) if grundlohn > 0 else 0
-    
-    return {
-        'brutto_grundlohn_stunden': brutto_grundlohn_stunden, 
-        'brutto_grundlohn_fuer_grenze': brutto_grundlohn_fuer_grenze, 
-        'zuschlage': zuschlage,
-        'brutto_gesamt': brutto_gesamt,
-        'netto': netto,
-        'gesamte_abzuege': gesamte_abzuege,
-        'rentenversicherung_abzug': rentenversicherung_abzug,
-        'pauschale_abzuege': pauschale_abzuege,
-        'freibetrag_rest': freibetrag_rest,
-        'rest_stunden': rest_stunden
-    }
-
-# --- HAUPTTEIL DER STREAMLIT APP ---
-
-def main():
-    st.set_page_config(page_title="Gehaltsrechner 2025", layout="wide")
-    st.title("💰 Gehaltsrechner mit Zuschlägen 2025")
-    
-    # Initialisiere Session State für monatliche Daten
-    if 'monthly_data' not in st.session_state:
-        st.session_state.monthly_data = {
-            month: {
-                'grundlohn': MINDESTLOHN,
-                'stunden': 24.0,
-                'sf_zuschlag': False, 
-                'sf_zuschlag_stunden': 0.0, 
-                'nacht_zuschlag': False,
-                'nacht_zuschlag_stunden': 0.0
-            } for month in MONATE
-        }
-    
-    # Initialisiere Session State für manuelle Überschreitungen
-    if 'manual_over_limits' not in st.session_state:
-        st.session_state.manual_over_limits = [
-            {'month_index': -1, 'year': -1}, 
-            {'month_index': -1, 'year': -1}, 
-            {'month_index': -1, 'year': -1}  
-        ]
-
-    # Monat auswählen
-    selected_month = st.selectbox("Wähle einen Monat aus:", MONATE)
-    month_data = st.session_state.monthly_data[selected_month]
-    
-    st.divider() 
-    
+def get_heatmap_chart(werte: np.ndarray, loehne, stunden, titel: str, farben: str = 'viridis'):
+    """Erstellt eine Altair-Heatmap über Stundenlohn (y) und Stunden (x)."""
+    import altair as alt
+
+    df = pd.DataFrame({
+        'Stundenlohn': np.repeat(np.round(np.asarray(loehne, dtype=np.float64), 2), len(stunden)),
+        'Stunden': np.tile(np.asarray(stunden, dtype=np.float64), len(loehne)),
+        titel: np.round(np.asarray(werte).ravel(), 2)
+    })
+    return alt.Chart(df).mark_rect().encode(
+        x=alt.X('Stunden:O'),
+        y=alt.Y('Stundenlohn:O', sort='descending'),
+        color=alt.Color(f'{titel}:Q', scale=alt.Scale(scheme=farben)),
+        tooltip=['Stundenlohn', 'Stunden', titel]
+    ).properties(title=titel)
+
+# Präfixe der Widget-Schlüssel, die Monatsdaten und Überschreitungen spiegeln
+EINGABE_WIDGETS = (
+    'lohn_option_', 'grundlohn_individuell_', 'stunden_', 'sf_check_', 'sf_stunden_',
+    'nacht_check_', 'nacht_stunden_', 'ol_month_', 'ol_year_'
+)
+
+def reset_input_widgets(jahr: int) -> None:
+    """Setzt die Eingabe-Widgets auf geladene Daten zurück, statt sie vom alten Widget-Zustand überschreiben zu lassen."""
+    for schluessel in list(st.session_state):
+        if isinstance(schluessel, str) and schluessel.startswith(EINGABE_WIDGETS):
+            del st.session_state[schluessel]
+    for monat, daten in st.session_state.monthly_data.items():
+        mindestlohn = saetze_fuer_monat(jahr, MONATE.index(monat) + 1)['mindestlohn']
+        if daten['grundlohn'] == 13.62:
+            st.session_state[f"lohn_option_{monat}"] = 'vertrag'
+        elif daten['grundlohn'] > mindestlohn:
+            st.session_state[f"lohn_option_{monat}"] = 'individuell'
+
+@st.cache_resource
+def get_datenbank() -> LohnDatenbank:
+    """Eine Datenbank je Prozess, gemeinsam für alle Sitzungen (Pfad: LOHNRECHNER_DB)."""
+    return LohnDatenbank()
+
+# --- ABSCHNITTE ---
+# Jeder Abschnitt ist ein Fragment: Eine Eingabe darin führt nur diesen Abschnitt
+# (samt enthaltener Fragmente) erneut aus, nicht die ganze Seite. Die Argumente
+# stammen aus dem letzten vollen Lauf; Jahr, Monat und Bundesland werden in main()
+# gewählt und lösen daher immer einen vollen Lauf aus.
+
+def fragment_abschnitt(name: str):
+    """Dekorator: Abschnitt als st.fragment, gemessen als Spanne `name`."""
+    def dekorator(funktion):
+        @wraps(funktion)
+        def abschnitt(*args, **kwargs):
+            if PROFIL.lauf_offen():
+                with PROFIL.span(name):
+                    return funktion(*args, **kwargs)
+            # Rerun nur dieses Fragments: als eigener Lauf messen
+            PROFIL.neuer_lauf(aktiv=st.session_state.get('profiling', False))
+            try:
+                with PROFIL.span(name):
+                    return funktion(*args, **kwargs)
+            finally:
+                PROFIL.lauf_beenden()
+        return st.fragment(abschnitt)
+    return dekorator
+
+@fragment_abschnitt("Kalender")
+def kalender_abschnitt(jahr: int, selected_month: str, month_index: int, land: str) -> None:
+    """Monatskalender und Feiertage; unabhängig von den Stunden."""
     # Kalender mit Feiertagen anzeigen
-    current_year = datetime.now().year
-    month_index = MONATE.index(selected_month) + 1
-    calendar_html = get_month_calendar_html(current_year, month_index, FEIERTAGE_NRW_2025)
+    feiertage = get_feiertage(jahr, land)
+    calendar_html = get_month_calendar_html(jahr, month_index, feiertage)
     st.markdown(calendar_html, unsafe_allow_html=True)
+    statistik = kalender_statistik_monat(jahr, month_index, land)
+    st.caption(
+        f"{statistik['arbeitstage']} Arbeitstage, {statistik['sonntage']} Sonntage, "
+        f"{statistik['feiertage']} Feiertage; bis zu {statistik['sf_stunden']:.0f} Stunden mit SF-Zuschlag "
+        f"und {statistik['nachtstunden']:.0f} Nachtstunden möglich"
+    )
     
     # Feiertage des Monats anzeigen
-    feiertage_im_monat = [(day, name) for (m, day), name in FEIERTAGE_NRW_2025.items() if m == month_index]
+    feiertage_im_monat = [(day, name) for (m, day), name in feiertage.items() if m == month_index]
     if feiertage_im_monat:
+        sf_satz = saetze_fuer_monat(jahr, month_index)['sf_zuschlag_rate']
         feiertage_text = "\n".join([f"- **{day:02d}.{month_index:02d}.**: {name}" for day, name in feiertage_im_monat])
         st.info(f"""
-        **Feiertage in {selected_month} {current_year} (NRW):**
+        **Feiertage in {selected_month} {jahr} ({land}):**
         {feiertage_text}
         
-        *An gesetzlichen Feiertagen gilt der SF-Zuschlag (30%).*
+        *An gesetzlichen Feiertagen gilt der SF-Zuschlag ({als_prozent(sf_satz)}).*
         """)
-    
-    st.divider() 
-    
+
+@fragment_abschnitt("Monatsdaten")
+def monatsdaten_abschnitt(jahr: int, selected_month: str, month_index: int, land: str) -> None:
+    """Eingaben des Monats, Zeitjahr, Status und Monatsübersicht."""
+    month_data = st.session_state.monthly_data[selected_month]
+
+    # Sätze des gewählten Monats aus der Satztabelle
+    saetze = saetze_fuer_monat(jahr, month_index)
+    mindestlohn = saetze['mindestlohn']
+    rates, minijob_grenze = rates_und_grenze(saetze)
+
     st.subheader("Stundenlohn & Arbeitsstunden")
     
     # Stundenlohn Auswahl
+    lohn_optionen = {
+        'mindestlohn': f"Mindestlohn {jahr}",
+        'vertrag': "Arbeitsvertraglicher Lohn (13,62 €)",
+        'individuell': "Individuell"
+    }
     lohn_option = st.radio(
         "Wählen Sie Ihren Stundenlohn:",
-        ("Mindestlohn 2025", "Arbeitsvertraglicher Lohn (13,62 €)", "Individuell"),
+        list(lohn_optionen),
+        format_func=lohn_optionen.get,
         key=f"lohn_option_{selected_month}"
     )
 
-    grundlohn = MINDESTLOHN 
+    grundlohn = mindestlohn 
 
-    if lohn_option == "Mindestlohn 2025":
-        grundlohn = MINDESTLOHN
-        st.info(f"Der Mindestlohn für 2025 beträgt: **{MINDESTLOHN:.2f} €**")
-    elif lohn_option == "Arbeitsvertraglicher Lohn (13,62 €)":
+    if lohn_option == 'mindestlohn':
+        grundlohn = mindestlohn
+        st.info(f"Der Mindestlohn im {selected_month} {jahr} beträgt: **{mindestlohn:.2f} €**")
+    elif lohn_option == 'vertrag':
         grundlohn = 13.62
         st.info(f"Ihr arbeitsvertraglicher Lohn beträgt: **13,62 €**")
     else: 
         grundlohn = st.number_input(
             "Individueller Stundenlohn (€):",
-            min_value=MINDESTLOHN,
-            value=month_data['grundlohn'] if month_data['grundlohn'] >= MINDESTLOHN else MINDESTLOHN, 
+            min_value=mindestlohn,
+            value=month_data['grundlohn'] if month_data['grundlohn'] >= mindestlohn else mindestlohn, 
             step=0.5,
             format="%.2f",
-            key=f"grundlohn_individuell_{selected_month}"
+            key=f"grundlohn_individuell_{selected_month}_{jahr}"
         )
     
     st.session_state.monthly_data[selected_month]['grundlohn'] = grundlohn
@@ -297,7 +218,7 @@ def main():
 
     col1, col2 = st.columns(2)
     with col1:
-        sf_zuschlag = st.checkbox("Sonntag-/Feiertagszuschlag (30%)", value=month_data['sf_zuschlag'], key=f"sf_check_{selected_month}")
+        sf_zuschlag = st.checkbox(f"Sonntag-/Feiertagszuschlag ({als_prozent(rates['sf_zuschlag_rate'])})", value=month_data['sf_zuschlag'], key=f"sf_check_{selected_month}")
     with col2:
         sf_zuschlag_stunden_val = month_data['sf_zuschlag_stunden'] if sf_zuschlag else 0.0
         sf_zuschlag_stunden = st.number_input(
@@ -313,7 +234,7 @@ def main():
     
     col1, col2 = st.columns(2)
     with col1:
-        nacht_zuschlag = st.checkbox("Nacht-Zuschlag (25%)", value=month_data['nacht_zuschlag'], key=f"nacht_check_{selected_month}")
+        nacht_zuschlag = st.checkbox(f"Nacht-Zuschlag ({als_prozent(rates['nacht_zuschlag_rate'])})", value=month_data['nacht_zuschlag'], key=f"nacht_check_{selected_month}")
     with col2:
         nacht_zuschlag_stunden_val = month_data['nacht_zuschlag_stunden'] if nacht_zuschlag else 0.0
         nacht_zuschlag_stunden = st.number_input(
@@ -339,11 +260,94 @@ def main():
     results = calculate_salary( # Urlaubs-Parameter entfernt
         grundlohn, stunden, 
         sf_zuschlag, sf_zuschlag_stunden,
-        nacht_zuschlag, nacht_zuschlag_stunden
+        nacht_zuschlag, nacht_zuschlag_stunden,
+        rates=rates, minijob_grenze=minijob_grenze
     )
+
+    st.divider()
+
+    zeitjahr_abschnitt(jahr, month_index, land)
+
+    st.divider()
+
+    # Berechnung des Prozentsatzes und Status (bestehender Code)
+    prozent_ausgeschoepft = (results['brutto_grundlohn_fuer_grenze'] / minijob_grenze) * 100
+    status_emoji = get_status_color(prozent_ausgeschoepft)
+    
+    st.subheader(f"📊 Minijob-Grenze Status {status_emoji}")
+    st.write(f"**{prozent_ausgeschoepft:.1f}%** der Minijob-Grenze ausgeschöpft (von {minijob_grenze:.2f} €)")
+    st.markdown(get_thermometer_html(prozent_ausgeschoepft), unsafe_allow_html=True)
+    
+    st.subheader("💰 Monatsbeträge im Überblick")
+    col1, col2 = st.columns(2) # col3 entfernt
+    with col1:
+        st.metric("Brutto Grundlohn (Stunden)", f"{results['brutto_grundlohn_stunden']:.2f} €")
+    with col2:
+        st.metric("Steuerfreie Zuschläge", f"{results['zuschlage']:.2f} €") # Hier wurde Urlaubsentgelt durch Zuschläge ersetzt
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Brutto Gesamt (für Grenze)", f"{results['brutto_grundlohn_fuer_grenze']:.2f} €")
+    with col2:
+        st.metric("Gesamt Brutto Auszahlung", f"{results['brutto_gesamt']:.2f} €")
+    with col3:
+        st.metric("Netto Auszahlung", f"{results['netto']:.2f} €")
+    
+    st.divider() 
+    
+    if results['brutto_grundlohn_fuer_grenze'] > minijob_grenze:
+        st.error(f"""
+        **🚨 Achtung: Minijob-Grenze von {minijob_grenze:.2f} € überschritten!**
+        - Ihr Brutto-Grundlohn für diesen Monat beträgt: **{results['brutto_grundlohn_fuer_grenze']:.2f} €**
+        - Die Überschreitung beträgt: **{(results['brutto_grundlohn_fuer_grenze'] - minijob_grenze):.2f} €**
+        
+        *Diese monatliche Überschreitung sollte bei Ihrer manuellen Zeitjahr-Verwaltung berücksichtigt werden.*
+        
+        *Hinweis: Die hier berechneten Abzüge (pauschal {als_prozent(rates['pauschale_abzuege_ueber_minijob'])}) sind eine Vereinfachung. In der Realität würden bei Überschreitung der Minijob-Grenze volle Sozialversicherungsbeiträge anfallen (Renten-, Kranken-, Pflege- und Arbeitslosenversicherung), was zu deutlich höheren Abzügen führen würde. Die steuerfreien Zuschläge ({results['zuschlage']:.2f} €) zählen nicht zur Minijob-Grenze.*
+        """)
+    else:
+        st.success(f"""
+        **🎉 Sie liegen innerhalb der Minijob-Grenze von {minijob_grenze:.2f} €!**
+        - Brutto Grundlohn (Stunden): **{results['brutto_grundlohn_fuer_grenze']:.2f} €**
+        - Abzug Rentenversicherung ({als_prozent(rates['rentenversicherung_minijob'])}): **-{results['rentenversicherung_abzug']:.2f} €**
+        - Netto Grundlohn (nach RV-Abzug): **{(results['brutto_grundlohn_fuer_grenze'] - results['rentenversicherung_abzug']):.2f} €**
+        - Steuerfreie Zuschläge: **+{results['zuschlage']:.2f} €**
+        - **Netto Auszahlung Gesamt: {results['netto']:.2f} €**
+        - Verbleibender Betrag bis zur Grenze: **{results['freibetrag_rest']:.2f} €** (entspricht ca. {results['rest_stunden']} Stunden bei Ihrem Stundenlohn)
+        
+        *Die Zuschläge sind steuerfrei und zählen nicht zur Minijob-Grenze.*
+        """)
     
     st.divider() 
 
+    # Monatsübersicht mit verbessertem Balkendiagramm
+    st.subheader("📈 Monatsübersicht & Vergleich")
+    
+    # Nur geänderte Monate neu berechnen
+    if 'monthly_overview' not in st.session_state:
+        st.session_state.monthly_overview = {}
+    df_vergleich = update_monthly_overview(st.session_state.monthly_data, st.session_state.monthly_overview, jahr)
+    
+    if not df_vergleich.empty:
+        st.write("Vergleich der Monatsbeträge:")
+        st.bar_chart(df_vergleich, height=400)
+        
+        st.write("Detailansicht für den aktuellen Monat:")
+        current_data_df = pd.DataFrame({
+            'Kategorie': ['Brutto Grundlohn (Stunden)', 'Zuschläge', 'Netto'], # 'Urlaubsentgelt' entfernt
+            'Betrag': [
+                results['brutto_grundlohn_stunden'],
+                results['zuschlage'],
+                results['netto']
+            ]
+        }).set_index('Kategorie')
+        st.bar_chart(current_data_df, height=200)
+    else:
+        st.info("Keine Daten für die Monatsübersicht verfügbar. Bitte geben Sie Stunden für mindestens einen Monat ein.")
+
+@fragment_abschnitt("Zeitjahr")
+def zeitjahr_abschnitt(jahr: int, month_index: int, land: str) -> None:
+    """Überschreitungen und Zeitjahr-Status; Prognose und Planung bauen darauf auf."""
     # Manuelle Zeitjahr-Verwaltung
     st.subheader("🗓️ Freibetragsgrenzüberschreitungen (Zeitjahr)")
     st.info("""
@@ -354,7 +358,10 @@ def main():
     *Bitte geben Sie hier Ihre vergangenen Überschreitungen ein, um den aktuellen Status zu prüfen. Die hier eingegebenen Daten werden gespeichert.*
     """)
 
-    current_year_ol = datetime.now().year 
+    # Bereich um das Abrechnungsjahr, erweitert um geladene Überschreitungen aus früheren Jahren
+    geladene_jahre = [ol['year'] for ol in st.session_state.manual_over_limits if ol['year'] != -1]
+    min_jahr_ol = min([jahr - 2, *geladene_jahre])
+    max_jahr_ol = max([jahr + 1, *geladene_jahre])
 
     # Eingabefelder für bis zu 3 Überschreitungen
     for i in range(3):
@@ -380,11 +387,11 @@ def main():
                 st.session_state.manual_over_limits[i]['month_index'] = MONATE.index(selected_ol_month)
 
         with col_ol2:
-            default_year = st.session_state.manual_over_limits[i]['year'] if st.session_state.manual_over_limits[i]['year'] != -1 else current_year_ol
+            default_year = st.session_state.manual_over_limits[i]['year'] if st.session_state.manual_over_limits[i]['year'] != -1 else jahr
             selected_ol_year = st.number_input(
                 f"Überschreitung {i+1} (Jahr):",
-                min_value=current_year_ol - 2, 
-                max_value=current_year_ol + 1,
+                min_value=min_jahr_ol,
+                max_value=max_jahr_ol,
                 value=default_year,
                 step=1,
                 format="%d",
@@ -394,32 +401,26 @@ def main():
             if selected_ol_month != "Keine Überschreitung":
                 st.session_state.manual_over_limits[i]['year'] = selected_ol_year
 
-    # Filtern der gültigen Überschreitungen und Sortieren nach Datum
-    valid_over_limits = []
-    for ol in st.session_state.manual_over_limits:
-        if ol['month_index'] != -1 and ol['year'] != -1:
-            valid_over_limits.append(ol)
-    
-    valid_over_limits.sort(key=lambda x: (x['year'], x['month_index']))
+    # Gültige Überschreitungen nach der Zeitjahr-Regel auswerten
+    ueberschreitungen = sorted(
+        ol['year'] * 12 + ol['month_index'] for ol in st.session_state.manual_over_limits
+        if ol['month_index'] != -1 and ol['year'] != -1
+    )
+    zeitjahr = zeitjahr_auswerten(ueberschreitungen)
 
-    # Logik zur Bestimmung des aktuellen Zeitjahres-Status
-    over_limit_count_actual = len(valid_over_limits)
+    over_limit_count_actual = zeitjahr['anzahl']
     zeitjahr_start_month_name = None
     zeitjahr_start_year = None
     zeitjahr_end_month_name = None
     zeitjahr_end_year = None
 
     if over_limit_count_actual > 0:
-        first_ol = valid_over_limits[0]
-        zeitjahr_start_month_index = first_ol['month_index']
-        zeitjahr_start_year = first_ol['year']
+        zeitjahr_start_year, zeitjahr_start_month_index = divmod(zeitjahr['start'], 12)
         zeitjahr_start_month_name = MONATE[zeitjahr_start_month_index]
 
         # Berechne das Ende des Zeitjahres (12 Monate nach dem Startmonat)
-        end_month_index = (zeitjahr_start_month_index + 11) % 12 
-        end_year_offset = (zeitjahr_start_month_index + 11) // 12
+        zeitjahr_end_year, end_month_index = divmod(zeitjahr['start'] + 11, 12)
         zeitjahr_end_month_name = MONATE[end_month_index]
-        zeitjahr_end_year = zeitjahr_start_year + end_year_offset
 
     st.markdown("---") 
     st.subheader("Aktueller Status der Überschreitungen")
@@ -442,134 +443,206 @@ def main():
         Bitte lassen Sie sich umgehend von Ihrem Arbeitgeber oder einer Beratungsstelle informieren.
         """)
 
-    st.divider()
+    risiko_abschnitt(jahr, month_index, ueberschreitungen)
+    planung_abschnitt(jahr, zeitjahr, land)
+
+@fragment_abschnitt("Risiko-Prognose")
+def risiko_abschnitt(jahr: int, month_index: int, ueberschreitungen: list) -> None:
+    """Monte-Carlo-Prognose ab dem gewählten Monat."""
+    # Monte-Carlo-Prognose: wie wahrscheinlich sind künftige Überschreitungen und ein Statusverlust?
+    with st.expander("🎲 Risiko-Prognose: Überschreitungen und Statusverlust"):
+        st.write("Simuliert 100.000 mögliche Verläufe ab dem gewählten Monat. Die Stunden schwanken um die "
+                 "eingetragenen Monatsstunden, bisherige Überschreitungen werden berücksichtigt.")
+        monatswerte = monatsdaten_array(st.session_state.monthly_data)
+        _, streuung_historie = stunden_verteilung(monatswerte['stunden'])
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            streuung = st.number_input(
+                "Streuung der Stunden (± Std.):", min_value=0.0, max_value=40.0,
+                value=round(streuung_historie, 1) if streuung_historie > 0 else 4.0, step=0.5, key="risiko_streuung",
+                help="Vorbelegt mit der Streuung der eingetragenen Monatsstunden"
+            )
+        with col2:
+            prognose_monate = st.select_slider("Prognosezeitraum (Monate):", options=[12, 24], value=24, key="risiko_monate")
+        with col3:
+            seed = st.number_input("Seed:", min_value=0, value=0, step=1, key="risiko_seed")
+
+        # Nur neu simulieren, wenn sich Eingaben geändert haben
+        schluessel = (monatswerte.tobytes(), streuung, prognose_monate, seed, jahr, month_index, tuple(ueberschreitungen))
+        if st.session_state.get('risiko', (None,))[0] != schluessel:
+            st.session_state.risiko = (schluessel, simulate_status_risk(
+                monatswerte['stunden'], streuung, monatswerte['grundlohn'], jahr, month_index - 1,
+                monate=prognose_monate, seed=int(seed), ueberschreitungen=ueberschreitungen, max_stunden=40.0
+            ))
+        risiko = st.session_state.risiko[1]
+
+        col1, col2 = st.columns(2)
+        col1.metric("Statusverlust in den nächsten 12 Monaten", f"{risiko['p_verlust_zeitjahr']:.1%}")
+        col2.metric("Erwartete Überschreitungen", f"{risiko['erwartete_ueberschreitungen']:.2f}")
+        st.line_chart(pd.DataFrame({
+            'Überschreitung im Monat (%)': risiko['p_ueberschreitung'] * 100,
+            'Statusverlust bis zum Monat (%)': risiko['p_verlust_bis'] * 100
+        }, index=pd.Index(ordinal_als_datum(risiko['ordinale']), name='Monat')), height=250)
+        st.caption("Gleicher Seed, gleiches Ergebnis. Die Minijob-Grenze folgt je Monat der Satztabelle.")
+
+@fragment_abschnitt("Jahresplanung")
+def planung_abschnitt(jahr: int, zeitjahr: dict, land: str) -> None:
+    """Stundenbudget des Jahres optimal auf die Monate verteilen."""
+    # Jahresplanung mit den Stundenlöhnen der einzelnen Monate
+    with st.expander("🧮 Jahresplanung: Stunden optimal verteilen"):
+        st.write("Verteilt ein Stundenbudget so auf die zwölf Monate, dass die Netto-Auszahlung maximal wird. "
+                 "Überschreitungen der Minijob-Grenze werden nur eingeplant, soweit sie im 'Zeitjahr' noch erlaubt sind.")
+        col1, col2 = st.columns(2)
+        with col1:
+            jahresstunden = st.number_input(
+                "Stundenbudget für das Jahr:", min_value=0.0, max_value=12 * 40.0, value=288.0,
+                step=1.0, format="%.1f", key="plan_budget"
+            )
+        with col2:
+            max_monatsstunden = st.number_input(
+                "Maximal verfügbare Stunden pro Monat:", min_value=0.0, max_value=40.0, value=40.0,
+                step=1.0, format="%.1f", key="plan_max_stunden"
+            )
+        stunden_je_arbeitstag = st.number_input(
+            "Höchstens Stunden pro Arbeitstag (0 = nicht begrenzen):", min_value=0.0, max_value=24.0, value=0.0,
+            step=0.5, format="%.1f", key="plan_stunden_je_arbeitstag",
+            help="Begrenzt die Stunden je Monat zusätzlich nach den Arbeitstagen (Mo-Fr ohne Feiertage) im gewählten Bundesland."
+        )
+        noch_erlaubt = 0 if zeitjahr['verlust'] is not None else max(0, 2 - zeitjahr['anzahl'])
+        grundloehne = monatsdaten_array(st.session_state.monthly_data)['grundlohn']
+        verfuegbar = np.full(12, max_monatsstunden)
+        if stunden_je_arbeitstag > 0:
+            arbeitstage = kalender_statistik(jahr)['arbeitstage'][list(BUNDESLAENDER).index(land)]
+            verfuegbar = np.minimum(verfuegbar, arbeitstage * stunden_je_arbeitstag)
+
+        # Nur neu planen, wenn sich Eingaben geändert haben (der Abschnitt läuft mit jeder Monatseingabe mit)
+        schluessel = (grundloehne.tobytes(), jahresstunden, verfuegbar.tobytes(), noch_erlaubt, jahr)
+        if st.session_state.get('planung', (None,))[0] != schluessel:
+            rates_jahr, grenze_jahr = rates_und_grenze(saetze_fuer_ordinale(jahr * 12 + np.arange(12)))
+            st.session_state.planung = (schluessel, plan_year(
+                jahresstunden, verfuegbar, grundloehne,
+                noch_erlaubt, rates=rates_jahr, minijob_grenze=grenze_jahr
+            ))
+        plan = st.session_state.planung[1]
+        df_plan = pd.DataFrame(
+            {'Stunden': plan['stunden'][0], 'Netto': plan['netto'][0]},
+            index=pd.Index(MONATE, name='Monat')
+        )
+        st.write(f"Geplante Netto-Auszahlung im Jahr: **{plan['netto_gesamt'][0]:.2f} €** "
+                 f"({int(plan['ueberschreitungen'][0])} von {noch_erlaubt} erlaubten Überschreitungen genutzt)")
+        st.bar_chart(df_plan[['Stunden']], height=250)
+
+@fragment_abschnitt("Szenarien")
+def szenario_abschnitt(jahr: int, month_index: int) -> None:
+    """Netto und Auslastung für ein Gitter aus Stundenlohn und Stunden."""
+    saetze = saetze_fuer_monat(jahr, month_index)
+    mindestlohn = saetze['mindestlohn']
+    rates, minijob_grenze = rates_und_grenze(saetze)
+
+    # Szenario-Analyse: alle Kombinationen auf einmal statt einzeln ausprobieren
+    with st.expander("🔬 Szenario-Analyse: Stundenlohn × Stunden"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            lohn_von, lohn_bis = st.slider(
+                "Stundenlohn (€):", min_value=mindestlohn, max_value=25.0,
+                value=(mindestlohn, 18.0), step=0.1, key=f"szenario_lohn_{jahr}_{month_index}"
+            )
+        with col2:
+            lohn_schritt = st.number_input("Schrittweite Lohn (€):", min_value=0.05, value=0.25, step=0.05, key="szenario_lohn_schritt")
+        with col3:
+            stunden_schritt = st.number_input("Schrittweite Stunden:", min_value=0.5, value=1.0, step=0.5, key="szenario_stunden_schritt")
+        loehne = np.arange(lohn_von, lohn_bis + lohn_schritt / 2, lohn_schritt)
+        stunden_gitter = np.arange(0.0, 40.0 + stunden_schritt / 2, stunden_schritt)
+        anteile = np.round(np.arange(0.0, 1.0001, 0.1), 1)
+        gitter = scenario_grid(loehne, stunden_gitter, anteile, anteile, rates=rates, minijob_grenze=minijob_grenze)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            sf_anteil = st.select_slider("Anteil Stunden mit SF-Zuschlag:", options=list(anteile), value=0.0, key="szenario_sf")
+        with col2:
+            nacht_anteil = st.select_slider("Anteil Stunden mit Nacht-Zuschlag:", options=list(anteile), value=0.0, key="szenario_nacht")
+        i_sf, i_nacht = list(anteile).index(sf_anteil), list(anteile).index(nacht_anteil)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.altair_chart(get_heatmap_chart(
+                gitter['netto'][:, :, i_sf, i_nacht], loehne, stunden_gitter, 'Netto (€)'
+            ), width="stretch")
+        with col2:
+            st.altair_chart(get_heatmap_chart(
+                gitter['auslastung'][:, :, i_sf, i_nacht], loehne, stunden_gitter, 'Auslastung Grenze (%)', 'redyellowgreen'
+            ), width="stretch")
+        st.caption(f"{gitter['netto'].size:,} Szenarien berechnet. Auslastung über 100 % bedeutet eine Überschreitung der Minijob-Grenze.")
 
-    # Berechnung des Prozentsatzes und Status (bestehender Code)
-    prozent_ausgeschoepft = (results['brutto_grundlohn_fuer_grenze'] / MINIJOB_GRENZE) * 100
-    status_emoji = get_status_color(prozent_ausgeschoepft)
-    
-    st.subheader(f"📊 Minijob-Grenze Status {status_emoji}")
-    st.write(f"**{prozent_ausgeschoepft:.1f}%** der Minijob-Grenze ausgeschöpft (von {MINIJOB_GRENZE:.2f} €)")
-    st.markdown(get_thermometer_html(prozent_ausgeschoepft), unsafe_allow_html=True)
-    
-    st.subheader("💰 Monatsbeträge im Überblick")
-    col1, col2 = st.columns(2) # col3 entfernt
-    with col1:
-        st.metric("Brutto Grundlohn (Stunden)", f"{results['brutto_grundlohn_stunden']:.2f} €")
-    with col2:
-        st.metric("Steuerfreie Zuschläge", f"{results['zuschlage']:.2f} €") # Hier wurde Urlaubsentgelt durch Zuschläge ersetzt
-    
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.metric("Brutto Gesamt (für Grenze)", f"{results['brutto_grundlohn_fuer_grenze']:.2f} €")
-    with col2:
-        st.metric("Gesamt Brutto Auszahlung", f"{results['brutto_gesamt']:.2f} €")
-    with col3:
-        st.metric("Netto Auszahlung", f"{results['netto']:.2f} €")
-    
-    st.divider() 
-    
-    if results['brutto_grundlohn_fuer_grenze'] > MINIJOB_GRENZE:
-        st.error(f"""
-        **🚨 Achtung: Minijob-Grenze von {MINIJOB_GRENZE:.2f} € überschritten!**
-        - Ihr Brutto-Grundlohn für diesen Monat beträgt: **{results['brutto_grundlohn_fuer_grenze']:.2f} €**
-        - Die Überschreitung beträgt: **{(results['brutto_grundlohn_fuer_grenze'] - MINIJOB_GRENZE):.2f} €**
-        
-        *Diese monatliche Überschreitung sollte bei Ihrer manuellen Zeitjahr-Verwaltung berücksichtigt werden.*
-        
-        *Hinweis: Die hier berechneten Abzüge (pauschal 30%) sind eine Vereinfachung. In der Realität würden bei Überschreitung der Minijob-Grenze volle Sozialversicherungsbeiträge anfallen (Renten-, Kranken-, Pflege- und Arbeitslosenversicherung), was zu deutlich höheren Abzügen führen würde. Die steuerfreien Zuschläge ({results['zuschlage']:.2f} €) zählen nicht zur Minijob-Grenze.*
-        """)
-    else:
-        st.success(f"""
-        **🎉 Sie liegen innerhalb der Minijob-Grenze von {MINIJOB_GRENZE:.2f} €!**
-        - Brutto Grundlohn (Stunden): **{results['brutto_grundlohn_fuer_grenze']:.2f} €**
-        - Abzug Rentenversicherung (3,6%): **-{results['rentenversicherung_abzug']:.2f} €**
-        - Netto Grundlohn (nach RV-Abzug): **{(results['brutto_grundlohn_fuer_grenze'] - results['rentenversicherung_abzug']):.2f} €**
-        - Steuerfreie Zuschläge: **+{results['zuschlage']:.2f} €**
-        - **Netto Auszahlung Gesamt: {results['netto']:.2f} €**
-        - Verbleibender Betrag bis zur Grenze: **{results['freibetrag_rest']:.2f} €** (entspricht ca. {results['rest_stunden']} Stunden bei Ihrem Stundenlohn)
-        
-        *Die Zuschläge sind steuerfrei und zählen nicht zur Minijob-Grenze.*
-        """)
-    
-    st.divider() 
+# --- HAUPTTEIL DER STREAMLIT APP ---
 
-    # Monatsübersicht mit verbessertem Balkendiagramm
-    st.subheader("📈 Monatsübersicht & Vergleich")
-    
-    monthly_comparison = []
-    for monat in MONATE:
-        data = st.session_state.monthly_data[monat]
-
-        if data['stunden'] > 0 or data['sf_zuschlag_stunden'] > 0 or data['nacht_zuschlag_stunden'] > 0: # Urlaubsberechnung entfernt
-            result = calculate_salary(
-                data['grundlohn'], data['stunden'],
-                data['sf_zuschlag'], data['sf_zuschlag_stunden'],
-                data['nacht_zuschlag'], data['nacht_zuschlag_stunden']
-            )
-            monthly_comparison.append({
-                'Monat': monat,
-                'Brutto Grundlohn': result['brutto_grundlohn_fuer_grenze'], # 'inkl. Urlaub' entfernt
-                'Zuschläge': result['zuschlage'],
-                'Netto': result['netto']
-            })
+def main():
+    st.set_page_config(page_title="Gehaltsrechner", layout="wide")
+    # Abrechnungsjahr: bestimmt Kalender, Mindestlohn, Minijob-Grenze und Sätze
+    jahr = st.session_state.get('abrechnungsjahr', datetime.now().year)
+    st.title(f"💰 Gehaltsrechner mit Zuschlägen {jahr}")
+
+    # Zeitspannen je Abschnitt (Anzeige im Debug-Panel der Sidebar)
+    PROFIL.neuer_lauf(aktiv=st.session_state.get('profiling', False))
+    PROFIL.abschnitt("Session State")
     
-    if monthly_comparison:
-        df_vergleich = pd.DataFrame(monthly_comparison)
-        df_vergleich = df_vergleich.set_index('Monat')
-        
-        st.write("Vergleich der Monatsbeträge:")
-        st.bar_chart(df_vergleich, height=400)
-        
-        st.write("Detailansicht für den aktuellen Monat:")
-        current_data_df = pd.DataFrame({
-            'Kategorie': ['Brutto Grundlohn (Stunden)', 'Zuschläge', 'Netto'], # 'Urlaubsentgelt' entfernt
-            'Betrag': [
-                results['brutto_grundlohn_stunden'],
-                results['zuschlage'],
-                results['netto']
-            ]
-        }).set_index('Kategorie')
-        st.bar_chart(current_data_df, height=200)
-    else:
-        st.info("Keine Daten für die Monatsübersicht verfügbar. Bitte geben Sie Stunden für mindestens einen Monat ein.")
+    # Initialisiere Session State für monatliche Daten
+    if 'monthly_data' not in st.session_state:
+        st.session_state.monthly_data = MonatsDaten({
+            month: {
+                'grundlohn': saetze_fuer_monat(jahr, 1)['mindestlohn'],
+                'stunden': 24.0,
+                'sf_zuschlag': False, 
+                'sf_zuschlag_stunden': 0.0, 
+                'nacht_zuschlag': False,
+                'nacht_zuschlag_stunden': 0.0
+            } for month in MONATE
+        })
     
-    st.divider() 
+    # Initialisiere Session State für manuelle Überschreitungen
+    if 'manual_over_limits' not in st.session_state:
+        st.session_state.manual_over_limits = Ueberschreitungen([
+            {'month_index': -1, 'year': -1}, 
+            {'month_index': -1, 'year': -1}, 
+            {'month_index': -1, 'year': -1}  
+        ])
+
+    # Jahr und Monat auswählen
+    col_jahr, col_monat = st.columns([1, 3])
+    with col_jahr:
+        jahre = list(range(datetime.now().year - 3, datetime.now().year + 2))
+        jahr = st.selectbox("Abrechnungsjahr:", jahre, index=jahre.index(jahr) if jahr in jahre else 3, key="abrechnungsjahr")
+    with col_monat:
+        selected_month = st.selectbox("Wähle einen Monat aus:", MONATE)
+    month_index = MONATE.index(selected_month) + 1
+    # Bundesland für die Feiertage; außerhalb der Fragmente, damit Kalender, Planung und Import es gleich sehen
+    land = st.selectbox(
+        "Bundesland (für Feiertage):",
+        options=list(BUNDESLAENDER),
+        index=list(BUNDESLAENDER).index('NW'),
+        format_func=lambda kuerzel: BUNDESLAENDER[kuerzel],
+        key="bundesland"
+    )
+    PROFIL.abschnitt(None)
 
+    kalender_abschnitt(jahr, selected_month, month_index, land)
+
+    st.divider()
+
+    monatsdaten_abschnitt(jahr, selected_month, month_index, land)
+
+    st.divider()
+
+    szenario_abschnitt(jahr, month_index)
+
+    st.divider()
+
+    PROFIL.abschnitt("Speichern/Laden")
     st.sidebar.header("💾 Daten speichern/laden")
     st.sidebar.markdown("Exportieren Sie Ihre Berechnungen oder laden Sie gespeicherte Daten.")
 
     if st.sidebar.button("Daten als CSV exportieren"):
-        data_for_export = []
-        for month in MONATE:
-            data = st.session_state.monthly_data[month]
-
-            row = {
-                'Monat': month,
-                'Grundlohn': data['grundlohn'],
-                'Stunden': data['stunden'],
-                'SF_Zuschlag': data['sf_zuschlag'],
-                'SF_Zuschlag_Stunden': data['sf_zuschlag_stunden'],
-                'Nacht_Zuschlag': data['nacht_zuschlag'],
-                'Nacht_Zuschlag_Stunden': data['nacht_zuschlag_stunden'],
-                # Urlaubsinformationen entfernt
-            }
-            data_for_export.append(row)
-        
-        # Füge die manuellen Überschreitungsdaten als separate Zeile hinzu
-        ol_row = {'Monat': 'OverLimitData', 
-                  'Grundlohn': 0, 'Stunden': 0, 
-                  'SF_Zuschlag': False, 'SF_Zuschlag_Stunden': 0, 
-                  'Nacht_Zuschlag': False, 'Nacht_Zuschlag_Stunden': 0,
-                  # Urlaubsinformationen entfernt
-                  }
-        for i in range(3):
-            ol_row[f'OL{i+1}_Month_Index'] = st.session_state.manual_over_limits[i]['month_index']
-            ol_row[f'OL{i+1}_Year'] = st.session_state.manual_over_limits[i]['year']
-        data_for_export.append(ol_row)
-
-        df = pd.DataFrame(data_for_export)
-        csv = df.to_csv(index=False).encode('utf-8')
+        csv = export_monthly_csv(st.session_state.monthly_data, st.session_state.manual_over_limits)
         st.sidebar.download_button(
             "CSV herunterladen",
             csv,
@@ -578,59 +651,123 @@ def main():
             key='download-csv'
         )
     
+    if st.sidebar.button("Daten als Parquet exportieren"):
+        archiv = io.BytesIO()
+        save_parquet(
+            archiv,
+            monthly_data_to_frame(st.session_state.monthly_data, jahr=jahr),
+            over_limits_to_frame(st.session_state.manual_over_limits)
+        )
+        st.sidebar.download_button(
+            "Parquet-Archiv herunterladen",
+            archiv.getvalue(),
+            "gehaltsberechnung.zip",
+            "application/zip",
+            key='download-parquet'
+        )
+    
+    if st.sidebar.button("Lohnabrechnungen erstellen"):
+        abrechnungen = io.BytesIO()
+        write_payslips(
+            monthly_data_to_frame(st.session_state.monthly_data, st.session_state.get('db_mitarbeiter', '').strip(), jahr),
+            abrechnungen, 'html'
+        )
+        st.sidebar.download_button(
+            "Lohnabrechnungen herunterladen (HTML)",
+            abrechnungen.getvalue(),
+            f"lohnabrechnungen_{jahr}.html",
+            "text/html",
+            key='download-abrechnungen'
+        )
+    
+    uploaded_parquet = st.sidebar.file_uploader("Parquet-Archiv laden", type="zip")
+    # Ein hochgeladenes Archiv je Abrechnungsjahr nur einmal übernehmen, nicht bei jedem Rerun erneut;
+    # danach Widgets zurücksetzen, sonst schreiben sie ihre alten Werte über den geladenen Monat
+    parquet_schluessel = None if uploaded_parquet is None else (uploaded_parquet.file_id, jahr)
+    if parquet_schluessel is not None and st.session_state.get('parquet_import', (None,))[0] != parquet_schluessel:
+        try:
+            archiv_monate, archiv_ereignisse = load_parquet(uploaded_parquet)
+            monthly_data, over_limits = frame_to_session(archiv_monate, archiv_ereignisse, jahr=jahr)
+        except (ValueError, KeyError, zipfile.BadZipFile) as e:
+            st.sidebar.error(f"Fehler beim Laden des Parquet-Archivs: {e}")
+        else:
+            # Nur Monate des gewählten Jahres übernehmen, sonst gälten Mindestlohn und Grenze eines anderen Jahres
+            if monthly_data:
+                st.session_state.monthly_data.update(monthly_data)
+                st.session_state.manual_over_limits = Ueberschreitungen(over_limits)
+            st.session_state.parquet_import = (parquet_schluessel, sorted(set(archiv_monate['jahr'].tolist())), len(monthly_data))
+            reset_input_widgets(jahr)
+            st.rerun()
+    if parquet_schluessel is not None and st.session_state.get('parquet_import', (None,))[0] == parquet_schluessel:
+        _, archiv_jahre, geladen = st.session_state.parquet_import
+        if geladen:
+            st.sidebar.success(f"{geladen} Monate aus {jahr} erfolgreich geladen!")
+        else:
+            st.sidebar.warning(
+                f"Das Archiv enthält keine Daten für {jahr} (enthalten: {', '.join(map(str, archiv_jahre)) or 'keine'}). "
+                "Wählen Sie das Abrechnungsjahr, das geladen werden soll."
+            )
+    
     uploaded_file = st.sidebar.file_uploader("CSV-Datei laden", type="csv")
-    if uploaded_file is not None:
+    # Wie beim Parquet-Archiv nur einmal übernehmen; die Fehlertabelle bleibt bis zur nächsten Datei sichtbar
+    if uploaded_file is not None and st.session_state.get('csv_file_id') != uploaded_file.file_id:
         try:
-            df = pd.read_csv(uploaded_file)
-            
-            # Prüfen auf die Zeile für Überschreitungsdaten
-            ol_data_row = df[df['Monat'] == 'OverLimitData']
-            if not ol_data_row.empty:
-                for i in range(3):
-                    if f'OL{i+1}_Month_Index' in ol_data_row.columns and f'OL{i+1}_Year' in ol_data_row.columns:
-                        st.session_state.manual_over_limits[i]['month_index'] = int(ol_data_row[f'OL{i+1}_Month_Index'].iloc[0])
-                        st.session_state.manual_over_limits[i]['year'] = int(ol_data_row[f'OL{i+1}_Year'].iloc[0])
-                df = df[df['Monat'] != 'OverLimitData'] 
-
-            # Überprüfen und Laden der monatlichen Daten
-            # Angepasste Spalten für den Import, da Urlaub entfernt wurde
-            required_columns_monthly = [
-                'Monat', 'Grundlohn', 'Stunden', 'SF_Zuschlag', 'SF_Zuschlag_Stunden',
-                'Nacht_Zuschlag', 'Nacht_Zuschlag_Stunden'
-            ]
-            
-            if not all(col in df.columns for col in required_columns_monthly):
-                st.sidebar.error("Fehler: Die geladene CSV-Datei hat nicht die erwarteten Spalten für die monatlichen Gehaltsdaten. Stellen Sie sicher, dass sie keine Urlaubsspalten enthält, wenn die Funktion entfernt wurde.")
-                return
-            
-            for _, row in df.iterrows():
-                month = row['Monat']
-                if month in MONATE:
-                    st.session_state.monthly_data[month] = {
-                        'grundlohn': float(row['Grundlohn']),
-                        'stunden': float(row['Stunden']),
-                        'sf_zuschlag': str(row['SF_Zuschlag']).lower() == 'true',
-                        'sf_zuschlag_stunden': float(row['SF_Zuschlag_Stunden']),
-                        'nacht_zuschlag': str(row['Nacht_Zuschlag']).lower() == 'true',
-                        'nacht_zuschlag_stunden': float(row['Nacht_Zuschlag_Stunden'])
-                    }
-                    # Urlaubsinformationen werden hier nicht mehr geladen
-                else:
-                    st.sidebar.warning(f"Überspringe unbekannten Monat in CSV: {month}")
-            st.sidebar.success("Daten erfolgreich geladen!")
-            st.experimental_rerun()
-        except Exception as e:
+            monthly_data, over_limits, fehler = import_monthly_csv(uploaded_file, jahr, land)
+        except CSVFormatFehler as e:
+            st.sidebar.error(str(e))
+            PROFIL.lauf_beenden()
+            return
+        except (ValueError, KeyError) as e:
             st.sidebar.error(f"Fehler beim Laden der CSV-Datei: {e}")
             st.sidebar.info("Bitte stellen Sie sicher, dass die CSV-Datei das korrekte Format hat (ohne Urlaubsspalten, wenn die Funktion entfernt wurde).")
-
+        else:
+            if over_limits is not None:
+                st.session_state.manual_over_limits = Ueberschreitungen(over_limits)
+            st.session_state.monthly_data.update(monthly_data)
+            st.session_state.csv_file_id = uploaded_file.file_id
+            st.session_state.csv_import = (len(monthly_data), fehler)
+            reset_input_widgets(jahr)
+            st.rerun()
+    if uploaded_file is not None and st.session_state.get('csv_file_id') == uploaded_file.file_id:
+        geladen, fehler = st.session_state.csv_import
+        st.sidebar.success(f"{geladen} Monate erfolgreich geladen!")
+        if not fehler.empty:
+            st.sidebar.warning(f"{fehler['zeile'].nunique()} Zeilen mit Fehlern wurden übersprungen:")
+            st.sidebar.dataframe(fehler.astype({'wert': str}), hide_index=True)
+
+    # Dauerhafte Ablage je Mitarbeiter und Jahr, Zeitjahr-Historie inklusive
+    st.sidebar.subheader("🗄️ Datenbank")
+    db_mitarbeiter = st.sidebar.text_input("Mitarbeiter:", key="db_mitarbeiter").strip()
+    col_db1, col_db2 = st.sidebar.columns(2)
+    if col_db1.button(f"{jahr} speichern", key="db_speichern", disabled=not db_mitarbeiter):
+        get_datenbank().speichern(
+            monthly_data_to_frame(st.session_state.monthly_data, db_mitarbeiter, jahr),
+            over_limits_to_frame(st.session_state.manual_over_limits, db_mitarbeiter)
+        )
+        st.sidebar.success(f"{jahr} für {db_mitarbeiter} gespeichert.")
+    if col_db2.button(f"{jahr} laden", key="db_laden", disabled=not db_mitarbeiter):
+        # Drei Jahre Historie, damit auch Überschreitungen aus den Vorjahren ins Zeitjahr eingehen
+        monatsdaten, ereignisse = get_datenbank().historie(db_mitarbeiter, jahr - 2, jahr)
+        if not (monatsdaten['jahr'] == jahr).any():
+            st.sidebar.warning(f"Keine Daten für {db_mitarbeiter} im Jahr {jahr}.")
+        else:
+            monthly_data, over_limits = frame_to_session(monatsdaten, ereignisse, db_mitarbeiter, jahr)
+            st.session_state.monthly_data.update(monthly_data)
+            st.session_state.manual_over_limits = Ueberschreitungen(over_limits)
+            reset_input_widgets(jahr)
+            st.rerun()
+
+    PROFIL.abschnitt("Hinweise")
+    saetze = saetze_fuer_monat(jahr, month_index)
+    mindestlohn, minijob_grenze = saetze['mindestlohn'], saetze['minijob_grenze']
     st.divider()
     st.info(f"""
     **Wichtige Hinweise zur Berechnung:**
-    - **Mindestlohn 2025:** Aktuell **{MINDESTLOHN:.2f} €** pro Stunde.
-    - **Minijob-Grenze:** Der Brutto-Grundlohn darf **{MINIJOB_GRENZE:.2f} €** pro Monat nicht überschreiten.
-    - **Rentenversicherungspflicht (Minijob):** 3,6% des Bruttolohns (ohne Zuschläge).
-    - **SF-Zuschlag (Sonntag-/Feiertagszuschlag):** 30% Aufschlag auf den Stundenlohn (steuerfrei).
-    - **Nacht-Zuschlag:** 25% Aufschlag auf den Stundenlohn (steuerfrei).
+    - **Mindestlohn {jahr}:** Im {selected_month} **{mindestlohn:.2f} €** pro Stunde.
+    - **Minijob-Grenze:** Der Brutto-Grundlohn darf **{minijob_grenze:.2f} €** pro Monat nicht überschreiten.
+    - **Rentenversicherungspflicht (Minijob):** {als_prozent(saetze['rentenversicherung_minijob'])} des Bruttolohns (ohne Zuschläge).
+    - **SF-Zuschlag (Sonntag-/Feiertagszuschlag):** {als_prozent(saetze['sf_zuschlag_rate'])} Aufschlag auf den Stundenlohn (steuerfrei).
+    - **Nacht-Zuschlag:** {als_prozent(saetze['nacht_zuschlag_rate'])} Aufschlag auf den Stundenlohn (steuerfrei).
     - **Steuerfreie Zuschläge:** Diese zählen *nicht* zur Minijob-Grenze.
     - **Freibetragsgrenzüberschreitung ('Zeitjahr'):**
         - Innerhalb eines 'Zeitjahres' (beginnend mit der ersten Überschreitung und 12 Monate laufend) sind **maximal zwei Überschreitungen** der Minijob-Grenze erlaubt.
@@ -639,5 +776,21 @@ def main():
     - **Maximale Arbeitszeit:** Die Eingabe der Arbeitsstunden pro Monat ist auf **maximal 40 Stunden** begrenzt.
     """)
 
+    # Debug-Panel: Zeitspannen und Aufrufzähler dieses Reruns (Fragment-Reruns zählen als eigene Läufe)
+    spannen = PROFIL.lauf_beenden()
+    st.sidebar.divider()
+    if st.sidebar.checkbox("🐞 Profiling anzeigen", key="profiling") and spannen:
+        st.sidebar.dataframe(pd.DataFrame({
+            'Spanne': [spanne['name'] for spanne in spannen],
+            'Aufrufe': [spanne['aufrufe'] for spanne in spannen],
+            'ms': [round(spanne['sekunden'] * 1e3, 2) for spanne in spannen]
+        }), hide_index=True)
+
 if __name__ == "__main__":
-    main()
+    # Über "streamlit run" die App starten, sonst die Kommandozeile
+    # (z. B. "python Lohn-Rechner.py batch export.csv -o ergebnis.csv")
+    from streamlit import runtime
+    if runtime.exists():
+        main()
+    else:
+        sys.exit(run_cli())
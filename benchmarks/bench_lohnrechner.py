@@ -0,0 +1,354 @@
+"""Benchmarks für die Hot Paths des Gehaltsrechners.
+
+Misst Laufzeit (Minimum und Median über mehrere Wiederholungen) und
+Spitzenspeicher (tracemalloc, separater Lauf) für:
+
+- calculate_salary (skalar), calculate_salary_batch und die Cent-Variante
+- get_month_calendar_html (kalt und mit Cache)
+- CSV-Export/-Import von monthly_data, den Streaming-Batchlauf und das Parquet-Archiv
+- die SQLite-Ablage (Schreiben in einer Transaktion, Historie eines Mitarbeiters über drei Jahre)
+- Zeitjahr-Auswertung für einzelne Mitarbeiter und die ganze Belegschaft
+- den Jahresabschluss mit einem Worker und mit allen Kernen
+- den Vergleich zweier Läufe je Mitarbeiter-Monat
+- das Szenario-Gitter (kalt und mit Cache)
+- Speicherbedarf je Sitzung (monthly_data als Dicts gegenüber der kompakten Ablage)
+- Lohnabrechnungen als ZIP (eine Textdatei je Mitarbeiter-Monat)
+- der Batch-Endpunkt der HTTP-API (direkt über ASGI, ohne Netzwerk)
+- Kaltstart des Pakets lohnrechner (Import von calculate_salary in einem frischen Interpreter)
+
+Die Größen reichen von einem Nutzer (12 Monate) bis zu einer Million
+Mitarbeiter-Monate. Die Ergebnisse werden als JSON gespeichert und können mit
+--vergleich gegen einen früheren Lauf verglichen werden:
+
+    python benchmarks/bench_lohnrechner.py -o bench.json
+    python benchmarks/bench_lohnrechner.py -o neu.json --vergleich bench.json
+"""
+
+import argparse
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO = Path(__file__).resolve().parent.parent
+
+GROESSEN = [12, 1_000, 100_000, 1_000_000]
+GROESSEN_SCHNELL = [12, 1_000, 10_000]
+# Obergrenze für Workloads mit Python-Schleife je Zeile
+MAX_SKALAR = 100_000
+
+
+def lade_app():
+    """Lädt das Paket lohnrechner aus dem Repository (ohne Streamlit)."""
+    sys.path.insert(0, str(REPO))
+    import lohnrechner
+    return lohnrechner
+
+
+def importzeit(wiederholungen: int = 5) -> dict:
+    """Kaltstart von `from lohnrechner import calculate_salary` in frischen Interpretern."""
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "from lohnrechner import calculate_salary\n"
+        "dauer = time.perf_counter() - start\n"
+        "print(dauer, ','.join(m for m in ('numpy', 'pandas', 'pyarrow', 'streamlit') if m in sys.modules))"
+    )
+    zeiten = []
+    for _ in range(wiederholungen):
+        ausgabe = subprocess.run(
+            [sys.executable, '-c', code], cwd=REPO, capture_output=True, text=True, check=True
+        ).stdout.split()
+        zeiten.append(float(ausgabe[0]))
+    return {
+        'min_s': min(zeiten),
+        'median_s': statistics.median(zeiten),
+        'geladene_abhaengigkeiten': ausgabe[1].split(',') if len(ausgabe) > 1 else [],
+    }
+
+
+def eingaben(n: int, seed: int = 0) -> pd.DataFrame:
+    """Zufällige, reproduzierbare Mitarbeiter-Monate mit den Spalten aus EINGABE_FELDER."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'mitarbeiter': np.arange(n) // 12,
+        'jahr': 2025 + (np.arange(n) % 36) // 12,
+        'monat': np.arange(n) % 12 + 1,
+        'grundlohn': np.round(rng.uniform(12.82, 18.0, n), 2),
+        'stunden': np.round(rng.uniform(0, 40, n), 1),
+        'sf_zuschlag': rng.random(n) < 0.3,
+        'sf_zuschlag_stunden': np.round(rng.uniform(0, 8, n), 1),
+        'nacht_zuschlag': rng.random(n) < 0.2,
+        'nacht_zuschlag_stunden': np.round(rng.uniform(0, 8, n), 1),
+    })
+
+
+def messen(funktion, wiederholungen: int) -> dict:
+    """Misst Laufzeit über mehrere Wiederholungen und den Spitzenspeicher eines weiteren Laufs."""
+    zeiten = []
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        funktion()
+        zeiten.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    funktion()
+    _, spitze = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'wiederholungen': wiederholungen,
+        'min_s': min(zeiten),
+        'median_s': statistics.median(zeiten),
+        'spitzenspeicher_bytes': spitze,
+    }
+
+
+def asgi_anfrage(asgi_app, methode: str, pfad: str, body: bytes = b'') -> dict:
+    """Schickt eine Anfrage direkt an eine ASGI-Anwendung (ohne Netzwerk)."""
+    import asyncio
+
+    async def anfrage():
+        eingang = [{'type': 'http.request', 'body': body, 'more_body': False}]
+        antwort = {}
+
+        async def receive():
+            return eingang.pop(0)
+
+        async def send(nachricht):
+            antwort.update(nachricht)
+
+        await asgi_app({'type': 'http', 'method': methode, 'path': pfad, 'query_string': b''}, receive, send)
+        return antwort
+
+    return asyncio.run(anfrage())
+
+
+def workloads(app, groessen):
+    """Erzeugt (Name, Größe, Funktion) für alle Benchmarks."""
+    verzeichnis = tempfile.TemporaryDirectory()
+    for n in groessen:
+        df = eingaben(n)
+        spalten = [df[feld].to_numpy() for feld in app.EINGABE_FELDER]
+
+        if n <= MAX_SKALAR:
+            zeilen = list(zip(*(s.tolist() for s in spalten)))
+            yield 'calculate_salary', n, lambda zeilen=zeilen: [app.calculate_salary(*z) for z in zeilen]
+
+        yield 'calculate_salary_batch', n, lambda spalten=spalten: app.calculate_salary_batch(*spalten)
+        yield 'calculate_salary_batch_exact', n, lambda spalten=spalten: app.calculate_salary_batch_exact(*spalten)
+
+        brutto = df[['mitarbeiter', 'jahr', 'monat']].assign(
+            brutto_grundlohn_fuer_grenze=df['grundlohn'] * df['stunden'] * 1.2
+        )
+        if n <= MAX_SKALAR:
+            anfrage = json.dumps({feld: df[feld].tolist() for feld in app.EINGABE_FELDER}).encode('utf-8')
+            yield 'api_gehalt_batch', n, lambda anfrage=anfrage: asgi_anfrage(app.api.app, 'POST', '/gehalt/batch', anfrage)
+
+        if n <= MAX_SKALAR:
+            yield 'write_payslips_zip', n, lambda df=df: app.write_payslips(df, io.BytesIO(), 'text', archiv=True)
+
+        yield 'run_year_end_1_worker', n, lambda df=df: app.run_year_end(df, workers=1)
+        yield 'run_year_end_alle_kerne', n, lambda df=df: app.run_year_end(df)
+
+        yield 'evaluate_zeitjahr_frame', n, lambda brutto=brutto: app.evaluate_zeitjahr_frame(brutto)
+
+        # Zweiter Lauf mit 2 % geänderten Stunden, beide mit Ergebnisspalten
+        lauf_alt = df.join(app.calculate_salary_frame(df))
+        geaendert = df.assign(stunden=np.where(np.arange(n) % 50 == 0, np.minimum(df['stunden'] + 3, 40), df['stunden']))
+        lauf_neu = geaendert.join(app.calculate_salary_frame(geaendert))
+        yield 'compare_runs', n, lambda lauf_alt=lauf_alt, lauf_neu=lauf_neu: app.compare_runs(lauf_alt, lauf_neu)
+
+        export = df.rename(columns={feld: spalte for spalte, feld in app.CSV_SPALTEN.items()})
+        export.insert(0, 'Monat', np.array(app.MONATE)[df['monat'] - 1])
+        csv = export.drop(columns=['mitarbeiter', 'jahr', 'monat']).to_csv(index=False).encode('utf-8')
+        yield 'process_payroll_csv', n, lambda csv=csv: app.process_payroll_csv(io.BytesIO(csv), io.BytesIO())
+        # Prüfung wie nach dem Upload: Text-Spalten aus der CSV, Mindestlohn je Monat
+        hochgeladen = pd.read_csv(io.BytesIO(csv))
+        yield 'validate_payroll_frame', n, lambda hochgeladen=hochgeladen: app.validate_payroll_frame(hochgeladen, 2025)
+        # Kalender je Zeile für Mitarbeiter in verschiedenen Bundesländern (Jahrestabellen schon gebaut)
+        laender = np.array(list(app.BUNDESLAENDER), dtype=object)[np.arange(n) % len(app.BUNDESLAENDER)]
+        yield 'kalender_statistik_je_zeile', n, lambda df=df, laender=laender: app.kalender_statistik_je_zeile(
+            df['jahr'].to_numpy(), df['monat'].to_numpy(), laender
+        )
+
+        archiv = io.BytesIO()
+        schluessel = df[['mitarbeiter', 'jahr', 'monat']]
+        app.save_parquet(archiv, df, schluessel[df['stunden'] > 38])
+        archiv = archiv.getvalue()
+        yield 'save_parquet', n, lambda df=df, schluessel=schluessel: app.save_parquet(
+            io.BytesIO(), df, schluessel[df['stunden'] > 38]
+        )
+        yield 'load_parquet', n, lambda archiv=archiv: app.load_parquet(io.BytesIO(archiv))
+
+        # 36 Monate je Mitarbeiter; wiederholtes Speichern ersetzt die vorhandenen Zeilen
+        datenbank = app.LohnDatenbank(str(Path(verzeichnis.name) / f'bench_{n}.sqlite3'))
+        db_df = df.assign(mitarbeiter=(np.arange(n) // 36).astype(str))
+        yield 'datenbank_speichern', n, lambda datenbank=datenbank, db_df=db_df: datenbank.speichern(db_df)
+
+    # Historie des ersten Mitarbeiters aus der größten Datenbank
+    yield 'datenbank_historie', 36, lambda: datenbank.historie('0', 2025, 2027)
+
+    # Einzelner Nutzer: 12 Monate in session_state
+    monthly_data = {
+        monat: {feld: eingaben(12).iloc[i][feld].item() for feld in app.EINGABE_FELDER}
+        for i, monat in enumerate(app.MONATE)
+    }
+    over_limits = [{'month_index': -1, 'year': -1} for _ in range(3)]
+    csv = app.export_monthly_csv(monthly_data, over_limits)
+    yield 'export_monthly_csv', 12, lambda: app.export_monthly_csv(monthly_data, over_limits)
+    yield 'import_monthly_csv', 12, lambda: app.import_monthly_csv(io.BytesIO(csv))
+
+    auswertung = [2025 * 12 + m for m in (0, 4, 9)]
+    sitzung = app.MonatsDaten(monthly_data)
+    yield 'update_monthly_overview_warm', 12, lambda cache={}: app.update_monthly_overview(sitzung, cache)
+
+    yield 'zeitjahr_auswerten', 3, lambda: app.zeitjahr_auswerten(auswertung)
+
+    # Monte-Carlo-Prognose: 100.000 Pfade × 24 Monate
+    yield 'simulate_status_risk', 100_000 * 24, lambda: app.simulate_status_risk(
+        40.0, 4.0, 13.90, 2026, 0, monate=24, pfade=100_000, seed=0, ueberschreitungen=auswertung[1:]
+    )
+
+    # Szenario-Gitter mit einer Million Punkten (100 Löhne × 100 Stunden × 10 × 10 Anteile)
+    loehne, stunden, anteile = np.linspace(12.82, 25, 100), np.linspace(0, 40, 100), np.linspace(0, 1, 10)
+
+    def szenarien_kalt():
+        app.szenarien._scenario_grid.cache_clear()
+        app.scenario_grid(loehne, stunden, anteile, anteile)
+
+    yield 'scenario_grid_kalt', 1_000_000, szenarien_kalt
+    yield 'scenario_grid_warm', 1_000_000, lambda: app.scenario_grid(loehne, stunden, anteile, anteile)
+
+    feiertage = app.get_feiertage(2025, 'NW')
+
+    def kalender_kalt():
+        app.kalender._kalender_basis_html.cache_clear()
+        app.kalender._kalender_html.cache_clear()
+        for monat in range(1, 13):
+            app.get_month_calendar_html(2025, monat, feiertage)
+
+    def kalender_warm():
+        for monat in range(1, 13):
+            app.get_month_calendar_html(2025, monat, feiertage)
+
+    yield 'get_month_calendar_html_kalt', 12, kalender_kalt
+    yield 'get_month_calendar_html_warm', 12, kalender_warm
+
+
+def tiefe_groesse(objekt, gesehen=None) -> int:
+    """Speicherbedarf eines Objekts inklusive aller enthaltenen Objekte (Bytes)."""
+    gesehen = set() if gesehen is None else gesehen
+    if id(objekt) in gesehen:
+        return 0
+    gesehen.add(id(objekt))
+    groesse = sys.getsizeof(objekt)  # bei NumPy-Arrays inklusive Datenpuffer
+    if isinstance(objekt, dict):
+        groesse += sum(tiefe_groesse(k, gesehen) + tiefe_groesse(v, gesehen) for k, v in objekt.items())
+    elif isinstance(objekt, (list, tuple)):
+        groesse += sum(tiefe_groesse(element, gesehen) for element in objekt)
+    for name in getattr(type(objekt), '__slots__', ()):
+        groesse += tiefe_groesse(getattr(objekt, name), gesehen)
+    return groesse
+
+
+def sitzungsspeicher(app) -> dict:
+    """Bytes je Sitzung für monthly_data und manual_over_limits: Dicts gegenüber der kompakten Ablage."""
+    df = eingaben(12)
+    monthly_data = {
+        monat: {feld: df.iloc[i][feld].item() for feld in app.EINGABE_FELDER}
+        for i, monat in enumerate(app.MONATE)
+    }
+    over_limits = [{'month_index': -1, 'year': -1} for _ in range(3)]
+    return {
+        'dict_bytes': tiefe_groesse(monthly_data) + tiefe_groesse(over_limits),
+        'kompakt_bytes': tiefe_groesse(app.MonatsDaten(monthly_data)) + tiefe_groesse(app.Ueberschreitungen(over_limits)),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def vergleichen(alt: dict, neu: dict) -> None:
+    """Gibt die Laufzeitänderung je Benchmark gegenüber einem früheren Lauf aus."""
+    alte_werte = {(r['name'], r['groesse']): r for r in alt['ergebnisse']}
+    print(f"\nVergleich mit {alt['meta'].get('commit') or 'früherem Lauf'}:")
+    for ergebnis in neu['ergebnisse']:
+        vorher = alte_werte.get((ergebnis['name'], ergebnis['groesse']))
+        if vorher is None:
+            continue
+        faktor = ergebnis['min_s'] / vorher['min_s'] if vorher['min_s'] > 0 else float('inf')
+        print(f"  {ergebnis['name']:<32} {ergebnis['groesse']:>9}  x{faktor:6.2f}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks für den Gehaltsrechner")
+    parser.add_argument('-o', '--ausgabe', default='bench_output.json', help="Ziel-JSON")
+    parser.add_argument('--schnell', action='store_true', help="nur kleine Größen (für schnelle Prüfungen)")
+    parser.add_argument('--wiederholungen', type=int, default=5)
+    parser.add_argument('--vergleich', help="JSON eines früheren Laufs zum Vergleich")
+    args = parser.parse_args(argv)
+
+    app = lade_app()
+    groessen = GROESSEN_SCHNELL if args.schnell else GROESSEN
+
+    ergebnisse = []
+    for name, groesse, funktion in workloads(app, groessen):
+        wiederholungen = max(1, args.wiederholungen if groesse < 100_000 else args.wiederholungen // 2)
+        messung = messen(funktion, wiederholungen)
+        messung['zeilen_pro_s'] = groesse / messung['min_s'] if messung['min_s'] > 0 else None
+        ergebnisse.append({'name': name, 'groesse': groesse, **messung})
+        print(
+            f"{name:<32} {groesse:>9}  {messung['min_s'] * 1e3:10.3f} ms  "
+            f"{messung['spitzenspeicher_bytes'] / 2**20:8.1f} MiB",
+            file=sys.stderr
+        )
+
+    bericht = {
+        'meta': {
+            'commit': git_commit(),
+            'zeitpunkt': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'plattform': platform.platform(),
+        },
+        'ergebnisse': ergebnisse,
+        'sitzungsspeicher': sitzungsspeicher(app),
+        'importzeit': importzeit(),
+    }
+    print(
+        "Sitzungsspeicher: {dict_bytes} Bytes (Dicts) -> {kompakt_bytes} Bytes (kompakt)".format(**bericht['sitzungsspeicher']),
+        file=sys.stderr
+    )
+    print(
+        "Kaltstart 'from lohnrechner import calculate_salary': {:.2f} ms (geladen: {})".format(
+            bericht['importzeit']['min_s'] * 1e3, ', '.join(bericht['importzeit']['geladene_abhaengigkeiten']) or '-'
+        ),
+        file=sys.stderr
+    )
+    Path(args.ausgabe).write_text(json.dumps(bericht, indent=2), encoding='utf-8')
+
+    if args.vergleich:
+        vergleichen(json.loads(Path(args.vergleich).read_text(encoding='utf-8')), bericht)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""Rechenkern des Gehaltsrechners, ohne Streamlit nutzbar.
+
+Die Untermodule werden erst beim ersten Zugriff auf einen ihrer Namen geladen
+(PEP 562). `from lohnrechner import calculate_salary` lädt so nur die
+Konstanten und die skalare Berechnung, NumPy und pandas kommen erst mit den
+vektorisierten Funktionen bzw. beim Erzeugen von DataFrames dazu.
+"""
+
+import importlib
+
+# Öffentlicher Name -> Untermodul
+_NAMEN = {
+    'konstanten': [
+        'MINDESTLOHN', 'MINIJOB_GRENZE', 'MAX_MONATSSTUNDEN', 'RATES', 'EINGABE_FELDER', 'ERGEBNIS_FELDER',
+        'CSV_SPALTEN', 'MONATE', 'BUNDESLAENDER', 'rates_version'
+    ],
+    'feiertage': [
+        'get_ostersonntag', 'FEIERTAGS_REGELN', 'get_feiertage_nach_datum', 'get_feiertage',
+        'get_feiertags_index', 'ist_feiertag', 'FEIERTAGE_NRW_2025'
+    ],
+    'kalender': [
+        'KALENDER_STYLES', 'KALENDER_KOPFZEILE', 'get_month_calendar_html', 'prerender_calendars',
+        'get_calendar_grid_html'
+    ],
+    'saetze': [
+        'SATZ_HISTORIE', 'RATES_NAMEN', 'saetze_fuer_monat', 'saetze_am', 'rates_und_grenze', 'saetze_fuer_ordinale'
+    ],
+    'berechnung': ['calculate_salary'],
+    'batch': ['calculate_salary_batch', 'saetze_je_zeile', 'calculate_salary_frame'],
+    'festkomma': ['calculate_salary_cents', 'calculate_salary_batch_exact', 'calculate_salary_exact'],
+    'sitzung': [
+        'MONATSDATEN_DTYPE', 'UEBERSCHREITUNG_DTYPE', 'DatensatzAnsicht', 'MonatsDaten',
+        'Ueberschreitungen', 'monatsdaten_array'
+    ],
+    'uebersicht': ['UEBERSICHT_SPALTEN', 'update_monthly_overview'],
+    'zeitjahr': [
+        'zeitjahr_auswerten', 'evaluate_zeitjahr', 'evaluate_zeitjahr_frame', 'zeitjahr_je_code', 'ordinal_als_datum'
+    ],
+    'speicher': [
+        'CSVFormatFehler', 'export_monthly_csv', 'import_monthly_csv', 'PARQUET_MONATSDATEN',
+        'PARQUET_UEBERSCHREITUNGEN', 'monthly_data_to_frame', 'over_limits_to_frame', 'save_parquet',
+        'load_parquet', 'frame_to_session', 'SQLITE_UMGEBUNGSVARIABLE', 'SQLITE_STANDARD_PFAD', 'LohnDatenbank'
+    ],
+    'abrechnung': [
+        'ABRECHNUNG_TEXT', 'ABRECHNUNG_HTML', 'ABRECHNUNG_FORMATE', 'compile_payslip_template', 'render_payslips',
+        'write_payslips'
+    ],
+    'pruefung': ['FEHLER_SPALTEN', 'validate_payroll_frame'],
+    'kalenderstatistik': [
+        'NACHTSTUNDEN_JE_TAG', 'KALENDER_FELDER', 'kalender_statistik', 'kalender_statistik_monat',
+        'kalender_statistik_je_zeile'
+    ],
+    'schichten': ['NACHT_BEGINN_STUNDE', 'NACHT_ENDE_STUNDE', 'split_shifts', 'shifts_to_monthly'],
+    'risiko': ['stunden_verteilung', 'simulate_status_risk'],
+    'planer': ['plan_year'],
+    'szenarien': ['scenario_grid'],
+    'cli': ['process_payroll_csv', 'run_cli'],
+    'profil': ['Profiler', 'PROFIL', 'gemessen', 'span'],
+    'api': ['LohnAPI', 'APIFehler'],
+    'jahreslauf': ['SUMMEN_FELDER', 'run_year_end'],
+    'vergleich': ['VERGLEICH_FELDER', 'compare_runs']
+}
+
+_MODUL_FUER_NAME = {name: modul for modul, namen in _NAMEN.items() for name in namen}
+
+__all__ = list(_MODUL_FUER_NAME)
+
+def __getattr__(name):
+    if name in _MODUL_FUER_NAME:
+        wert = getattr(importlib.import_module(f'.{_MODUL_FUER_NAME[name]}', __name__), name)
+        globals()[name] = wert  # weitere Zugriffe ohne __getattr__
+        return wert
+    if name in _NAMEN:
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_NAMEN))
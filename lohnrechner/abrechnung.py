@@ -0,0 +1,220 @@
+"""Lohnabrechnungen für viele Mitarbeiter-Monate: je Zeile ein Beleg als Text oder HTML.
+
+Eine Vorlage (str.format-Syntax) wird einmal zerlegt und in einen
+%-Formatstring übersetzt, der nur noch '%s' enthält. Je Block werden die
+benutzten Felder spaltenweise formatiert, zusammengesetzt wird jeder Beleg mit
+einem einzigen %-Operator. Geschrieben wird blockweise in ein ZIP (eine Datei
+je Beleg) oder in eine fortlaufende Datei, im Speicher liegt also immer nur ein
+Block.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+import zipfile
+from functools import lru_cache
+from html import escape
+from itertools import repeat
+from string import Formatter
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .batch import calculate_salary_frame, saetze_je_zeile
+from .konstanten import ERGEBNIS_FELDER, MINIJOB_GRENZE, MONATE
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+ABRECHNUNG_TEXT = """\
+Lohnabrechnung {monat_name} {jahr}
+Mitarbeiter: {mitarbeiter}
+
+Stundenlohn                      {grundlohn:>10.2f} €
+Arbeitsstunden                   {stunden:>10.1f}
+Brutto Grundlohn (Stunden)       {brutto_grundlohn_fuer_grenze:>10.2f} €
+Abzug Rentenversicherung         {rentenversicherung_abzug:>10.2f} €
+Pauschale Abzüge                 {pauschale_abzuege:>10.2f} €
+Netto Grundlohn                  {netto_grundlohn:>10.2f} €
+Steuerfreie Zuschläge            {zuschlage:>10.2f} €
+Netto Auszahlung                 {netto:>10.2f} €
+
+Minijob-Grenze {minijob_grenze:.2f} €: {status}
+Verbleibend bis zur Grenze: {freibetrag_rest:.2f} € (ca. {rest_stunden} Stunden)
+"""
+
+ABRECHNUNG_HTML = """\
+<section class="abrechnung">
+<h2>Lohnabrechnung {monat_name} {jahr}</h2>
+<p>Mitarbeiter: <strong>{mitarbeiter}</strong></p>
+<table>
+<tr><td>Stundenlohn</td><td>{grundlohn:.2f} €</td></tr>
+<tr><td>Arbeitsstunden</td><td>{stunden:.1f}</td></tr>
+<tr><td>Brutto Grundlohn (Stunden)</td><td>{brutto_grundlohn_fuer_grenze:.2f} €</td></tr>
+<tr><td>Abzug Rentenversicherung</td><td>-{rentenversicherung_abzug:.2f} €</td></tr>
+<tr><td>Pauschale Abzüge</td><td>-{pauschale_abzuege:.2f} €</td></tr>
+<tr><td>Netto Grundlohn</td><td>{netto_grundlohn:.2f} €</td></tr>
+<tr><td>Steuerfreie Zuschläge</td><td>+{zuschlage:.2f} €</td></tr>
+<tr><th>Netto Auszahlung</th><th>{netto:.2f} €</th></tr>
+</table>
+<p>Minijob-Grenze {minijob_grenze:.2f} €: {status}<br>
+Verbleibend bis zur Grenze: {freibetrag_rest:.2f} € (ca. {rest_stunden} Stunden)</p>
+</section>
+"""
+
+# Format -> (Vorlage, Dateiendung, Kopf, Trenner, Fuß der fortlaufenden Datei)
+ABRECHNUNG_FORMATE = {
+    'text': (ABRECHNUNG_TEXT, 'txt', '', '\f\n', ''),
+    'html': (
+        ABRECHNUNG_HTML, 'html',
+        '<!DOCTYPE html>\n<html lang="de">\n<head><meta charset="utf-8"><title>Lohnabrechnungen</title>\n'
+        '<style>section.abrechnung { page-break-after: always; } td + td, th + th { text-align: right; }</style>\n'
+        '</head>\n<body>\n',
+        '',
+        '</body>\n</html>\n'
+    )
+}
+
+@lru_cache(maxsize=32)
+def compile_payslip_template(vorlage: str) -> tuple:
+    """Zerlegt eine Vorlage einmalig in (%-Formatstring mit nur '%s', ((Feld, Formatangabe, Umwandlung), ...))."""
+    teile, felder = [], []
+    for literal, feld, formatangabe, umwandlung in Formatter().parse(vorlage):
+        teile.append(literal.replace('%', '%%'))
+        if feld is None:
+            continue
+        if not feld.isidentifier():
+            raise ValueError(f"Ungültiges Feld in der Vorlage: {{{feld}}}")
+        if '{' in formatangabe:
+            raise ValueError(f"Verschachtelte Formatangaben werden nicht unterstützt: {{{feld}:{formatangabe}}}")
+        teile.append('%s')
+        felder.append((feld, formatangabe, umwandlung))
+    return ''.join(teile), tuple(felder)
+
+def _block_spalten(block: pd.DataFrame) -> dict:
+    """Alle Felder, die eine Vorlage nutzen kann, als Arrays: Spalten des Blocks, Ergebnisse und abgeleitete Felder."""
+    spalten = {spalte: block[spalte].to_numpy() for spalte in block.columns}
+    if not all(feld in spalten for feld in ERGEBNIS_FELDER):
+        ergebnis = calculate_salary_frame(block)
+        spalten.update({feld: ergebnis[feld].to_numpy() for feld in ERGEBNIS_FELDER})
+    _, grenze = saetze_je_zeile(block)
+    grenze = np.broadcast_to(MINIJOB_GRENZE if grenze is None else grenze, len(block))
+    brutto = spalten['brutto_grundlohn_fuer_grenze']
+    spalten['minijob_grenze'] = grenze
+    spalten['monat_name'] = np.asarray(MONATE, dtype=object)[block['monat'].to_numpy(dtype=np.int64) - 1]
+    spalten['netto_grundlohn'] = brutto - spalten['rentenversicherung_abzug']
+    spalten['status'] = np.where(brutto > grenze, "überschritten", "eingehalten")
+    return spalten
+
+def _formatieren(werte: np.ndarray, formatangabe: str, umwandlung: str, html: bool) -> list:
+    """Eine Spalte als Liste von Texten; Texte in HTML maskiert, jeder verschiedene Text nur einmal."""
+    import pandas as pd
+
+    if umwandlung == 'r':
+        texte = list(map(repr, werte.tolist()))
+    elif umwandlung == 'a':
+        texte = list(map(ascii, werte.tolist()))
+    elif formatangabe or werte.dtype.kind != 'O':
+        texte = list(map(format, werte.tolist(), repeat(formatangabe)))
+    else:
+        texte = werte
+    if html and werte.dtype.kind in 'OSU':
+        codes, eindeutig = pd.factorize(np.asarray(texte, dtype=object))
+        texte = np.array([escape(str(text)) for text in eindeutig] + [''], dtype=object)[codes].tolist()
+    return texte
+
+def _format_pruefen(format: str) -> None:
+    if format not in ABRECHNUNG_FORMATE:
+        raise ValueError(f"Unbekanntes Format: {format} (erlaubt: {', '.join(ABRECHNUNG_FORMATE)})")
+
+def render_payslips(df: pd.DataFrame, format: str = 'text', vorlage: str = None, blockgroesse: int = 10_000):
+    """Erzeugt die Abrechnungen blockweise als Listen von (Dateiname, Text).
+
+    Erwartet die Spalten 'mitarbeiter', 'jahr', 'monat' (1-12) und EINGABE_FELDER;
+    fehlen ERGEBNIS_FELDER, werden sie mit den Sätzen des jeweiligen Monats
+    berechnet. Eine eigene `vorlage` kann alle diese Felder sowie
+    'monat_name', 'minijob_grenze', 'netto_grundlohn' und 'status' nutzen.
+    """
+    import pandas as pd
+
+    _format_pruefen(format)
+    fehlend = [spalte for spalte in ['mitarbeiter', 'jahr', 'monat'] if spalte not in df.columns]
+    if fehlend:
+        raise KeyError(f"Fehlende Spalten für die Abrechnungen: {', '.join(fehlend)}")
+    standard, endung = ABRECHNUNG_FORMATE[format][:2]
+    muster, felder = compile_payslip_template(vorlage or standard)
+
+    for start in range(0, len(df), blockgroesse):
+        block = df.iloc[start:start + blockgroesse]
+        spalten = _block_spalten(block)
+        unbekannt = [feld for feld, _, _ in felder if feld not in spalten]
+        if unbekannt:
+            raise KeyError(f"Unbekannte Felder in der Vorlage: {', '.join(dict.fromkeys(unbekannt))}")
+        texte = [muster % zeile for zeile in zip(*(
+            _formatieren(spalten[feld], formatangabe, umwandlung, format == 'html')
+            for feld, formatangabe, umwandlung in felder
+        ))] if felder else [muster % ()] * len(block)
+
+        # Dateinamen ohne Pfadtrenner o. Ä., jeder verschiedene Mitarbeiter nur einmal bereinigt
+        codes, eindeutig = pd.factorize(block['mitarbeiter'])
+        mitarbeiter = np.array(
+            [re.sub(r'[^\w.-]+', '_', str(name)).lstrip('.') or '_' for name in eindeutig] + ['_'], dtype=object
+        )[codes].tolist()
+        namen = [
+            f"{name}_{jahr}-{monat:02d}.{endung}"
+            for name, jahr, monat in zip(mitarbeiter, block['jahr'].tolist(), block['monat'].tolist())
+        ]
+        yield list(zip(namen, texte))
+
+def write_payslips(df: pd.DataFrame, ziel, format: str = 'text', archiv: bool = None, vorlage: str = None,
+                   blockgroesse: int = 10_000, fortschritt=None) -> dict:
+    """Schreibt die Abrechnungen blockweise nach `ziel` (Pfad oder binäres Dateiobjekt).
+
+    `archiv` schreibt ein ZIP mit einer Datei je Abrechnung (Standard: wenn
+    `ziel` auf .zip endet), sonst eine fortlaufende Datei (Text: Seitenvorschub
+    zwischen den Abrechnungen, HTML: ein Dokument mit Seitenumbrüchen).
+    `fortschritt` wird nach jedem Block mit (abrechnungen, sekunden) aufgerufen.
+    """
+    if archiv is None:
+        archiv = isinstance(ziel, str) and ziel.lower().endswith('.zip')
+    _format_pruefen(format)
+    _, _, kopf, trenner, fuss = ABRECHNUNG_FORMATE[format]
+
+    start = time.perf_counter()
+    anzahl = 0
+    bytes_gesamt = 0
+    bloecke = render_payslips(df, format, vorlage, blockgroesse)
+    if archiv:
+        zeitpunkt = time.localtime()[:6]
+        # Ohne Kompression: Belege sind klein, einzeln komprimiert sparen sie wenig und kosten aber den Großteil der Zeit
+        with zipfile.ZipFile(ziel, 'w', compression=zipfile.ZIP_STORED) as zip_datei:
+            for block in bloecke:
+                for name, text in block:
+                    daten = text.encode('utf-8')
+                    zip_datei.writestr(zipfile.ZipInfo(name, zeitpunkt), daten)
+                    bytes_gesamt += len(daten)
+                anzahl += len(block)
+                if fortschritt is not None:
+                    fortschritt(anzahl, time.perf_counter() - start)
+    else:
+        datei = open(ziel, 'wb') if isinstance(ziel, str) else ziel
+        try:
+            datei.write(kopf.encode('utf-8'))
+            for block in bloecke:
+                daten = ((trenner if anzahl else '') + trenner.join(text for _, text in block)).encode('utf-8')
+                datei.write(daten)
+                bytes_gesamt += len(daten)
+                anzahl += len(block)
+                if fortschritt is not None:
+                    fortschritt(anzahl, time.perf_counter() - start)
+            datei.write(fuss.encode('utf-8'))
+        finally:
+            if datei is not ziel:
+                datei.close()
+
+    dauer = time.perf_counter() - start
+    return {
+        'abrechnungen': anzahl, 'bytes': bytes_gesamt, 'sekunden': dauer,
+        'abrechnungen_pro_sekunde': anzahl / dauer if dauer > 0 else 0.0
+    }
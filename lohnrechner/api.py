@@ -0,0 +1,297 @@
+"""HTTP-API (ASGI) für Gehaltsberechnung, Zeitjahr-Prüfung und Feiertage.
+
+Reines ASGI ohne Framework, lauffähig mit jedem ASGI-Server, z. B.
+
+    uvicorn lohnrechner.api:app
+
+und lokal ohne Netzwerk testbar, etwa mit httpx.ASGITransport(app=app).
+
+Endpunkte (JSON):
+  GET  /gesundheit                    -> {"status": "ok"}
+  POST /gehalt                        Eingabefelder eines Monats -> Ergebnis wie calculate_salary
+  POST /gehalt/batch                  {"zeilen": [{...}, ...]} oder spaltenweise {feld: [...]}
+                                      -> Ergebnisfelder spaltenweise, vektorisiert berechnet
+
+Mit "jahr" und "monat" (1-12, bei Batches je Zeile bzw. als Spalten) wird mit
+den Sätzen dieses Monats aus der Satztabelle gerechnet, sonst mit RATES und
+MINIJOB_GRENZE.
+  POST /zeitjahr                      {"ueberschreitungen": [{"jahr": 2025, "monat": 3}, ...]}
+                                      oder {"brutto": [...], "start_jahr": 2025, "start_monat": 1}
+  GET  /feiertage?jahr=2025&land=NW   -> [{"datum": "2025-01-01", "name": "Neujahr"}, ...]
+
+Einzelberechnungen werden in einem LRU-Cache gehalten (Schlüssel inkl.
+rates_version() der verwendeten Sätze). Batch-Berechnungen laufen in Threads, ihre Anzahl begrenzt
+ein Semaphor, damit die Ereignisschleife weiter Anfragen annimmt.
+"""
+
+import asyncio
+import json
+import math
+import os
+from functools import lru_cache
+from urllib.parse import parse_qs
+
+from .berechnung import calculate_salary
+from .feiertage import get_feiertage_nach_datum
+from .konstanten import EINGABE_FELDER, MINIJOB_GRENZE, MONATE, RATES, rates_version
+from .saetze import rates_und_grenze, saetze_fuer_monat
+
+class APIFehler(Exception):
+    """Fehler mit HTTP-Status, wird als {"fehler": ...} beantwortet."""
+
+    def __init__(self, status: int, meldung: str):
+        super().__init__(meldung)
+        self.status = status
+
+def _json_lesen(body: bytes):
+    try:
+        return json.loads(body)
+    except ValueError:
+        raise APIFehler(400, "Ungültiges JSON") from None
+
+def _als_json(antwort) -> bytes:
+    try:
+        return json.dumps(antwort, ensure_ascii=False, allow_nan=False).encode('utf-8')
+    except ValueError:
+        raise APIFehler(400, "Ergebnis enthält NaN oder Infinity") from None
+
+@lru_cache(maxsize=4096)
+def _gehalt_gecacht(eingaben: tuple, version: tuple) -> dict:
+    return calculate_salary(*eingaben, rates=dict(version[1]), minijob_grenze=version[0])
+
+def _eingaben(daten: dict) -> tuple:
+    """Eingabefelder eines Monats aus JSON, fehlende Zuschläge zählen als keine."""
+    if not isinstance(daten, dict):
+        raise APIFehler(400, "Erwartet wird ein JSON-Objekt")
+    try:
+        eingaben = (
+            float(daten['grundlohn']), float(daten['stunden']),
+            bool(daten.get('sf_zuschlag', False)), float(daten.get('sf_zuschlag_stunden', 0.0)),
+            bool(daten.get('nacht_zuschlag', False)), float(daten.get('nacht_zuschlag_stunden', 0.0))
+        )
+    except KeyError as e:
+        raise APIFehler(400, f"Fehlendes Feld: {e.args[0]}") from None
+    except (TypeError, ValueError) as e:
+        raise APIFehler(400, f"Ungültiger Wert: {e}") from None
+    if not all(map(math.isfinite, eingaben)):
+        raise APIFehler(400, "Ungültiger Wert: NaN oder Infinity")
+    return eingaben
+
+def _saetze(daten: dict) -> tuple:
+    """(rates, minijob_grenze) für "jahr" und "monat" aus JSON, ohne "jahr" (None, None)."""
+    if 'jahr' not in daten:
+        return None, None
+    try:
+        return rates_und_grenze(saetze_fuer_monat(int(daten['jahr']), int(daten.get('monat', 1))))
+    except (TypeError, ValueError) as e:
+        raise APIFehler(400, f"Ungültiger Zeitraum: {e}") from None
+
+def _gehalt(daten) -> dict:
+    eingaben = _eingaben(daten)
+    # Kopie, damit Änderungen am Ergebnis nicht den Cache verfälschen
+    return dict(_gehalt_gecacht(eingaben, rates_version(*_saetze(daten))))
+
+def _gehalt_batch(daten) -> dict:
+    """Berechnet viele Mitarbeiter-Monate auf einmal (zeilen- oder spaltenweise Eingabe)."""
+    import numpy as np
+
+    from .batch import calculate_salary_batch
+
+    if not isinstance(daten, dict):
+        raise APIFehler(400, "Erwartet wird ein JSON-Objekt")
+    if 'zeilen' in daten:
+        if not isinstance(daten['zeilen'], list):
+            raise APIFehler(400, "'zeilen' muss eine Liste sein")
+        zeilen = [_eingaben(zeile) for zeile in daten['zeilen']]
+        spalten = [np.array(werte) for werte in zip(*zeilen)] if zeilen else [np.empty(0)] * len(EINGABE_FELDER)
+        # Zeitraum je Zeile; Zeilen ohne "jahr" rechnen mit RATES und MINIJOB_GRENZE
+        if any('jahr' in zeile for zeile in daten['zeilen']):
+            daten = {
+                'jahr': [zeile.get('jahr') for zeile in daten['zeilen']],
+                'monat': [zeile.get('monat', 1) for zeile in daten['zeilen']]
+            }
+    else:
+        fehlend = [feld for feld in ('grundlohn', 'stunden') if feld not in daten]
+        if fehlend:
+            raise APIFehler(400, f"Fehlende Felder: {', '.join(fehlend)}")
+        keine_liste = [feld for feld in (*EINGABE_FELDER, 'jahr', 'monat') if feld in daten and not isinstance(daten[feld], list)]
+        if keine_liste:
+            raise APIFehler(400, f"Spalten müssen Listen sein: {', '.join(keine_liste)}")
+        anzahl = len(daten['grundlohn'])
+        try:
+            spalten = [
+                np.asarray(
+                    daten[feld] if feld in daten else np.zeros(anzahl),
+                    dtype=bool if feld in ('sf_zuschlag', 'nacht_zuschlag') else np.float64
+                )
+                for feld in EINGABE_FELDER
+            ]
+        except (TypeError, ValueError) as e:
+            raise APIFehler(400, f"Ungültiger Wert: {e}") from None
+        if any(spalte.shape != (anzahl,) for spalte in spalten):
+            raise APIFehler(400, "Alle Spalten müssen gleich lang sein")
+        if not all(np.isfinite(spalte).all() for spalte in spalten):
+            raise APIFehler(400, "Ungültiger Wert: NaN oder Infinity")
+
+    rates = grenze = None
+    if 'jahr' in daten:
+        from .saetze import saetze_fuer_ordinale
+
+        try:
+            hat_jahr = np.array([jahr is not None for jahr in daten['jahr']], dtype=bool)
+            jahr = np.asarray([2013 if jahr is None else jahr for jahr in daten['jahr']], dtype=np.int64)
+            monat = np.asarray(daten.get('monat', np.ones_like(jahr)), dtype=np.int64)
+            if jahr.shape != spalten[0].shape or monat.shape != jahr.shape:
+                raise ValueError("'jahr' und 'monat' müssen so lang sein wie die übrigen Spalten")
+            if np.any((monat < 1) | (monat > 12)):
+                raise ValueError("'monat' muss zwischen 1 und 12 liegen")
+            rates, grenze = rates_und_grenze(saetze_fuer_ordinale(jahr * 12 + monat - 1))
+        except (TypeError, ValueError) as e:
+            raise APIFehler(400, f"Ungültiger Zeitraum: {e}") from None
+        if not hat_jahr.all():
+            rates = {name: np.where(hat_jahr, satz, RATES[name]) for name, satz in rates.items()}
+            grenze = np.where(hat_jahr, grenze, MINIJOB_GRENZE)
+
+    ergebnis = calculate_salary_batch(*spalten, rates=rates, minijob_grenze=grenze)
+    return {feld: werte.tolist() for feld, werte in ergebnis.items()}
+
+def _als_monat(ordinal) -> dict:
+    if ordinal is None:
+        return None
+    jahr, monat_index = divmod(ordinal, 12)
+    return {'jahr': jahr, 'monat': monat_index + 1, 'monatsname': MONATE[monat_index]}
+
+def _monat_index(monat) -> int:
+    """Monat 1-12 aus JSON als Index 0-11; andere Werte würden still in ein anderes Jahr rutschen."""
+    monat = int(monat)
+    if not 1 <= monat <= 12:
+        raise ValueError(f"Monat muss zwischen 1 und 12 liegen, nicht {monat}")
+    return monat - 1
+
+def _zeitjahr(daten) -> dict:
+    from .zeitjahr import zeitjahr_auswerten
+
+    if not isinstance(daten, dict):
+        raise APIFehler(400, "Erwartet wird ein JSON-Objekt")
+    try:
+        if 'brutto' in daten:
+            import numpy as np
+
+            from .saetze import saetze_fuer_ordinale
+
+            erster = int(daten['start_jahr']) * 12 + _monat_index(daten.get('start_monat', 1))
+            brutto = np.asarray(daten['brutto'], dtype=np.float64)
+            # Ohne "grenze" gilt je Monat die Minijob-Grenze aus der Satztabelle
+            grenze = float(daten['grenze']) if 'grenze' in daten \
+                else saetze_fuer_ordinale(erster + np.arange(brutto.size))['minijob_grenze']
+            ordinale = (erster + np.flatnonzero(brutto > grenze)).tolist()
+        else:
+            ordinale = sorted(int(ol['jahr']) * 12 + _monat_index(ol['monat']) for ol in daten['ueberschreitungen'])
+    except KeyError as e:
+        raise APIFehler(400, f"Fehlendes Feld: {e.args[0]}") from None
+    except (TypeError, ValueError) as e:
+        raise APIFehler(400, f"Ungültiger Wert: {e}") from None
+
+    auswertung = zeitjahr_auswerten(ordinale)
+    return {
+        'ueberschreitungen': [_als_monat(o) for o in ordinale],
+        'statusverlust': _als_monat(auswertung['verlust']),
+        'zeitjahr_start': _als_monat(auswertung['start']),
+        'anzahl': auswertung['anzahl']
+    }
+
+def _feiertage(parameter: dict) -> list:
+    try:
+        jahr = int(parameter.get('jahr', [''])[0])
+    except ValueError:
+        raise APIFehler(400, "Parameter 'jahr' fehlt oder ist keine Zahl") from None
+    try:
+        feiertage = get_feiertage_nach_datum(jahr, parameter.get('land', ['NW'])[0])
+    except ValueError as e:
+        raise APIFehler(400, str(e)) from None
+    return [{'datum': tag.isoformat(), 'name': name} for tag, name in feiertage.items()]
+
+class LohnAPI:
+    """ASGI-Anwendung; `max_parallel` begrenzt gleichzeitige Batch-Berechnungen."""
+
+    def __init__(self, max_parallel: int = None, max_body_bytes: int = 64 << 20):
+        self.max_parallel = max_parallel or os.cpu_count() or 1
+        self.max_body_bytes = max_body_bytes
+        self._semaphor = None
+        self._routen = {
+            ('GET', '/gesundheit'): self._gesundheit,
+            ('POST', '/gehalt'): self._route_gehalt,
+            ('POST', '/gehalt/batch'): self._route_gehalt_batch,
+            ('POST', '/zeitjahr'): self._route_zeitjahr,
+            ('GET', '/feiertage'): self._route_feiertage
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            while True:
+                nachricht = await receive()
+                if nachricht['type'] == 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+                elif nachricht['type'] == 'lifespan.shutdown':
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+        if scope['type'] != 'http':
+            return
+
+        try:
+            route = self._routen.get((scope['method'], scope['path']))
+            if route is None:
+                if any(pfad == scope['path'] for _, pfad in self._routen):
+                    raise APIFehler(405, "Methode nicht erlaubt")
+                raise APIFehler(404, "Unbekannter Pfad")
+            antwort = await route(scope, receive)
+            status, body = 200, antwort if isinstance(antwort, bytes) else _als_json(antwort)
+        except APIFehler as e:
+            status, body = e.status, _als_json({'fehler': str(e)})
+
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'application/json; charset=utf-8'), (b'content-length', str(len(body)).encode())]
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def _body(self, receive) -> bytes:
+        teile, groesse = [], 0
+        while True:
+            nachricht = await receive()
+            if nachricht['type'] == 'http.disconnect':
+                raise APIFehler(400, "Verbindung abgebrochen")
+            teile.append(nachricht.get('body', b''))
+            groesse += len(teile[-1])
+            if groesse > self.max_body_bytes:
+                raise APIFehler(413, "Anfrage zu groß")
+            if not nachricht.get('more_body', False):
+                break
+        return b''.join(teile)
+
+    async def _im_thread(self, funktion, *args):
+        """Führt rechenintensive Arbeit in einem Thread aus, höchstens max_parallel gleichzeitig."""
+        if self._semaphor is None:
+            self._semaphor = asyncio.Semaphore(self.max_parallel)
+        async with self._semaphor:
+            return await asyncio.to_thread(funktion, *args)
+
+    async def _gesundheit(self, scope, receive):
+        return {'status': 'ok'}
+
+    async def _route_gehalt(self, scope, receive):
+        return _gehalt(_json_lesen(await self._body(receive)))
+
+    async def _route_gehalt_batch(self, scope, receive):
+        # Auch Parsen und Serialisieren großer Batches laufen im Thread
+        body = await self._body(receive)
+        return await self._im_thread(lambda: _als_json(_gehalt_batch(_json_lesen(body))))
+
+    async def _route_zeitjahr(self, scope, receive):
+        return await self._im_thread(_zeitjahr, _json_lesen(await self._body(receive)))
+
+    async def _route_feiertage(self, scope, receive):
+        return _feiertage(parse_qs(scope.get('query_string', b'').decode('latin-1')))
+
+app = LohnAPI()
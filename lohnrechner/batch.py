@@ -0,0 +1,103 @@
+"""Vektorisierte Gehaltsberechnung für beliebig viele Mitarbeiter-Monate."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .konstanten import EINGABE_FELDER, MINIJOB_GRENZE, RATES
+from .profil import gemessen
+from .saetze import rates_und_grenze, saetze_fuer_ordinale
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+@gemessen()
+def calculate_salary_batch(grundlohn, stunden,
+                           sf_zuschlag, sf_zuschlag_stunden,
+                           nacht_zuschlag, nacht_zuschlag_stunden,
+                           rates: dict = None, minijob_grenze=None) -> dict:
+    """Vektorisierte Variante von calculate_salary für beliebig viele Mitarbeiter-Monate.
+
+    Alle Parameter sind Arrays (oder Skalare) gleicher Länge. Die Rechenschritte
+    entsprechen exakt denen von calculate_salary, die Ergebnisse sind daher
+    centgenau identisch. Die Werte in `rates` und `minijob_grenze` dürfen
+    ebenfalls Arrays sein (ein Satz je Zeile, z. B. aus saetze_fuer_ordinale).
+    Rückgabe: Dict mit den Feldern aus ERGEBNIS_FELDER als Arrays.
+    """
+    if rates is None:
+        rates = RATES
+    if minijob_grenze is None:
+        minijob_grenze = MINIJOB_GRENZE
+    grundlohn = np.asarray(grundlohn, dtype=np.float64)
+    stunden = np.asarray(stunden, dtype=np.float64)
+    sf_zuschlag = np.asarray(sf_zuschlag, dtype=bool)
+    nacht_zuschlag = np.asarray(nacht_zuschlag, dtype=bool)
+    grundlohn, stunden, sf_zuschlag, sf_zuschlag_stunden, nacht_zuschlag, nacht_zuschlag_stunden = np.broadcast_arrays(
+        grundlohn, stunden, sf_zuschlag, np.asarray(sf_zuschlag_stunden, dtype=np.float64),
+        nacht_zuschlag, np.asarray(nacht_zuschlag_stunden, dtype=np.float64)
+    )
+
+    brutto_grundlohn_stunden = grundlohn * stunden
+    brutto_grundlohn_fuer_grenze = brutto_grundlohn_stunden
+
+    # Gleiche Reihenfolge der Additionen wie im Skalarfall (0.0 + SF + Nacht)
+    sf_stunden = np.minimum(sf_zuschlag_stunden, stunden)
+    nacht_stunden = np.minimum(nacht_zuschlag_stunden, stunden)
+    zuschlage = np.where(sf_zuschlag, grundlohn * sf_stunden * rates["sf_zuschlag_rate"], 0.0)
+    zuschlage = np.where(nacht_zuschlag, zuschlage + grundlohn * nacht_stunden * rates["nacht_zuschlag_rate"], zuschlage)
+
+    brutto_gesamt = brutto_grundlohn_fuer_grenze + zuschlage
+
+    innerhalb_grenze = brutto_grundlohn_fuer_grenze <= minijob_grenze
+    rentenversicherung_abzug = np.where(
+        innerhalb_grenze, brutto_grundlohn_fuer_grenze * rates["rentenversicherung_minijob"], 0.0
+    )
+    pauschale_abzuege = np.where(
+        innerhalb_grenze, 0.0, brutto_grundlohn_fuer_grenze * rates["pauschale_abzuege_ueber_minijob"]
+    )
+    gesamte_abzuege = np.where(innerhalb_grenze, rentenversicherung_abzug, pauschale_abzuege)
+
+    netto = brutto_gesamt - gesamte_abzuege
+
+    freibetrag_rest = np.maximum(0.0, minijob_grenze - brutto_grundlohn_fuer_grenze)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rest_stunden = np.where(grundlohn > 0, np.trunc(freibetrag_rest / grundlohn), 0).astype(np.int64)
+
+    return {
+        'brutto_grundlohn_stunden': brutto_grundlohn_stunden,
+        'brutto_grundlohn_fuer_grenze': brutto_grundlohn_fuer_grenze,
+        'zuschlage': zuschlage,
+        'brutto_gesamt': brutto_gesamt,
+        'netto': netto,
+        'gesamte_abzuege': gesamte_abzuege,
+        'rentenversicherung_abzug': rentenversicherung_abzug,
+        'pauschale_abzuege': pauschale_abzuege,
+        'freibetrag_rest': freibetrag_rest,
+        'rest_stunden': rest_stunden
+    }
+
+def saetze_je_zeile(df: pd.DataFrame) -> tuple:
+    """(rates, minijob_grenze) je Zeile aus den Spalten 'jahr' und 'monat' (1-12), ohne diese Spalten (None, None)."""
+    if 'jahr' not in df.columns or 'monat' not in df.columns:
+        return None, None
+    ordinale = df['jahr'].to_numpy(dtype=np.int64) * 12 + df['monat'].to_numpy(dtype=np.int64) - 1
+    return rates_und_grenze(saetze_fuer_ordinale(ordinale))
+
+def calculate_salary_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Berechnet alle Zeilen eines DataFrames mit den Spalten aus EINGABE_FELDER auf einmal.
+
+    Hat df die Spalten 'jahr' und 'monat', gelten je Zeile die Sätze dieses
+    Monats (saetze_fuer_ordinale), sonst RATES und MINIJOB_GRENZE.
+    """
+    import pandas as pd
+
+    fehlend = [feld for feld in EINGABE_FELDER if feld not in df.columns]
+    if fehlend:
+        raise KeyError(f"Fehlende Spalten für die Gehaltsberechnung: {', '.join(fehlend)}")
+    rates, minijob_grenze = saetze_je_zeile(df)
+    ergebnis = calculate_salary_batch(
+        *(df[feld].to_numpy() for feld in EINGABE_FELDER), rates=rates, minijob_grenze=minijob_grenze
+    )
+    return pd.DataFrame(ergebnis, index=df.index)
@@ -0,0 +1,62 @@
+"""Gehaltsberechnung für einen Monat (ohne NumPy, schnell importierbar)."""
+
+from .konstanten import MINIJOB_GRENZE, RATES
+from .profil import gemessen
+
+@gemessen()
+def calculate_salary(grundlohn: float, stunden: float,
+                     sf_zuschlag: bool, sf_zuschlag_stunden: float,
+                     nacht_zuschlag: bool, nacht_zuschlag_stunden: float,
+                     rates: dict = None, minijob_grenze: float = None) -> dict: # Urlaubsentgelt entfernt
+    """Berechnet das Gehalt mit allen Zuschlägen und Abzügen.
+
+    `rates` und `minijob_grenze` (z. B. rates_und_grenze(saetze_fuer_monat(...))) ersetzen RATES
+    und MINIJOB_GRENZE für andere Zeiträume.
+    """
+    if rates is None:
+        rates = RATES
+    if minijob_grenze is None:
+        minijob_grenze = MINIJOB_GRENZE
+    
+    brutto_grundlohn_stunden = grundlohn * stunden
+    brutto_grundlohn_fuer_grenze = brutto_grundlohn_stunden # Urlaubsentgelt nicht mehr enthalten
+    
+    zuschlage = 0.0
+    if sf_zuschlag:
+        sf_stunden = min(sf_zuschlag_stunden, stunden)
+        zuschlage += grundlohn * sf_stunden * rates["sf_zuschlag_rate"]
+        
+    if nacht_zuschlag:
+        nacht_stunden = min(nacht_zuschlag_stunden, stunden)
+        zuschlage += grundlohn * nacht_stunden * rates["nacht_zuschlag_rate"]
+            
+    brutto_gesamt = brutto_grundlohn_fuer_grenze + zuschlage 
+    
+    rentenversicherung_abzug = 0.0
+    pauschale_abzuege = 0.0
+    gesamte_abzuege = 0.0
+    
+    if brutto_grundlohn_fuer_grenze <= minijob_grenze: 
+        rentenversicherung_abzug = brutto_grundlohn_fuer_grenze * rates["rentenversicherung_minijob"]
+        gesamte_abzuege = rentenversicherung_abzug
+    else:
+        pauschale_abzuege = brutto_grundlohn_fuer_grenze * rates["pauschale_abzuege_ueber_minijob"]
+        gesamte_abzuege = pauschale_abzuege
+            
+    netto = brutto_gesamt - gesamte_abzuege
+    
+    freibetrag_rest = max(0, minijob_grenze - brutto_grundlohn_fuer_grenze)
+    rest_stunden = int(freibetrag_rest / grundlohn) if grundlohn > 0 else 0
+    
+    return {
+        'brutto_grundlohn_stunden': brutto_grundlohn_stunden, 
+        'brutto_grundlohn_fuer_grenze': brutto_grundlohn_fuer_grenze, 
+        'zuschlage': zuschlage,
+        'brutto_gesamt': brutto_gesamt,
+        'netto': netto,
+        'gesamte_abzuege': gesamte_abzuege,
+        'rentenversicherung_abzug': rentenversicherung_abzug,
+        'pauschale_abzuege': pauschale_abzuege,
+        'freibetrag_rest': freibetrag_rest,
+        'rest_stunden': rest_stunden
+    }
@@ -0,0 +1,265 @@
+"""Kommandozeile ohne Streamlit (python -m lohnrechner)."""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from .batch import calculate_salary_batch, calculate_salary_frame
+from .konstanten import BUNDESLAENDER, CSV_SPALTEN, ERGEBNIS_FELDER
+from .profil import PROFIL
+from .schichten import shifts_to_monthly
+
+def process_payroll_csv(eingabe, ausgabe, blockgroesse: int = 16 << 20, fortschritt=None) -> dict:
+    """Verarbeitet eine Lohn-CSV blockweise und schreibt die Ergebnisse fortlaufend.
+
+    Erwartet die Spalten des Sidebar-Exports (Monat, Grundlohn, Stunden, SF_Zuschlag, ...).
+    Gelesen und geschrieben wird mit den Streaming-Readern/-Writern von pyarrow, so
+    liegt immer nur ein Block von `blockgroesse` Bytes im Speicher. Die Zeile
+    'OverLimitData' und deren OL-Spalten werden übersprungen. `fortschritt` wird
+    nach jedem Block mit (zeilen, sekunden) aufgerufen.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+
+    spalten_typen = {'Monat': pa.string(), 'SF_Zuschlag': pa.bool_(), 'Nacht_Zuschlag': pa.bool_()}
+    for spalte in CSV_SPALTEN:
+        spalten_typen.setdefault(spalte, pa.float64())
+
+    start = time.perf_counter()
+    zeilen = 0
+    reader = pa_csv.open_csv(
+        eingabe,
+        read_options=pa_csv.ReadOptions(block_size=blockgroesse),
+        convert_options=pa_csv.ConvertOptions(column_types=spalten_typen)
+    )
+    fehlend = [spalte for spalte in ['Monat', *CSV_SPALTEN] if spalte not in reader.schema.names]
+    if fehlend:
+        raise ValueError(f"Fehlende Spalten in der CSV-Datei: {', '.join(fehlend)}")
+    behalten = [spalte for spalte in reader.schema.names if not spalte.startswith('OL')]
+
+    writer = None
+    try:
+        for block in reader:
+            block = block.select(behalten).filter(pc.not_equal(block.column('Monat'), 'OverLimitData'))
+            spalten = {spalte: block.column(spalte).to_numpy(zero_copy_only=False) for spalte in CSV_SPALTEN}
+
+            ergebnis = calculate_salary_batch(*(spalten[spalte] for spalte in CSV_SPALTEN))
+            for feld in ERGEBNIS_FELDER:
+                werte = ergebnis[feld]
+                block = block.append_column(feld, pa.array(np.round(werte, 2) if werte.dtype.kind == 'f' else werte))
+
+            if writer is None:
+                writer = pa_csv.CSVWriter(ausgabe, block.schema, write_options=pa_csv.WriteOptions(quoting_style='needed'))
+            writer.write_batch(block)
+            zeilen += block.num_rows
+            if fortschritt is not None:
+                fortschritt(zeilen, time.perf_counter() - start)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    dauer = time.perf_counter() - start
+    return {'zeilen': zeilen, 'sekunden': dauer, 'zeilen_pro_sekunde': zeilen / dauer if dauer > 0 else 0.0}
+
+def _fortschritt(zeilen, sekunden):
+    rate = zeilen / sekunden if sekunden > 0 else 0.0
+    print(f"{zeilen} Zeilen verarbeitet ({rate:,.0f} Zeilen/s)", file=sys.stderr)
+
+def _cli_batch(args) -> int:
+    eingabe = sys.stdin.buffer if args.eingabe == '-' else args.eingabe
+    blockgroesse = args.blockgroesse << 20
+    if args.ausgabe == '-':
+        statistik = process_payroll_csv(eingabe, sys.stdout.buffer, blockgroesse, _fortschritt)
+    else:
+        with open(args.ausgabe, 'wb') as ausgabe:
+            statistik = process_payroll_csv(eingabe, ausgabe, blockgroesse, _fortschritt)
+
+    print(
+        f"Fertig: {statistik['zeilen']} Zeilen in {statistik['sekunden']:.2f} s "
+        f"({statistik['zeilen_pro_sekunde']:,.0f} Zeilen/s)",
+        file=sys.stderr
+    )
+    return 0
+
+def _cli_schichten(args) -> int:
+    import pandas as pd
+
+    start = time.perf_counter()
+    schichten = pd.read_csv(sys.stdin if args.eingabe == '-' else args.eingabe, parse_dates=['beginn', 'ende'])
+    monatlich = shifts_to_monthly(schichten, args.land)
+    if 'grundlohn' in monatlich.columns:
+        monatlich = pd.concat([monatlich, calculate_salary_frame(monatlich).round(2)], axis=1)
+    monatlich.to_csv(sys.stdout if args.ausgabe == '-' else args.ausgabe, index=False)
+    print(
+        f"Fertig: {len(schichten)} Schichten -> {len(monatlich)} Mitarbeiter-Monate "
+        f"in {time.perf_counter() - start:.2f} s",
+        file=sys.stderr
+    )
+    return 0
+
+def _cli_pruefen(args) -> int:
+    import pandas as pd
+
+    from .pruefung import validate_payroll_frame
+
+    start = time.perf_counter()
+    df = pd.read_csv(sys.stdin if args.eingabe == '-' else args.eingabe)
+    df.index += 2  # Zeilennummern der Datei (Kopfzeile = 1)
+    if 'Monat' in df.columns:
+        df = df.loc[df['Monat'] != 'OverLimitData', [spalte for spalte in df.columns if not spalte.startswith('OL')]]
+    gueltig, fehler = validate_payroll_frame(df, args.jahr, land=args.land)
+
+    fehler.to_csv(sys.stdout if args.ausgabe == '-' else args.ausgabe, index=False)
+    if args.gueltig:
+        gueltig.to_csv(args.gueltig, index=False)
+    print(
+        f"Fertig: {len(df)} Zeilen in {time.perf_counter() - start:.2f} s geprüft, "
+        f"{len(gueltig)} gültig, {len(df) - len(gueltig)} mit insgesamt {len(fehler)} Fehlern",
+        file=sys.stderr
+    )
+    return 1 if len(fehler) else 0
+
+def _monatsdaten_lesen(eingabe):
+    """Mitarbeiter-Monate aus einer CSV ('-' für stdin) oder einem Parquet-Archiv (.zip)."""
+    import pandas as pd
+
+    from .speicher import load_parquet
+
+    if eingabe.endswith('.zip'):
+        monatsdaten, _ = load_parquet(eingabe)
+        return monatsdaten
+    return pd.read_csv(sys.stdin if eingabe == '-' else eingabe)
+
+def _cli_vergleich(args) -> int:
+    from .vergleich import compare_runs
+
+    start = time.perf_counter()
+    if args.alt == '-' and args.neu == '-':
+        raise ValueError("Nur einer der beiden Läufe kann von stdin gelesen werden")
+    ergebnis = compare_runs(_monatsdaten_lesen(args.alt), _monatsdaten_lesen(args.neu))
+
+    ergebnis['felder'].to_csv(sys.stdout if args.ausgabe == '-' else args.ausgabe, index=False)
+    if args.grenze:
+        ergebnis['grenze'].to_csv(args.grenze, index=False)
+    if args.zeitjahr:
+        ergebnis['zeitjahr'].to_csv(args.zeitjahr, index=False)
+
+    summen = ergebnis['summen']
+    print(
+        f"Fertig: {summen['verglichen']} Mitarbeiter-Monate in {time.perf_counter() - start:.2f} s verglichen; "
+        f"{summen['geaenderte_monate']} geändert ({summen['geaenderte_felder']} Beträge), "
+        f"{summen['grenzwechsel']} Grenzwechsel, {summen['zeitjahr_wechsel']} Zeitjahr-Wechsel, "
+        f"{summen['nur_alt']} nur alt, {summen['nur_neu']} nur neu",
+        file=sys.stderr
+    )
+    return 0
+
+def _fortschritt_abrechnungen(anzahl, sekunden):
+    rate = anzahl / sekunden if sekunden > 0 else 0.0
+    print(f"{anzahl} Abrechnungen geschrieben ({rate:,.0f} Abrechnungen/s)", file=sys.stderr)
+
+def _cli_abrechnungen(args) -> int:
+    from .abrechnung import write_payslips
+
+    monatsdaten = _monatsdaten_lesen(args.eingabe)
+    vorlage = None
+    if args.vorlage:
+        with open(args.vorlage, encoding='utf-8') as datei:
+            vorlage = datei.read()
+    statistik = write_payslips(
+        monatsdaten, sys.stdout.buffer if args.ausgabe == '-' else args.ausgabe, args.format,
+        archiv=True if args.zip else None, vorlage=vorlage, fortschritt=_fortschritt_abrechnungen
+    )
+    print(
+        f"Fertig: {statistik['abrechnungen']} Abrechnungen ({statistik['bytes'] / 2**20:.1f} MiB) "
+        f"in {statistik['sekunden']:.2f} s ({statistik['abrechnungen_pro_sekunde']:,.0f} Abrechnungen/s)",
+        file=sys.stderr
+    )
+    return 0
+
+def _fortschritt_shards(fertig, gesamt, zeilen):
+    print(f"Shard {fertig}/{gesamt} fertig ({zeilen} Mitarbeiter-Monate)", file=sys.stderr)
+
+def _cli_jahresabschluss(args) -> int:
+    import pandas as pd
+
+    from .jahreslauf import run_year_end
+
+    start = time.perf_counter()
+    monatsdaten = _monatsdaten_lesen(args.eingabe)
+    ergebnis = run_year_end(monatsdaten, workers=args.workers, fortschritt=_fortschritt_shards)
+
+    ergebnis['mitarbeiter'].to_csv(sys.stdout if args.ausgabe == '-' else args.ausgabe)
+    if args.monate:
+        pd.concat([monatsdaten, ergebnis['monate'].round(2)], axis=1).to_csv(args.monate, index=False)
+
+    summen = ergebnis['summen']
+    print(
+        f"Fertig: {summen['mitarbeiter']} Mitarbeiter, {summen['monate']} Monate in {time.perf_counter() - start:.2f} s; "
+        f"Brutto {summen['brutto_gesamt_cent'] / 100:,.2f} €, Netto {summen['netto_cent'] / 100:,.2f} €, "
+        f"Statusverluste {summen['statusverluste']}",
+        file=sys.stderr
+    )
+    return 0
+
+def run_cli(argv=None) -> int:
+    """Einstiegspunkt für den Kommandozeilenbetrieb ohne Streamlit."""
+    parser = argparse.ArgumentParser(description="Gehaltsrechner 2025 – Kommandozeile")
+    unterbefehle = parser.add_subparsers(dest='befehl', required=True)
+
+    batch_parser = unterbefehle.add_parser('batch', help="Lohn-CSV blockweise berechnen")
+    batch_parser.add_argument('eingabe', help="CSV-Datei im Format des Sidebar-Exports ('-' für stdin)")
+    batch_parser.add_argument('-o', '--ausgabe', default='-', help="Ziel-CSV ('-' für stdout)")
+    batch_parser.add_argument('--blockgroesse', type=int, default=16, help="Blockgröße in MiB")
+    batch_parser.set_defaults(ausfuehren=_cli_batch)
+
+    schichten_parser = unterbefehle.add_parser('schichten', help="Schichten zu Monatsstunden mit Zuschlägen zusammenfassen")
+    schichten_parser.add_argument('eingabe', help="CSV mit mitarbeiter, beginn, ende (optional land, grundlohn; '-' für stdin)")
+    schichten_parser.add_argument('-o', '--ausgabe', default='-', help="Ziel-CSV ('-' für stdout)")
+    schichten_parser.add_argument('--land', default='NW', choices=list(BUNDESLAENDER), help="Bundesland für Feiertage")
+    schichten_parser.set_defaults(ausfuehren=_cli_schichten)
+
+    pruefen_parser = unterbefehle.add_parser('pruefen', help="Lohn-CSV prüfen: Fehlertabelle je Zeile, gültige Zeilen separat")
+    pruefen_parser.add_argument('eingabe', help="CSV im Format des Sidebar-Exports oder mit den Eingabefeldern ('-' für stdin)")
+    pruefen_parser.add_argument('-o', '--ausgabe', default='-', help="Ziel-CSV der Fehlertabelle ('-' für stdout)")
+    pruefen_parser.add_argument('--gueltig', help="optional: Ziel-CSV mit den gültigen Zeilen")
+    pruefen_parser.add_argument('--jahr', type=int, default=None, help="Jahr für den Mindestlohn je Monat (Standard: Spalte 'jahr' oder aktueller Mindestlohn)")
+    pruefen_parser.add_argument('--land', default='NW', choices=list(BUNDESLAENDER), help="Bundesland für Feiertage, wenn die Datei keine Spalte 'land' hat")
+    pruefen_parser.set_defaults(ausfuehren=_cli_pruefen)
+
+    abschluss_parser = unterbefehle.add_parser('jahresabschluss', help="Gehälter und Zeitjahr aller Mitarbeiter parallel berechnen")
+    abschluss_parser.add_argument('eingabe', help="CSV mit mitarbeiter, jahr, monat und den Eingabefeldern oder Parquet-Archiv (.zip)")
+    abschluss_parser.add_argument('-o', '--ausgabe', default='-', help="Ziel-CSV je Mitarbeiter ('-' für stdout)")
+    abschluss_parser.add_argument('--monate', help="optional: Ziel-CSV mit den Ergebnissen je Mitarbeiter-Monat")
+    abschluss_parser.add_argument('--workers', type=int, default=None, help="Anzahl Prozesse (Standard: alle Kerne)")
+    abschluss_parser.set_defaults(ausfuehren=_cli_jahresabschluss)
+
+    abrechnungen_parser = unterbefehle.add_parser('abrechnungen', help="Lohnabrechnungen je Mitarbeiter-Monat als Text oder HTML")
+    abrechnungen_parser.add_argument('eingabe', help="CSV mit mitarbeiter, jahr, monat und den Eingabefeldern (optional Ergebnisfeldern) oder Parquet-Archiv (.zip)")
+    abrechnungen_parser.add_argument('-o', '--ausgabe', default='-', help="Ziel: .zip für eine Datei je Abrechnung, sonst eine fortlaufende Datei ('-' für stdout)")
+    abrechnungen_parser.add_argument('--format', default='text', choices=['text', 'html'], help="Format der Abrechnungen")
+    abrechnungen_parser.add_argument('--zip', action='store_true', help="ZIP auch ohne Endung .zip schreiben (z. B. nach stdout)")
+    abrechnungen_parser.add_argument('--vorlage', help="eigene Vorlage (str.format-Syntax, Felder wie die Standardvorlage)")
+    abrechnungen_parser.set_defaults(ausfuehren=_cli_abrechnungen)
+
+    vergleich_parser = unterbefehle.add_parser('vergleich', help="Zwei Lohnläufe je Mitarbeiter-Monat vergleichen")
+    vergleich_parser.add_argument('alt', help="CSV oder Parquet-Archiv (.zip) des alten Laufs ('-' für stdin)")
+    vergleich_parser.add_argument('neu', help="CSV oder Parquet-Archiv (.zip) des neuen Laufs ('-' für stdin)")
+    vergleich_parser.add_argument('-o', '--ausgabe', default='-', help="Ziel-CSV der geänderten Beträge ('-' für stdout)")
+    vergleich_parser.add_argument('--grenze', help="optional: Ziel-CSV der Wechsel über/unter die Minijob-Grenze")
+    vergleich_parser.add_argument('--zeitjahr', help="optional: Ziel-CSV der Mitarbeiter mit geändertem Statusverlust")
+    vergleich_parser.set_defaults(ausfuehren=_cli_vergleich)
+
+    args = parser.parse_args(argv)
+    PROFIL.neuer_lauf()
+    PROFIL.abschnitt(f"cli {args.befehl}")
+    try:
+        return args.ausfuehren(args)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 1
+    finally:
+        PROFIL.lauf_beenden()
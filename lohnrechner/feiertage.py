@@ -0,0 +1,91 @@
+"""Gesetzliche Feiertage je Jahr und Bundesland (aus Regeln berechnet, gecacht)."""
+
+from datetime import date, timedelta
+from functools import lru_cache
+from types import MappingProxyType
+
+from .konstanten import BUNDESLAENDER
+
+def get_ostersonntag(jahr: int) -> date:
+    """Berechnet den Ostersonntag (gregorianisch, Algorithmus nach Meeus/Jones/Butcher)."""
+    a = jahr % 19
+    b, c = divmod(jahr, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    monat, tag = divmod(h + l - 7 * m + 114, 31)
+    return date(jahr, monat, tag + 1)
+
+def _buss_und_bettag(jahr: int) -> date:
+    """Mittwoch vor dem 23. November."""
+    tag = date(jahr, 11, 22)
+    return tag - timedelta(days=(tag.weekday() - 2) % 7)
+
+# Regeln: (Name, Datum aus (Jahr, Ostersonntag), Bundesländer (None = bundesweit), gültig von, gültig bis)
+FEIERTAGS_REGELN = [
+    ('Neujahr', lambda j, o: date(j, 1, 1), None, None, None),
+    ('Heilige Drei Könige', lambda j, o: date(j, 1, 6), {'BW', 'BY', 'ST'}, None, None),
+    ('Internationaler Frauentag', lambda j, o: date(j, 3, 8), {'BE'}, 2019, None),
+    ('Internationaler Frauentag', lambda j, o: date(j, 3, 8), {'MV'}, 2023, None),
+    ('Karfreitag', lambda j, o: o - timedelta(days=2), None, None, None),
+    ('Ostersonntag', lambda j, o: o, {'BB'}, None, None),
+    ('Ostermontag', lambda j, o: o + timedelta(days=1), None, None, None),
+    ('Tag der Arbeit', lambda j, o: date(j, 5, 1), None, None, None),
+    ('Tag der Befreiung', lambda j, o: date(j, 5, 8), {'BE'}, 2020, 2020),
+    ('Tag der Befreiung', lambda j, o: date(j, 5, 8), {'BE'}, 2025, 2025),
+    ('Christi Himmelfahrt', lambda j, o: o + timedelta(days=39), None, None, None),
+    ('Pfingstsonntag', lambda j, o: o + timedelta(days=49), {'BB'}, None, None),
+    ('Pfingstmontag', lambda j, o: o + timedelta(days=50), None, None, None),
+    ('Fronleichnam', lambda j, o: o + timedelta(days=60), {'BW', 'BY', 'HE', 'NW', 'RP', 'SL'}, None, None),
+    ('Mariä Himmelfahrt', lambda j, o: date(j, 8, 15), {'SL'}, None, None),
+    ('Weltkindertag', lambda j, o: date(j, 9, 20), {'TH'}, 2019, None),
+    ('Tag der Deutschen Einheit', lambda j, o: date(j, 10, 3), None, 1990, None),
+    ('Reformationstag', lambda j, o: date(j, 10, 31), {'BB', 'MV', 'SN', 'ST', 'TH'}, None, None),
+    ('Reformationstag', lambda j, o: date(j, 10, 31), {'HB', 'HH', 'NI', 'SH'}, 2018, None),
+    ('Reformationstag', lambda j, o: date(j, 10, 31), None, 2017, 2017),
+    ('Allerheiligen', lambda j, o: date(j, 11, 1), {'BW', 'BY', 'NW', 'RP', 'SL'}, None, None),
+    ('Buß- und Bettag', lambda j, o: _buss_und_bettag(j), {'SN'}, None, None),
+    ('1. Weihnachtstag', lambda j, o: date(j, 12, 25), None, None, None),
+    ('2. Weihnachtstag', lambda j, o: date(j, 12, 26), None, None, None)
+]
+
+@lru_cache(maxsize=512)
+def get_feiertage_nach_datum(jahr: int, land: str = 'NW') -> MappingProxyType:
+    """Gibt die Feiertage eines Jahres und Bundeslandes als {date: Name} zurück (chronologisch, gecacht)."""
+    if land not in BUNDESLAENDER:
+        raise ValueError(f"Unbekanntes Bundesland: {land}")
+    ostersonntag = get_ostersonntag(jahr)
+    feiertage = {}
+    for name, berechnung, laender, von, bis in FEIERTAGS_REGELN:
+        if laender is not None and land not in laender:
+            continue
+        if (von is not None and jahr < von) or (bis is not None and jahr > bis):
+            continue
+        feiertage[berechnung(jahr, ostersonntag)] = name
+    return MappingProxyType(dict(sorted(feiertage.items())))
+
+@lru_cache(maxsize=512)
+def get_feiertage(jahr: int, land: str = 'NW') -> MappingProxyType:
+    """Gibt die Feiertage eines Jahres und Bundeslandes als {(Monat, Tag): Name} zurück (gecacht)."""
+    return MappingProxyType({
+        (tag.month, tag.day): name for tag, name in get_feiertage_nach_datum(jahr, land).items()
+    })
+
+@lru_cache(maxsize=64)
+def get_feiertags_index(von_jahr: int, bis_jahr: int, land: str = 'NW') -> MappingProxyType:
+    """Vorberechneter Datumsindex {date: Name} über mehrere Jahre (einschließlich bis_jahr)."""
+    index = {}
+    for jahr in range(von_jahr, bis_jahr + 1):
+        index.update(get_feiertage_nach_datum(jahr, land))
+    return MappingProxyType(index)
+
+def ist_feiertag(tag: date, land: str = 'NW') -> bool:
+    """Prüft in O(1), ob ein Datum im Bundesland ein gesetzlicher Feiertag ist."""
+    return tag in get_feiertage_nach_datum(tag.year, land)
+
+# Feiertage NRW 2025 (aus den Regeln berechnet)
+FEIERTAGE_NRW_2025 = get_feiertage(2025, 'NW')
@@ -0,0 +1,114 @@
+"""Festkomma-Rechnung in ganzzahligen Cent.
+
+Beträge sind int64-Cent, Stunden int64-Hundertstelstunden, Sätze Basispunkte
+(1 bp = 0,01 %). Gerundet wird kaufmännisch (ab ,5 vom Betrag weg) und zwar
+je Komponente genau einmal:
+  - Grundlohn und Stunden beim Umrechnen in Cent bzw. Hundertstelstunden
+  - Brutto-Grundlohn = Grundlohn x Stunden
+  - SF- und Nacht-Zuschlag jeweils einzeln, danach wird exakt addiert
+  - Rentenversicherungs- bzw. pauschaler Abzug auf den gerundeten Brutto-Grundlohn
+Netto, Brutto gesamt und Freibetragsrest ergeben sich ohne weitere Rundung.
+rest_stunden wird wie im Gleitkomma-Fall abgeschnitten.
+"""
+
+import numpy as np
+
+from .konstanten import MINIJOB_GRENZE, RATES
+
+def _runden_div(zaehler, nenner: int) -> np.ndarray:
+    """Ganzzahlige Division mit kaufmännischer Rundung."""
+    zaehler = np.asarray(zaehler, dtype=np.int64)
+    return np.sign(zaehler) * ((np.abs(zaehler) + nenner // 2) // nenner)
+
+def _in_hundertstel(werte) -> np.ndarray:
+    """Rechnet Euro bzw. Stunden kaufmännisch gerundet in Hundertstel (int64) um."""
+    werte = np.asarray(werte, dtype=np.float64)
+    return (np.sign(werte) * np.floor(np.abs(werte) * 100 + 0.5)).astype(np.int64)
+
+def _in_basispunkte(satz) -> np.ndarray:
+    return np.round(np.asarray(satz, dtype=np.float64) * 10_000).astype(np.int64)
+
+def calculate_salary_cents(grundlohn_cent, stunden_hundertstel,
+                           sf_zuschlag, sf_zuschlag_stunden_hundertstel,
+                           nacht_zuschlag, nacht_zuschlag_stunden_hundertstel,
+                           rates: dict = None, minijob_grenze=None) -> dict:
+    """Vektorisierte Gehaltsberechnung in ganzzahligen Cent.
+
+    `rates` und `minijob_grenze` (Euro) wie bei calculate_salary_batch, auch je Zeile.
+    Alle Beträge im Ergebnis (Felder wie ERGEBNIS_FELDER) sind int64-Cent, rest_stunden ganze Stunden.
+    """
+    if rates is None:
+        rates = RATES
+    if minijob_grenze is None:
+        minijob_grenze = MINIJOB_GRENZE
+    grundlohn_cent = np.asarray(grundlohn_cent, dtype=np.int64)
+    stunden = np.asarray(stunden_hundertstel, dtype=np.int64)
+    sf_stunden = np.minimum(np.asarray(sf_zuschlag_stunden_hundertstel, dtype=np.int64), stunden)
+    nacht_stunden = np.minimum(np.asarray(nacht_zuschlag_stunden_hundertstel, dtype=np.int64), stunden)
+    grenze_cent = _in_hundertstel(minijob_grenze)
+
+    brutto_grundlohn_stunden = _runden_div(grundlohn_cent * stunden, 100)
+    brutto_grundlohn_fuer_grenze = brutto_grundlohn_stunden
+
+    sf_betrag = _runden_div(grundlohn_cent * sf_stunden * _in_basispunkte(rates["sf_zuschlag_rate"]), 100 * 10_000)
+    nacht_betrag = _runden_div(grundlohn_cent * nacht_stunden * _in_basispunkte(rates["nacht_zuschlag_rate"]), 100 * 10_000)
+    zuschlage = np.where(np.asarray(sf_zuschlag, dtype=bool), sf_betrag, 0) \
+        + np.where(np.asarray(nacht_zuschlag, dtype=bool), nacht_betrag, 0)
+
+    brutto_gesamt = brutto_grundlohn_fuer_grenze + zuschlage
+
+    innerhalb_grenze = brutto_grundlohn_fuer_grenze <= grenze_cent
+    rentenversicherung_abzug = np.where(
+        innerhalb_grenze,
+        _runden_div(brutto_grundlohn_fuer_grenze * _in_basispunkte(rates["rentenversicherung_minijob"]), 10_000), 0
+    )
+    pauschale_abzuege = np.where(
+        innerhalb_grenze,
+        0, _runden_div(brutto_grundlohn_fuer_grenze * _in_basispunkte(rates["pauschale_abzuege_ueber_minijob"]), 10_000)
+    )
+    gesamte_abzuege = rentenversicherung_abzug + pauschale_abzuege
+
+    netto = brutto_gesamt - gesamte_abzuege
+
+    freibetrag_rest = np.maximum(0, grenze_cent - brutto_grundlohn_fuer_grenze)
+    rest_stunden = np.where(grundlohn_cent > 0, freibetrag_rest // np.maximum(grundlohn_cent, 1), 0)
+
+    return {
+        'brutto_grundlohn_stunden': brutto_grundlohn_stunden,
+        'brutto_grundlohn_fuer_grenze': brutto_grundlohn_fuer_grenze,
+        'zuschlage': zuschlage,
+        'brutto_gesamt': brutto_gesamt,
+        'netto': netto,
+        'gesamte_abzuege': gesamte_abzuege,
+        'rentenversicherung_abzug': rentenversicherung_abzug,
+        'pauschale_abzuege': pauschale_abzuege,
+        'freibetrag_rest': freibetrag_rest,
+        'rest_stunden': rest_stunden
+    }
+
+def calculate_salary_batch_exact(grundlohn, stunden,
+                                 sf_zuschlag, sf_zuschlag_stunden,
+                                 nacht_zuschlag, nacht_zuschlag_stunden,
+                                 rates: dict = None, minijob_grenze=None) -> dict:
+    """Wie calculate_salary_batch (Euro und Stunden als float), aber centgenau über calculate_salary_cents gerechnet."""
+    ergebnis = calculate_salary_cents(
+        _in_hundertstel(grundlohn), _in_hundertstel(stunden),
+        sf_zuschlag, _in_hundertstel(sf_zuschlag_stunden),
+        nacht_zuschlag, _in_hundertstel(nacht_zuschlag_stunden),
+        rates=rates, minijob_grenze=minijob_grenze
+    )
+    return {
+        feld: werte if feld == 'rest_stunden' else werte / 100
+        for feld, werte in ergebnis.items()
+    }
+
+def calculate_salary_exact(grundlohn: float, stunden: float,
+                           sf_zuschlag: bool, sf_zuschlag_stunden: float,
+                           nacht_zuschlag: bool, nacht_zuschlag_stunden: float,
+                           rates: dict = None, minijob_grenze: float = None) -> dict:
+    """Centgenaue Variante von calculate_salary mit gleicher Signatur und gleichem Ergebnis-Dict."""
+    ergebnis = calculate_salary_batch_exact(
+        grundlohn, stunden, sf_zuschlag, sf_zuschlag_stunden, nacht_zuschlag, nacht_zuschlag_stunden,
+        rates=rates, minijob_grenze=minijob_grenze
+    )
+    return {feld: werte.item() for feld, werte in ergebnis.items()}
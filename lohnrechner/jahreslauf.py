@@ -0,0 +1,158 @@
+"""Jahresabschluss: Gehälter und Zeitjahr-Prüfung für alle Mitarbeiter, parallel über Prozesse.
+
+Die Eingabe wird nach Mitarbeiter sortiert und in Shards aus ganzen Mitarbeitern
+mit etwa gleich vielen Zeilen geteilt. An die Worker gehen nur NumPy-Spalten
+(kein DataFrame, keine Namen, Mitarbeiter als Ganzzahl-Codes), zurück kommen
+die Ergebnisspalten und die Summen je Mitarbeiter. Zusammengeführt wird in
+Shard-Reihenfolge, die Zeilen erhalten danach wieder ihre ursprüngliche
+Reihenfolge. Sätze und Minijob-Grenze gelten je Zeile für ihren Monat
+(saetze_fuer_ordinale), Jahre mit unterschiedlichen Sätzen lassen sich also
+gemeinsam rechnen. Gerechnet wird centgenau mit calculate_salary_cents; die
+Summen sind Summen dieser Ganzzahlen, stimmen also mit calculate_salary_exact
+überein, gehen untereinander auf (Brutto gesamt = Grundlohn + Zuschläge) und sind
+unabhängig von Shards und Workern exakt reproduzierbar.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .festkomma import _in_hundertstel, calculate_salary_cents
+from .konstanten import EINGABE_FELDER, ERGEBNIS_FELDER
+from .saetze import rates_und_grenze, saetze_fuer_ordinale
+from .zeitjahr import ordinal_als_datum, zeitjahr_je_code
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Beträge, die je Mitarbeiter und insgesamt in Cent summiert werden
+SUMMEN_FELDER = ['brutto_grundlohn_fuer_grenze', 'zuschlage', 'brutto_gesamt', 'gesamte_abzuege', 'netto']
+
+def _shard_auswerten(spalten: dict) -> dict:
+    """Worker: rechnet einen Shard (Zeilen nach Mitarbeiter-Code sortiert)."""
+    codes = spalten['codes']
+    rates, grenze = rates_und_grenze(saetze_fuer_ordinale(spalten['ordinale']))
+    if spalten['grenze'] is not None:
+        grenze = spalten['grenze']
+    cent = calculate_salary_cents(
+        _in_hundertstel(spalten['grundlohn']), _in_hundertstel(spalten['stunden']),
+        spalten['sf_zuschlag'], _in_hundertstel(spalten['sf_zuschlag_stunden']),
+        spalten['nacht_zuschlag'], _in_hundertstel(spalten['nacht_zuschlag_stunden']),
+        rates=rates, minijob_grenze=grenze
+    )
+
+    # Codes sind sortiert: Summen je Mitarbeiter über zusammenhängende Abschnitte
+    eigene, starts = np.unique(codes, return_index=True)
+    lokal = np.searchsorted(eigene, codes)
+    summen = {
+        feld: np.add.reduceat(cent[feld], starts) if codes.size else np.zeros(0, dtype=np.int64)
+        for feld in SUMMEN_FELDER
+    }
+    anzahl, verlust = zeitjahr_je_code(
+        lokal, spalten['ordinale'], cent['brutto_grundlohn_fuer_grenze'] > _in_hundertstel(grenze), eigene.size
+    )
+    return {
+        'ergebnis': {feld: werte if feld == 'rest_stunden' else werte / 100 for feld, werte in cent.items()},
+        'codes': eigene,
+        'monate': np.diff(np.append(starts, codes.size)),
+        'summen': summen,
+        'ueberschreitungen': anzahl,
+        'verlust': verlust
+    }
+
+def _shard_grenzen(codes_sortiert: np.ndarray, shards: int) -> list:
+    """Teilt sortierte Codes in höchstens `shards` Abschnitte ähnlicher Länge, ohne Mitarbeiter zu trennen."""
+    if codes_sortiert.size == 0:
+        return [0, 0]
+    wechsel = np.flatnonzero(np.diff(codes_sortiert)) + 1  # Beginn jedes weiteren Mitarbeiters
+    ziele = np.linspace(0, codes_sortiert.size, shards + 1)[1:-1]
+    schnitte = wechsel[np.minimum(np.searchsorted(wechsel, ziele), wechsel.size - 1)] if wechsel.size else []
+    return sorted(set([0, *map(int, schnitte), codes_sortiert.size]))
+
+def run_year_end(df: pd.DataFrame, workers: int = None, shards: int = None,
+                 grenze: float = None, fortschritt=None) -> dict:
+    """Rechnet den Jahresabschluss für alle Mitarbeiter-Monate eines DataFrames.
+
+    Erwartet die Spalten 'mitarbeiter', 'jahr', 'monat' (1-12) und EINGABE_FELDER.
+    `workers` Prozesse (Standard: alle Kerne, 1 = ohne Prozesspool) rechnen
+    `shards` Teilstücke (Standard: 4 je Worker). `fortschritt` wird nach jedem
+    Shard mit (fertige Shards, Shards gesamt, fertige Zeilen) aufgerufen. Eine
+    feste `grenze` ersetzt die Minijob-Grenze aus der Satztabelle.
+
+    Rückgabe: 'monate' (Ergebnisfelder je Zeile, Index wie df), 'mitarbeiter'
+    (Monate, Summen in Euro, Überschreitungen und Statusverlust je Mitarbeiter)
+    und 'summen' (Gesamtsummen in ganzen Cent, Anzahlen).
+    """
+    import pandas as pd
+
+    fehlend = [spalte for spalte in ['mitarbeiter', 'jahr', 'monat', *EINGABE_FELDER] if spalte not in df.columns]
+    if fehlend:
+        raise KeyError(f"Fehlende Spalten für den Jahresabschluss: {', '.join(fehlend)}")
+    workers = max(1, workers or os.cpu_count() or 1)
+    shards = max(1, shards or 4 * workers)
+
+    codes, namen = pd.factorize(df['mitarbeiter'], sort=True)
+    reihenfolge = np.argsort(codes, kind='stable')
+    codes = codes[reihenfolge].astype(np.int64)
+    spalten = {feld: df[feld].to_numpy()[reihenfolge] for feld in EINGABE_FELDER}
+    ordinale = (df['jahr'].to_numpy(dtype=np.int64) * 12 + df['monat'].to_numpy(dtype=np.int64) - 1)[reihenfolge]
+
+    grenzen = _shard_grenzen(codes, shards)
+    auftraege = [
+        {
+            'codes': codes[von:bis], 'ordinale': ordinale[von:bis], 'grenze': grenze,
+            **{feld: werte[von:bis] for feld, werte in spalten.items()}
+        }
+        for von, bis in zip(grenzen[:-1], grenzen[1:])
+    ]
+
+    ergebnisse = [None] * len(auftraege)
+    zeilen = 0
+
+    def erledigt(i, ergebnis):
+        nonlocal zeilen
+        ergebnisse[i] = ergebnis
+        zeilen += auftraege[i]['codes'].size
+        if fortschritt is not None:
+            fortschritt(sum(e is not None for e in ergebnisse), len(auftraege), zeilen)
+
+    if workers == 1 or len(auftraege) == 1:
+        for i, auftrag in enumerate(auftraege):
+            erledigt(i, _shard_auswerten(auftrag))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(auftraege))) as pool:
+            laufend = {pool.submit(_shard_auswerten, auftrag): i for i, auftrag in enumerate(auftraege)}
+            for future in as_completed(laufend):
+                erledigt(laufend[future], future.result())
+
+    # Zusammenführen in Shard-Reihenfolge, dann zurück in die Zeilenreihenfolge von df
+    zurueck = np.empty_like(reihenfolge)
+    zurueck[reihenfolge] = np.arange(reihenfolge.size)
+    monate = pd.DataFrame({
+        feld: np.concatenate([e['ergebnis'][feld] for e in ergebnisse])[zurueck] for feld in ERGEBNIS_FELDER
+    }, index=df.index)
+
+    mitarbeiter_codes = np.concatenate([e['codes'] for e in ergebnisse])
+    summen = {feld: np.concatenate([e['summen'][feld] for e in ergebnisse]) for feld in SUMMEN_FELDER}
+    verlust = np.concatenate([e['verlust'] for e in ergebnisse])
+    mitarbeiter = pd.DataFrame({
+        'monate': np.concatenate([e['monate'] for e in ergebnisse]),
+        **{feld: werte / 100 for feld, werte in summen.items()},
+        'anzahl_ueberschreitungen': np.concatenate([e['ueberschreitungen'] for e in ergebnisse]),
+        'statusverlust': ordinal_als_datum(verlust)
+    }, index=pd.Index(namen[mitarbeiter_codes], name='mitarbeiter'))
+
+    return {
+        'monate': monate,
+        'mitarbeiter': mitarbeiter,
+        'summen': {
+            'mitarbeiter': len(namen),
+            'monate': len(df),
+            'statusverluste': int((verlust >= 0).sum()),
+            **{f'{feld}_cent': int(werte.sum()) for feld, werte in summen.items()}
+        }
+    }
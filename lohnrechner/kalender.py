@@ -0,0 +1,104 @@
+"""HTML-Monatskalender mit markierten Feiertagen (gecacht)."""
+
+import calendar
+from datetime import date
+from functools import lru_cache
+
+from .feiertage import get_feiertage
+from .konstanten import MONATE
+from .profil import gemessen
+
+KALENDER_STYLES = """
+    <style>
+        .calendar {
+            width: 100%;
+            border-collapse: collapse;
+            font-family: Arial, sans-serif;
+        }
+        .calendar th {
+            background-color: #f8f9fa;
+            padding: 10px;
+            text-align: center;
+            border: 1px solid #dee2e6;
+        }
+        .calendar td {
+            padding: 10px;
+            text-align: center;
+            border: 1px solid #dee2e6;
+        }
+        .holiday {
+            background-color: #ffebee;
+            color: #c62828;
+            font-weight: bold;
+        }
+        .today {
+            background-color: #e3f2fd;
+            font-weight: bold;
+        }
+        .month-title {
+            font-size: 1.2em;
+            font-weight: bold;
+            margin-bottom: 10px;
+            text-align: center;
+        }
+    </style>
+    """
+
+KALENDER_KOPFZEILE = "<tr><th>Mo</th><th>Di</th><th>Mi</th><th>Do</th><th>Fr</th><th>Sa</th><th>So</th></tr>"
+
+@lru_cache(maxsize=1024)
+def _kalender_basis_html(year: int, month: int, feiertage_im_monat: tuple) -> str:
+    """Erstellt den Kalender eines Monats ohne Stile und ohne Markierung des heutigen Tages (gecacht)."""
+    feiertage = dict(feiertage_im_monat)
+    teile = [f"<div class='month-title'>{MONATE[month-1]} {year}</div><table class='calendar'>", KALENDER_KOPFZEILE]
+    for week in calendar.monthcalendar(year, month):
+        teile.append("<tr>")
+        for day in week:
+            if day == 0:
+                teile.append("<td></td>")
+            elif day in feiertage:
+                teile.append(f"<td class='holiday' title='{feiertage[day]}'>{day}</td>")
+            else:
+                teile.append(f"<td class=''>{day}</td>")
+        teile.append("</tr>")
+    teile.append("</table>")
+    return "".join(teile)
+
+@lru_cache(maxsize=256)
+def _kalender_html(year: int, month: int, feiertage_im_monat: tuple, heute: date) -> str:
+    """Legt die Markierung des heutigen Tages über den gecachten Kalender.
+
+    `heute` ist Teil des Cache-Schlüssels, die Markierung wird also um Mitternacht neu berechnet.
+    """
+    html = _kalender_basis_html(year, month, feiertage_im_monat)
+    if heute.year == year and heute.month == month:
+        # Feiertage behalten Vorrang vor der Markierung, ihre Zelle hat eine andere Klasse
+        html = html.replace(f"<td class=''>{heute.day}</td>", f"<td class='today'>{heute.day}</td>", 1)
+    return html
+
+def _feiertage_im_monat(month: int, feiertage) -> tuple:
+    """Hashbarer Cache-Schlüssel aus den Feiertagen eines Monats."""
+    return tuple(sorted((day, name) for (m, day), name in feiertage.items() if m == month))
+
+@gemessen()
+def get_month_calendar_html(year: int, month: int, feiertage: dict) -> str:
+    """Erstellt einen HTML-Kalender mit markierten Feiertagen."""
+    return KALENDER_STYLES + _kalender_html(year, month, _feiertage_im_monat(month, feiertage), date.today())
+
+def prerender_calendars(jahre, land: str = 'NW') -> dict:
+    """Rendert alle Monate der angegebenen Jahre in einem Durchlauf vor: {(Jahr, Monat): HTML ohne Stile}."""
+    heute = date.today()
+    kalender = {}
+    for jahr in jahre:
+        feiertage = get_feiertage(jahr, land)
+        for monat in range(1, 13):
+            kalender[(jahr, monat)] = _kalender_html(jahr, monat, _feiertage_im_monat(monat, feiertage), heute)
+    return kalender
+
+def get_calendar_grid_html(jahre, land: str = 'NW', spalten: int = 3) -> str:
+    """Erstellt ein Raster aller Monate der angegebenen Jahre mit nur einem Stilblock."""
+    zellen = "".join(f"<div>{html}</div>" for html in prerender_calendars(jahre, land).values())
+    return (
+        f"{KALENDER_STYLES}<div style='display:grid; grid-template-columns:repeat({spalten}, 1fr); gap:20px;'>"
+        f"{zellen}</div>"
+    )
@@ -0,0 +1,107 @@
+"""Kalenderstatistik je Jahr, Bundesland und Monat: Sonntage, Feiertage, Arbeitstage und Nachtstunden.
+
+Die Tabelle eines Jahres entsteht einmal für alle Bundesländer aus den Tagen des
+Jahres (Wochentag und Feiertage als Masken, je Monat summiert) und wird gecacht.
+Danach ist jede Abfrage ein Indexzugriff, für viele Zeilen mit verschiedenen
+Jahren und Bundesländern ein einziger Fancy-Index je Feld.
+"""
+
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
+
+from .feiertage import get_feiertage_nach_datum
+from .konstanten import BUNDESLAENDER
+from .schichten import NACHT_BEGINN_STUNDE, NACHT_ENDE_STUNDE
+
+# Zeilen der Tabellen: Bundesländer in der Reihenfolge von BUNDESLAENDER
+_LAND_INDEX = {kuerzel: i for i, kuerzel in enumerate(BUNDESLAENDER)}
+
+# Stunden je Tag in den Nachtfenstern [00:00, NACHT_ENDE) und [NACHT_BEGINN, 24:00)
+NACHTSTUNDEN_JE_TAG = NACHT_ENDE_STUNDE + 24 - NACHT_BEGINN_STUNDE
+
+KALENDER_FELDER = ['tage', 'sonntage', 'feiertage', 'sf_tage', 'arbeitstage', 'sf_stunden', 'nachtstunden']
+
+@lru_cache(maxsize=64)
+def kalender_statistik(jahr: int) -> MappingProxyType:
+    """Alle KALENDER_FELDER eines Jahres als schreibgeschützte Arrays (Bundesland, Monat) der Form (16, 12).
+
+    'sf_tage' sind Sonntage und Feiertage zusammen (ein Feiertag am Sonntag zählt
+    einmal), 'arbeitstage' Montag bis Freitag ohne Feiertage. 'sf_stunden' und
+    'nachtstunden' sind die Stunden, die an SF-Tagen bzw. in den Nachtfenstern
+    höchstens anfallen können.
+    """
+    tage = np.arange(np.datetime64(f'{jahr:04d}-01-01'), np.datetime64(f'{jahr + 1:04d}-01-01'))
+    monatsanfaenge = np.searchsorted(tage, np.arange(
+        np.datetime64(f'{jahr:04d}-01'), np.datetime64(f'{jahr + 1:04d}-01')
+    ).astype('datetime64[D]'))
+    wochentag = (tage.astype(np.int64) + 3) % 7  # 1970-01-01 war ein Donnerstag, Montag = 0
+
+    feiertag = np.zeros((len(BUNDESLAENDER), tage.size), dtype=bool)
+    for kuerzel, zeile in _LAND_INDEX.items():
+        feiertage = np.array(list(get_feiertage_nach_datum(jahr, kuerzel)), dtype='datetime64[D]')
+        feiertag[zeile, (feiertage - tage[0]).astype(np.int64)] = True
+
+    def je_monat(maske: np.ndarray) -> np.ndarray:
+        maske = np.broadcast_to(maske, feiertag.shape)
+        return np.add.reduceat(maske.astype(np.int64), monatsanfaenge, axis=1)
+
+    sonntag = wochentag == 6
+    statistik = {
+        'tage': je_monat(np.ones(tage.size, dtype=bool)),
+        'sonntage': je_monat(sonntag),
+        'feiertage': je_monat(feiertag),
+        'sf_tage': je_monat(sonntag | feiertag),
+        'arbeitstage': je_monat((wochentag < 5) & ~feiertag)
+    }
+    statistik['sf_stunden'] = statistik['sf_tage'] * 24.0
+    statistik['nachtstunden'] = statistik['tage'] * float(NACHTSTUNDEN_JE_TAG)
+    for werte in statistik.values():
+        werte.setflags(write=False)
+    return MappingProxyType(statistik)
+
+def kalender_statistik_monat(jahr: int, monat: int, land: str = 'NW') -> dict:
+    """KALENDER_FELDER eines Monats (1-12) im Bundesland, aus der gecachten Jahrestabelle."""
+    if not 1 <= monat <= 12:
+        raise ValueError(f"Ungültiger Monat: {monat}")
+    if land not in _LAND_INDEX:
+        raise ValueError(f"Unbekanntes Bundesland: {land}")
+    statistik = kalender_statistik(jahr)
+    return {feld: statistik[feld][_LAND_INDEX[land], monat - 1].item() for feld in KALENDER_FELDER}
+
+def kalender_statistik_je_zeile(jahre, monate, laender='NW') -> dict:
+    """Vektorisiert: KALENDER_FELDER je Zeile für Jahr, Monat (1-12) und Bundesland (ein Wert oder je Zeile)."""
+    jahre, monate = np.broadcast_arrays(np.asarray(jahre, dtype=np.int64), np.asarray(monate, dtype=np.int64))
+    if monate.size and (monate.min() < 1 or monate.max() > 12):
+        raise ValueError("Monate müssen zwischen 1 und 12 liegen")
+
+    laender = np.asarray(laender)
+    if laender.ndim == 0:
+        if str(laender) not in _LAND_INDEX:
+            raise ValueError(f"Unbekanntes Bundesland: {laender}")
+        land_index = _LAND_INDEX[str(laender)]
+    else:
+        import pandas as pd
+
+        # Jedes verschiedene Kürzel nur einmal nachschlagen
+        codes, eindeutig = pd.factorize(np.broadcast_to(laender, jahre.shape).ravel())
+        unbekannt = [str(kuerzel) for kuerzel in eindeutig if kuerzel not in _LAND_INDEX]
+        if unbekannt or (codes < 0).any():
+            raise ValueError(f"Unbekannte Bundesländer: {', '.join(unbekannt) or 'fehlender Wert'}")
+        land_index = np.array([_LAND_INDEX[kuerzel] for kuerzel in eindeutig], dtype=np.int64)[codes].reshape(jahre.shape)
+
+    if jahre.size == 0:
+        return {
+            feld: np.zeros(jahre.shape, dtype=np.float64 if feld.endswith('stunden') else np.int64)
+            for feld in KALENDER_FELDER
+        }
+
+    # Eine Jahrestabelle je vorkommendem Jahr, dann ein flacher Index für alle Felder
+    eindeutige_jahre, jahr_index = np.unique(jahre, return_inverse=True)
+    tabellen = [kalender_statistik(int(jahr)) for jahr in eindeutige_jahre]
+    index = (jahr_index.reshape(jahre.shape) * len(BUNDESLAENDER) + land_index) * 12 + monate - 1
+    return {
+        feld: np.concatenate([tabelle[feld].ravel() for tabelle in tabellen]).take(index)
+        for feld in KALENDER_FELDER
+    }
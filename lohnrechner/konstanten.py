@@ -0,0 +1,69 @@
+"""Konstanten: Mindestlohn, Minijob-Grenze, Sätze und Feldnamen."""
+
+MINDESTLOHN = 12.82
+MINIJOB_GRENZE = 556.0
+
+# Höchste Arbeitsstunden pro Monat (Eingabe in der App, Prüfung hochgeladener Dateien)
+MAX_MONATSSTUNDEN = 40.0
+
+# Steuersätze und Zuschlagsraten
+RATES = {
+    "rentenversicherung_minijob": 0.036,
+    "sf_zuschlag_rate": 0.30,  # 30% SF-Zuschlag
+    "nacht_zuschlag_rate": 0.25, # 25% Nacht-Zuschlag
+    "pauschale_abzuege_ueber_minijob": 0.30 # 30% pauschale Abzüge bei Überschreitung
+}
+
+# Eingabefelder eines Monats (wie in st.session_state.monthly_data)
+EINGABE_FELDER = [
+    'grundlohn', 'stunden', 'sf_zuschlag', 'sf_zuschlag_stunden',
+    'nacht_zuschlag', 'nacht_zuschlag_stunden'
+]
+
+# Ergebnisfelder von calculate_salary
+ERGEBNIS_FELDER = [
+    'brutto_grundlohn_stunden', 'brutto_grundlohn_fuer_grenze', 'zuschlage',
+    'brutto_gesamt', 'netto', 'gesamte_abzuege', 'rentenversicherung_abzug',
+    'pauschale_abzuege', 'freibetrag_rest', 'rest_stunden'
+]
+
+# Spalten des CSV-Exports aus der Sidebar -> Eingabefelder
+CSV_SPALTEN = {
+    'Grundlohn': 'grundlohn',
+    'Stunden': 'stunden',
+    'SF_Zuschlag': 'sf_zuschlag',
+    'SF_Zuschlag_Stunden': 'sf_zuschlag_stunden',
+    'Nacht_Zuschlag': 'nacht_zuschlag',
+    'Nacht_Zuschlag_Stunden': 'nacht_zuschlag_stunden'
+}
+
+MONATE = [
+    'Januar', 'Februar', 'März', 'April', 'Mai', 'Juni',
+    'Juli', 'August', 'September', 'Oktober', 'November', 'Dezember'
+]
+
+BUNDESLAENDER = {
+    'BW': 'Baden-Württemberg',
+    'BY': 'Bayern',
+    'BE': 'Berlin',
+    'BB': 'Brandenburg',
+    'HB': 'Bremen',
+    'HH': 'Hamburg',
+    'HE': 'Hessen',
+    'MV': 'Mecklenburg-Vorpommern',
+    'NI': 'Niedersachsen',
+    'NW': 'Nordrhein-Westfalen',
+    'RP': 'Rheinland-Pfalz',
+    'SL': 'Saarland',
+    'SN': 'Sachsen',
+    'ST': 'Sachsen-Anhalt',
+    'SH': 'Schleswig-Holstein',
+    'TH': 'Thüringen'
+}
+
+def rates_version(rates: dict = None, minijob_grenze: float = None) -> tuple:
+    """Schlüssel für die Sätze und die Minijob-Grenze einer Berechnung (für Caches), Standard: RATES und MINIJOB_GRENZE."""
+    return (
+        MINIJOB_GRENZE if minijob_grenze is None else minijob_grenze,
+        tuple(sorted((RATES if rates is None else rates).items()))
+    )
@@ -0,0 +1,167 @@
+"""Jahresplanung: Stunden so verteilen, dass das Netto maximal wird."""
+
+import numpy as np
+
+from .batch import calculate_salary_batch
+from .konstanten import MINIJOB_GRENZE, RATES
+
+def _fenster_max(werte: np.ndarray, links: np.ndarray, rechts: np.ndarray) -> np.ndarray:
+    """Gleitendes Maximum über die letzte Achse mit einer Fensterbreite je Zeile.
+
+    Für werte der Form (E, K, N) gilt ergebnis[e, k, b] = max(werte[e, k, j]) mit
+    j in [b - links[e], b - rechts[e]]; Positionen links von 0 zählen als -inf,
+    ein leeres Fenster ergibt -inf. Sparse Table: je Zeile decken zwei
+    Maxima über 2^s Werte das Fenster ab.
+    """
+    anzahl, k_anzahl, n = werte.shape
+    rand = int(links.max(initial=0))
+    tabelle = np.empty((anzahl, k_anzahl, rand + n))
+    tabelle[..., :rand] = -np.inf
+    tabelle[..., rand:] = werte
+
+    laenge = links - rechts + 1
+    stufe = np.frexp(np.maximum(laenge, 1))[1] - 1  # floor(log2(laenge))
+    auswahl = tabelle.copy()
+    naechste = np.empty_like(tabelle)
+    for t in range(1, int(stufe.max(initial=0)) + 1):
+        versatz = 1 << (t - 1)
+        np.maximum(tabelle[..., :-versatz], tabelle[..., versatz:], out=naechste[..., :-versatz])
+        naechste[..., -versatz:] = -np.inf
+        tabelle, naechste = naechste, tabelle
+        np.copyto(auswahl, tabelle, where=(stufe == t)[:, None, None])
+
+    # Je Zeile sind beide Teilfenster zusammenhängende Ausschnitte mit festem Versatz
+    rechts = np.minimum(rechts, links)  # leere Fenster: beliebiger gültiger Versatz, Ergebnis -inf
+    fenster = np.lib.stride_tricks.sliding_window_view(auswahl, n, axis=2)
+    zeilen = np.arange(anzahl)
+    ergebnis = np.maximum(fenster[zeilen, :, rand - links], fenster[zeilen, :, rand - rechts - (1 << stufe) + 1])
+    ergebnis[laenge <= 0] = -np.inf
+    return ergebnis
+
+def _plan_block(budget: np.ndarray, verfuegbar: np.ndarray, lohn: np.ndarray,
+                erlaubt: np.ndarray, schritt: float, grenze: np.ndarray, rates: dict) -> tuple:
+    """Dynamische Programmierung über die 12 Monate für einen Block von Mitarbeitern.
+
+    Zustand: (genutzte Überschreitungen, verplante Stundeneinheiten). Ohne Zuschläge
+    ist das Netto eines Monats innerhalb der Minijob-Grenze und darüber jeweils
+    linear in den Stunden. Der Übergang je Monat ist damit ein gleitendes Maximum
+    über das Budget: einmal für Stunden bis zur Grenze und einmal für Stunden
+    darüber, wobei Letzteres eine Überschreitung verbraucht. Die Stunden je Monat
+    werden anschließend rückwärts aus den gespeicherten Zuständen bestimmt.
+    """
+    anzahl = budget.size
+    max_budget = int(min(budget.max(initial=0), verfuegbar.sum(axis=1).max(initial=0)))
+    max_ueber = int(erlaubt.max(initial=0))
+    einheiten = np.arange(max_budget + 1)
+
+    # Letzte Stundeneinheit innerhalb der Grenze, exakt wie in calculate_salary verglichen
+    brutto_je_einheit = lohn * schritt
+    with np.errstate(divide='ignore', invalid='ignore'):
+        grenze_einheiten = np.where(brutto_je_einheit > 0, np.floor(grenze / brutto_je_einheit), verfuegbar)
+    grenze_einheiten = np.minimum(grenze_einheiten, verfuegbar + 1).astype(np.int64)
+    grenze_einheiten -= lohn * grenze_einheiten * schritt > grenze
+    grenze_einheiten += (lohn * (grenze_einheiten + 1) * schritt <= grenze) & (grenze_einheiten < verfuegbar)
+    innerhalb = np.minimum(verfuegbar, grenze_einheiten)
+    satz_innerhalb = brutto_je_einheit * (1 - rates["rentenversicherung_minijob"])
+    satz_ueber = brutto_je_einheit * (1 - rates["pauschale_abzuege_ueber_minijob"])
+
+    dp = np.full((anzahl, max_ueber + 1, max_budget + 1), -np.inf)
+    dp[:, 0, 0] = 0.0
+    verlauf = []
+    for m in range(12):
+        verlauf.append(dp)
+        satz = satz_innerhalb[:, m][:, None, None]
+        neu = _fenster_max(dp - satz * einheiten, innerhalb[:, m], np.zeros(anzahl, dtype=np.int64)) + satz * einheiten
+
+        # Überschreitungsmonat: Stunden in [grenze + 1, verfuegbar], eine Überschreitung mehr
+        satz = satz_ueber[:, m][:, None, None]
+        verschoben = np.full_like(dp, -np.inf)
+        verschoben[:, 1:] = dp[:, :-1]
+        ueber = _fenster_max(verschoben - satz * einheiten, verfuegbar[:, m], grenze_einheiten[:, m] + 1) + satz * einheiten
+        dp = np.maximum(neu, ueber)
+
+    # Nur Zustände innerhalb von Budget und erlaubten Überschreitungen
+    unzulaessig = (np.arange(max_ueber + 1)[None, :, None] > erlaubt[:, None, None]) \
+        | (einheiten[None, None, :] > budget[:, None, None])
+    dp = np.where(unzulaessig, -np.inf, dp)
+    bestes = dp.reshape(anzahl, -1).argmax(axis=1)
+    k, b = np.divmod(bestes, max_budget + 1)
+    gesamt = dp.reshape(anzahl, -1)[np.arange(anzahl), bestes]
+
+    # Rückwärts: je Monat die Stundenzahl mit dem besten Vorgängerzustand
+    zeilen = np.arange(anzahl)[:, None]
+    h = np.arange(int(verfuegbar.max(initial=0)) + 1)[None, :]
+    stunden = np.zeros((anzahl, 12), dtype=np.int64)
+    for m in range(11, -1, -1):
+        vorher = np.maximum(b[:, None] - h, 0)
+        moeglich = h <= b[:, None]
+        wert_innerhalb = np.where(
+            moeglich & (h <= innerhalb[:, m][:, None]),
+            verlauf[m][zeilen, k[:, None], vorher] + satz_innerhalb[:, m][:, None] * h, -np.inf
+        )
+        wert_ueber = np.where(
+            moeglich & (h > grenze_einheiten[:, m][:, None]) & (h <= verfuegbar[:, m][:, None]) & (k[:, None] > 0),
+            verlauf[m][zeilen, np.maximum(k - 1, 0)[:, None], vorher] + satz_ueber[:, m][:, None] * h, -np.inf
+        )
+        werte = np.concatenate([wert_innerhalb, wert_ueber], axis=1)
+        wahl = werte.argmax(axis=1)
+        ist_ueber = wahl >= h.shape[1]
+        stunden[:, m] = wahl - ist_ueber * h.shape[1]
+        k = k - ist_ueber
+        b = b - stunden[:, m]
+    return stunden, gesamt
+
+def plan_year(stundenbudget, verfuegbarkeit, grundlohn,
+              erlaubte_ueberschreitungen=2, schritt: float = 1.0, blockgroesse: int = 256,
+              rates: dict = None, minijob_grenze=None) -> dict:
+    """Verteilt ein Jahresbudget an Stunden so auf 12 Monate, dass das Netto maximal wird.
+
+    `stundenbudget` je Mitarbeiter (Form (E,)), `verfuegbarkeit` maximale Stunden
+    je Monat und `grundlohn` Stundenlohn, beide broadcastbar auf (E, 12).
+    Überschreitungen der Minijob-Grenze sind nur in höchstens
+    `erlaubte_ueberschreitungen` Monaten zulässig; da der Plan 12 Monate umfasst,
+    liegt er ganz in einem Zeitjahr. Überschreitungen aus der Vergangenheit werden
+    berücksichtigt, indem man die erlaubte Anzahl entsprechend verringert.
+    Stunden werden in Vielfachen von `schritt` verplant. Gerechnet wird blockweise
+    per dynamischer Programmierung (siehe _plan_block). `rates` und
+    `minijob_grenze` (Standard: RATES und MINIJOB_GRENZE) dürfen je Monat
+    verschieden sein, z. B. aus saetze_fuer_ordinale für das geplante Jahr.
+
+    Rückgabe: 'stunden' (E, 12), 'netto' (E, 12), 'netto_gesamt' (E,) und
+    'ueberschreitungen' (E,).
+    """
+    budget = np.atleast_1d(np.asarray(stundenbudget, dtype=np.float64))
+    anzahl = budget.size
+    verfuegbar = np.broadcast_to(np.asarray(verfuegbarkeit, dtype=np.float64), (anzahl, 12))
+    lohn = np.broadcast_to(np.asarray(grundlohn, dtype=np.float64), (anzahl, 12))
+    erlaubt = np.broadcast_to(np.asarray(erlaubte_ueberschreitungen, dtype=np.int64), (anzahl,))
+    grenze = np.broadcast_to(
+        np.asarray(MINIJOB_GRENZE if minijob_grenze is None else minijob_grenze, dtype=np.float64), (anzahl, 12)
+    )
+    rates = {
+        name: np.broadcast_to(np.asarray(satz, dtype=np.float64), (anzahl, 12))
+        for name, satz in (RATES if rates is None else rates).items()
+    }
+    if np.any(budget < 0) or np.any(verfuegbar < 0) or np.any(erlaubt < 0):
+        raise ValueError("Budget, Verfügbarkeit und erlaubte Überschreitungen dürfen nicht negativ sein")
+
+    # Kleine Toleranz, damit z. B. 0.3 / 0.1 nicht auf 2 abgerundet wird
+    budget_einheiten = np.floor(budget / schritt + 1e-9).astype(np.int64)
+    verfuegbar_einheiten = np.floor(verfuegbar / schritt + 1e-9).astype(np.int64)
+
+    stunden = np.zeros((anzahl, 12), dtype=np.int64)
+    for start in range(0, anzahl, blockgroesse):
+        block = slice(start, start + blockgroesse)
+        stunden[block], _ = _plan_block(
+            budget_einheiten[block], verfuegbar_einheiten[block], lohn[block], erlaubt[block], schritt,
+            grenze[block], {name: satz[block] for name, satz in rates.items()}
+        )
+
+    stunden = stunden * schritt
+    ergebnis = calculate_salary_batch(lohn, stunden, False, 0.0, False, 0.0, rates=rates, minijob_grenze=grenze)
+    return {
+        'stunden': stunden,
+        'netto': ergebnis['netto'],
+        'netto_gesamt': ergebnis['netto'].sum(axis=1),
+        'ueberschreitungen': (ergebnis['brutto_grundlohn_fuer_grenze'] > grenze).sum(axis=1)
+    }
@@ -0,0 +1,186 @@
+"""Profiling: Zeitspannen und Aufrufzähler je Rerun.
+
+Gemessen wird nur, wenn das Profiling aktiv ist (global per Umgebungsvariable
+LOHNRECHNER_PROFIL oder für einen Lauf über neuer_lauf(aktiv=True), z. B. aus dem
+Debug-Panel der App). Solange in keinem Thread ein Lauf mit Profiling offen ist,
+kostet ein gemessener Aufruf nur eine Abfrage zweier Attribute; erst dann wird der
+Zustand des Threads gelesen.
+Spannen werden je Thread gesammelt, da Streamlit jede Sitzung in einem eigenen
+Thread ausführt; die Zähler seit Prozessstart sind für alle Threads gemeinsam.
+Spannen dürfen verschachtelt sein (z. B. Fragmente in Fragmenten), jede misst
+dann inklusive der inneren.
+
+LOHNRECHNER_PROFIL=pfad schaltet das Profiling ein und schreibt nach jedem Lauf:
+  - pfad endet auf .prom: Prometheus-Textformat mit den Zählern seit Prozessstart
+    (die Datei wird jedes Mal ersetzt, z. B. für den Textfile-Collector)
+  - sonst: eine JSON-Zeile je Spanne und Lauf (wird angehängt)
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+UMGEBUNGSVARIABLE = 'LOHNRECHNER_PROFIL'
+
+class Profiler:
+    """Sammelt Laufzeit und Anzahl der Aufrufe je Spanne."""
+
+    def __init__(self, pfad: str = None):
+        self.pfad = pfad
+        self.aktiv = pfad is not None
+        self._lokal = threading.local()
+        self._sperre = threading.Lock()
+        self._gesamt = {}  # Spanne -> [Aufrufe, Sekunden] seit Prozessstart
+        self._laeufe = 0
+        self._aktive_laeufe = 0  # offene Läufe mit Profiling über alle Threads
+
+    def _vielleicht_aktiv(self) -> bool:
+        return self.aktiv or self._aktive_laeufe > 0
+
+    def _ist_aktiv(self) -> bool:
+        return getattr(self._lokal, 'aktiv', self.aktiv)
+
+    def _erfassen(self, name: str, sekunden: float) -> None:
+        spannen = getattr(self._lokal, 'spannen', None)
+        if spannen is None:
+            spannen = self._lokal.spannen = {}
+        eintrag = spannen.get(name)
+        if eintrag is None:
+            spannen[name] = [1, sekunden]
+        else:
+            eintrag[0] += 1
+            eintrag[1] += sekunden
+
+    @contextmanager
+    def span(self, name: str):
+        """Misst den Block als Spanne `name`."""
+        if not (self._vielleicht_aktiv() and self._ist_aktiv()):
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._erfassen(name, time.perf_counter() - start)
+
+    def gemessen(self, name: str = None):
+        """Dekorator: misst jeden Aufruf der Funktion als Spanne (Standard: Funktionsname)."""
+        def dekorator(funktion):
+            spanne = name or funktion.__qualname__
+
+            @wraps(funktion)
+            def gemessene_funktion(*args, **kwargs):
+                # Erst die globale Abfrage: ohne Profiling kein Zugriff auf threading.local
+                if not (self.aktiv or self._aktive_laeufe) or not self._ist_aktiv():
+                    return funktion(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return funktion(*args, **kwargs)
+                finally:
+                    self._erfassen(spanne, time.perf_counter() - start)
+            return gemessene_funktion
+        return dekorator
+
+    def neuer_lauf(self, aktiv: bool = False) -> None:
+        """Beginnt einen Lauf (Rerun) im aktuellen Thread; `aktiv` schaltet das Profiling für ihn ein."""
+        aktiv = bool(self.aktiv or aktiv)
+        # Ein nicht beendeter Lauf dieses Threads (z. B. durch st.rerun) wird nicht doppelt gezählt
+        with self._sperre:
+            self._aktive_laeufe += aktiv - getattr(self._lokal, 'gezaehlt', False)
+        self._lokal.gezaehlt = aktiv
+        self._lokal.aktiv = aktiv
+        self._lokal.spannen = {}
+        self._lokal.abschnitt = None
+        self._lokal.offen = True
+
+    def lauf_offen(self) -> bool:
+        """Ob im aktuellen Thread ein Lauf begonnen und noch nicht beendet ist."""
+        return getattr(self._lokal, 'offen', False)
+
+    def abschnitt(self, name: str = None) -> None:
+        """Beendet den laufenden Abschnitt und beginnt den nächsten (None: keinen).
+
+        Für lineare Abläufe wie main(): ein Aufruf an jeder Abschnittsgrenze.
+        """
+        jetzt = time.perf_counter()
+        laufend = getattr(self._lokal, 'abschnitt', None)
+        if laufend is not None and self._ist_aktiv():
+            self._erfassen(laufend[0], jetzt - laufend[1])
+        self._lokal.abschnitt = None if name is None else (name, jetzt)
+
+    def lauf_beenden(self) -> list:
+        """Schließt den Lauf ab, schreibt ihn ggf. nach `pfad` und gibt seine Spannen zurück."""
+        self.abschnitt(None)
+        self._lokal.offen = False
+        if getattr(self._lokal, 'gezaehlt', False):
+            with self._sperre:
+                self._aktive_laeufe -= 1
+            self._lokal.gezaehlt = False
+        if not self._ist_aktiv():
+            return []
+        spannen = self.spannen()
+        with self._sperre:
+            self._laeufe += 1
+            for spanne in spannen:
+                eintrag = self._gesamt.setdefault(spanne['name'], [0, 0.0])
+                eintrag[0] += spanne['aufrufe']
+                eintrag[1] += spanne['sekunden']
+            if self.pfad:
+                self._schreiben(spannen)
+        return spannen
+
+    def spannen(self) -> list:
+        """Spannen des aktuellen Laufs, die teuerste zuerst."""
+        spannen = getattr(self._lokal, 'spannen', None) or {}
+        return [
+            {'name': name, 'aufrufe': aufrufe, 'sekunden': sekunden}
+            for name, (aufrufe, sekunden) in sorted(spannen.items(), key=lambda e: -e[1][1])
+        ]
+
+    def als_jsonl(self, spannen: list, lauf: int = None) -> str:
+        """Eine JSON-Zeile je Spanne mit Zeitstempel und Laufnummer."""
+        import json
+
+        zeitpunkt = time.time()
+        return "".join(
+            json.dumps({'zeitpunkt': zeitpunkt, 'lauf': lauf, 'thread': threading.get_ident(), **spanne}) + "\n"
+            for spanne in spannen
+        )
+
+    def als_prometheus(self) -> str:
+        """Zähler seit Prozessstart im Prometheus-Textformat."""
+        def label(name):
+            return name.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+        zeilen = [
+            "# HELP lohnrechner_reruns_total Abgeschlossene Läufe mit Profiling.",
+            "# TYPE lohnrechner_reruns_total counter",
+            f"lohnrechner_reruns_total {self._laeufe}",
+            "# HELP lohnrechner_span_calls_total Aufrufe je Spanne.",
+            "# TYPE lohnrechner_span_calls_total counter"
+        ]
+        zeilen += [f'lohnrechner_span_calls_total{{span="{label(n)}"}} {a}' for n, (a, _) in sorted(self._gesamt.items())]
+        zeilen += [
+            "# HELP lohnrechner_span_seconds_total Gemessene Zeit je Spanne in Sekunden.",
+            "# TYPE lohnrechner_span_seconds_total counter"
+        ]
+        zeilen += [f'lohnrechner_span_seconds_total{{span="{label(n)}"}} {s!r}' for n, (_, s) in sorted(self._gesamt.items())]
+        return "\n".join(zeilen) + "\n"
+
+    def _schreiben(self, spannen: list) -> None:
+        if self.pfad.endswith('.prom'):
+            # Atomar ersetzen, damit ein Collector nie eine halbe Datei liest
+            temporaer = f"{self.pfad}.{os.getpid()}.tmp"
+            with open(temporaer, 'w', encoding='utf-8') as datei:
+                datei.write(self.als_prometheus())
+            os.replace(temporaer, self.pfad)
+        else:
+            with open(self.pfad, 'a', encoding='utf-8') as datei:
+                datei.write(self.als_jsonl(spannen, self._laeufe))
+
+PROFIL = Profiler(os.environ.get(UMGEBUNGSVARIABLE) or None)
+
+gemessen = PROFIL.gemessen
+span = PROFIL.span
@@ -0,0 +1,175 @@
+"""Prüfung hochgeladener Lohndateien: Typen und Wertebereiche für alle Zeilen auf einmal.
+
+Alle Spalten werden spaltenweise umgewandelt (Zahlen mit pd.to_numeric,
+Wahrheitswerte und Monatsnamen über ihre wenigen verschiedenen Werte), die
+Regeln sind Masken über die ganze Spalte. Statt beim ersten Fehler abzubrechen,
+entsteht eine Fehlertabelle mit einer Zeile je Verstoß; gültige Zeilen lassen
+sich trotzdem übernehmen.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .kalenderstatistik import kalender_statistik_je_zeile
+from .konstanten import BUNDESLAENDER, CSV_SPALTEN, EINGABE_FELDER, MAX_MONATSSTUNDEN, MINDESTLOHN, MONATE
+from .saetze import saetze_fuer_ordinale
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+FEHLER_SPALTEN = ['zeile', 'spalte', 'wert', 'fehler']
+
+# Schreibweisen für Wahrheitswerte (klein geschrieben)
+_WAHRHEITSWERTE = {
+    'true': True, 'false': False, 'wahr': True, 'falsch': False,
+    'ja': True, 'nein': False, '1': True, '0': False, '1.0': True, '0.0': False
+}
+
+_ZAHLEN_FELDER = ['grundlohn', 'stunden', 'sf_zuschlag_stunden', 'nacht_zuschlag_stunden']
+_BOOL_FELDER = ['sf_zuschlag', 'nacht_zuschlag']
+
+def _als_bool(spalte: pd.Series) -> tuple:
+    """(Werte, ungültig): bool-Spalte und Maske nicht erkannter Werte; jeder verschiedene Wert wird nur einmal geprüft."""
+    import pandas as pd
+
+    if spalte.dtype == bool:
+        return spalte.to_numpy(), np.zeros(len(spalte), dtype=bool)
+    codes, eindeutig = pd.factorize(spalte)
+    erkannt = np.array([_WAHRHEITSWERTE.get(str(wert).strip().lower()) for wert in eindeutig] + [None], dtype=object)
+    werte = erkannt[codes]  # Code -1 (fehlender Wert) -> letzter Eintrag, None
+    ungueltig = pd.isna(werte)
+    return np.where(ungueltig, False, werte).astype(bool), ungueltig
+
+def _monat_index(spalte: pd.Series) -> np.ndarray:
+    """Monatsnamen -> 0-11, unbekannte Monate -> -1."""
+    import pandas as pd
+
+    codes, eindeutig = pd.factorize(spalte)
+    index = np.array([MONATE.index(wert) if wert in MONATE else -1 for wert in eindeutig] + [-1], dtype=np.int64)
+    return index[codes]
+
+def validate_payroll_frame(df: pd.DataFrame, jahr: int = None, max_stunden=MAX_MONATSSTUNDEN, land: str = 'NW') -> tuple:
+    """Prüft Monatsdaten im Format des CSV-Exports (Monat, Grundlohn, ...) oder mit EINGABE_FELDER.
+
+    Regeln: alle Werte vorhanden und vom richtigen Typ, Stunden zwischen 0 und
+    `max_stunden` (ein Wert oder einer je Zeile), Grundlohn mindestens
+    Mindestlohn, Zuschlagsstunden zwischen 0 und den Stunden; eine Spalte
+    'Monat' muss einen Monatsnamen enthalten. Der Mindestlohn gilt je Zeile für
+    ihren Monat, wenn das Jahr bekannt ist (Spalten 'jahr' und 'monat' oder
+    `jahr` mit Monatsnamen), sonst MINDESTLOHN. Ist das Jahr bekannt, dürfen
+    SF-Stunden nicht mehr sein, als Sonn- und Feiertage des Monats Stunden
+    haben, und Nachtstunden nicht mehr, als das Nachtfenster im Monat bietet;
+    Feiertage gelten für `land` oder je Zeile für die Spalte 'land'.
+
+    Rückgabe: (gueltig, fehler). `gueltig` enthält die fehlerfreien Zeilen mit
+    umgewandelten Typen (Index wie df), `fehler` je Verstoß 'zeile' (Index in df),
+    'spalte', 'wert' (wie in der Datei) und 'fehler'.
+    Wirft KeyError, wenn Spalten fehlen.
+    """
+    import pandas as pd
+
+    if all(spalte in df.columns for spalte in CSV_SPALTEN):
+        namen = {feld: spalte for spalte, feld in CSV_SPALTEN.items()}
+    elif all(feld in df.columns for feld in EINGABE_FELDER):
+        namen = {feld: feld for feld in EINGABE_FELDER}
+    else:
+        fehlend = [spalte for spalte in CSV_SPALTEN if spalte not in df.columns]
+        raise KeyError(f"Fehlende Spalten: {', '.join(fehlend)}")
+
+    verstoesse = []  # (Spalte, Maske, Meldung)
+    werte = {}
+    for feld in _ZAHLEN_FELDER:
+        roh = df[namen[feld]]
+        werte[feld] = pd.to_numeric(roh, errors='coerce').to_numpy(dtype=np.float64)
+        fehlt = roh.isna().to_numpy()
+        verstoesse.append((namen[feld], fehlt, "fehlt"))
+        verstoesse.append((namen[feld], np.isnan(werte[feld]) & ~fehlt, "keine Zahl"))
+    for feld in _BOOL_FELDER:
+        werte[feld], ungueltig = _als_bool(df[namen[feld]])
+        verstoesse.append((namen[feld], ungueltig, "kein Wahrheitswert (true/false)"))
+
+    # Monat und Jahr je Zeile, soweit bekannt
+    mindestlohn = MINDESTLOHN
+    ordinale = None
+    if 'Monat' in df.columns:
+        monat_index = _monat_index(df['Monat'])
+        verstoesse.append(('Monat', monat_index < 0, "unbekannter Monat"))
+        if jahr is not None:
+            mindestlohn = saetze_fuer_ordinale(jahr * 12 + np.arange(12))['mindestlohn'][np.maximum(monat_index, 0)]
+            ordinale = jahr * 12 + np.maximum(monat_index, 0)
+    elif 'jahr' in df.columns and 'monat' in df.columns:
+        jahre = pd.to_numeric(df['jahr'], errors='coerce').to_numpy(dtype=np.float64)
+        monate = pd.to_numeric(df['monat'], errors='coerce').to_numpy(dtype=np.float64)
+        verstoesse.append(('jahr', ~(np.isfinite(jahre) & (jahre >= 2013) & (jahre % 1 == 0)), "ungültiges Jahr"))
+        ungueltiger_monat = ~((monate >= 1) & (monate <= 12) & (monate % 1 == 0))
+        verstoesse.append(('monat', ungueltiger_monat, "Monat muss 1-12 sein"))
+        ordinale = np.where(
+            np.isfinite(jahre) & (jahre >= 2013) & ~ungueltiger_monat, jahre * 12 + monate - 1, 2013 * 12
+        ).astype(np.int64)
+        mindestlohn = saetze_fuer_ordinale(ordinale)['mindestlohn']
+
+    # Bundesland je Zeile für die Feiertage; unbekannte Kürzel zählen wie `land`
+    laender = land
+    if 'land' in df.columns:
+        laender = df['land'].to_numpy(dtype=object)
+        unbekannt = ~np.isin(laender, list(BUNDESLAENDER))
+        verstoesse.append(('land', unbekannt, "unbekanntes Bundesland"))
+        laender = np.where(unbekannt, land, laender)
+
+    stunden = werte['stunden']
+    # NaN-Vergleiche sind False, fehlende Zahlen werden oben schon gemeldet
+    verstoesse.append((namen['stunden'], (stunden < 0) | (stunden > max_stunden), "außerhalb 0 bis Höchststunden"))
+    verstoesse.append((namen['grundlohn'], werte['grundlohn'] < mindestlohn, "unter Mindestlohn"))
+    for feld in ['sf_zuschlag_stunden', 'nacht_zuschlag_stunden']:
+        verstoesse.append((namen[feld], werte[feld] < 0, "negativ"))
+        verstoesse.append((namen[feld], werte[feld] > stunden, "mehr als die Arbeitsstunden"))
+    if ordinale is not None:
+        kalender = kalender_statistik_je_zeile(ordinale // 12, ordinale % 12 + 1, laender)
+        verstoesse.append((
+            namen['sf_zuschlag_stunden'], werte['sf_zuschlag_stunden'] > kalender['sf_stunden'],
+            "mehr als Sonn- und Feiertage im Monat Stunden haben"
+        ))
+        verstoesse.append((
+            namen['nacht_zuschlag_stunden'], werte['nacht_zuschlag_stunden'] > kalender['nachtstunden'],
+            "mehr als das Nachtfenster im Monat bietet"
+        ))
+
+    # Fehlertabelle: nur die betroffenen Zeilen, nach Zeile sortiert; Spalte und
+    # Meldung als Kategorien, die Rohwerte je Spalte nur einmal aus df geholt
+    spalten_namen = list(dict.fromkeys(spalte for spalte, _, _ in verstoesse))
+    meldungs_texte = list(dict.fromkeys(meldung for _, _, meldung in verstoesse))
+    roh = {}
+    positionen, spalten, meldungen, roh_werte = [], [], [], []
+    for spalte, maske, meldung in verstoesse:
+        treffer = np.flatnonzero(maske)
+        if not treffer.size:
+            continue
+        if spalte not in roh:
+            roh[spalte] = df[spalte].to_numpy(dtype=object)
+        positionen.append(treffer)
+        spalten.append(np.full(treffer.size, spalten_namen.index(spalte), dtype=np.int8))
+        meldungen.append(np.full(treffer.size, meldungs_texte.index(meldung), dtype=np.int8))
+        roh_werte.append(roh[spalte][treffer])
+    positionen = np.concatenate([np.zeros(0, dtype=np.intp), *positionen])
+    reihenfolge = np.argsort(positionen, kind='stable')
+    fehler = pd.DataFrame({
+        'zeile': df.index.to_numpy()[positionen[reihenfolge]],
+        'spalte': pd.Categorical.from_codes(
+            np.concatenate([np.zeros(0, dtype=np.int8), *spalten])[reihenfolge], spalten_namen
+        ),
+        'wert': np.concatenate([np.zeros(0, dtype=object), *roh_werte])[reihenfolge],
+        'fehler': pd.Categorical.from_codes(
+            np.concatenate([np.zeros(0, dtype=np.int8), *meldungen])[reihenfolge],
+            meldungs_texte
+        )
+    }, columns=FEHLER_SPALTEN)
+
+    gueltig_maske = np.ones(len(df), dtype=bool)
+    gueltig_maske[positionen] = False
+    gueltig = df[gueltig_maske].copy()
+    for feld, spalte in namen.items():
+        gueltig[spalte] = werte[feld][gueltig_maske]
+    return gueltig, fehler
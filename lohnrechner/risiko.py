@@ -0,0 +1,95 @@
+"""Monte-Carlo-Prognose: Wahrscheinlichkeit von Überschreitungen und Verlust des Minijob-Status.
+
+Die Stunden jedes künftigen Monats sind normalverteilt (Mittel und Streuung je
+Monat, abgeschnitten bei 0 und ggf. bei max_stunden). Je Pfad wird der
+Brutto-Grundlohn wie in calculate_salary als Grundlohn x Stunden berechnet und
+mit der Minijob-Grenze des jeweiligen Monats verglichen. Die Zeitjahr-Regel
+wird für alle Pfade zugleich geprüft: Aus den kumulierten Überschreitungen
+ergibt die Differenz im Abstand von 12 Monaten die Überschreitungen im
+Zeitjahr bis zu jedem Monat. Gerechnet wird in Blöcken von Pfaden; die
+Zufallszahlen werden in Pfad-Reihenfolge gezogen, das Ergebnis hängt daher nur
+vom Seed ab, nicht von der Blockgröße.
+"""
+
+import numpy as np
+
+from .saetze import saetze_fuer_ordinale
+
+def stunden_verteilung(stunden_historie) -> tuple:
+    """Mittel und Streuung (Stichproben-Standardabweichung) bisheriger Monatsstunden; Monate ohne Stunden zählen nicht."""
+    stunden = np.asarray(stunden_historie, dtype=np.float64)
+    stunden = stunden[stunden > 0]
+    if stunden.size == 0:
+        return 0.0, 0.0
+    return float(stunden.mean()), float(stunden.std(ddof=1)) if stunden.size > 1 else 0.0
+
+def _je_monat(werte, ordinale: np.ndarray) -> np.ndarray:
+    """Ein Wert, 12 Werte je Kalendermonat oder ein Wert je Prognosemonat -> Array (monate,)."""
+    werte = np.asarray(werte, dtype=np.float64)
+    if werte.shape == (12,):
+        return werte[ordinale % 12]
+    return np.broadcast_to(werte, ordinale.shape)
+
+def simulate_status_risk(stunden_mittel, stunden_streuung, grundlohn, start_jahr: int, start_monat_index: int,
+                         monate: int = 24, pfade: int = 100_000, seed: int = None, ueberschreitungen=(),
+                         max_stunden: float = None, grenze: float = None, blockgroesse: int = 16_384) -> dict:
+    """Simuliert `pfade` Verläufe über `monate` Monate ab (start_jahr, start_monat_index).
+
+    `stunden_mittel`, `stunden_streuung` und `grundlohn` sind je ein Wert, 12 Werte
+    je Kalendermonat (Januar bis Dezember) oder ein Wert je Prognosemonat.
+    `ueberschreitungen` sind bisherige Überschreitungen als Monatsordinale
+    (Jahr * 12 + Monatsindex); sie zählen für Zeitjahre, die in die Prognose
+    hineinreichen. Ohne `grenze` gilt je Monat die Minijob-Grenze aus der
+    Satztabelle. Gleicher `seed`, gleiches Ergebnis.
+
+    Rückgabe: 'ordinale' der Prognosemonate, 'p_ueberschreitung' und
+    'p_verlust_bis' (Statusverlust bis einschließlich des Monats) je Monat,
+    'p_verlust_zeitjahr' (Statusverlust in den nächsten 12 Monaten),
+    'erwartete_ueberschreitungen' je Pfad und 'pfade'.
+    """
+    if monate < 1 or pfade < 1:
+        raise ValueError("Monate und Pfade müssen positiv sein")
+    erster = start_jahr * 12 + start_monat_index
+    ordinale = erster + np.arange(monate)
+    mittel = _je_monat(stunden_mittel, ordinale)
+    streuung = _je_monat(stunden_streuung, ordinale)
+    lohn = _je_monat(grundlohn, ordinale)
+    if np.any(streuung < 0):
+        raise ValueError("Die Streuung darf nicht negativ sein")
+    if grenze is None:
+        grenze = saetze_fuer_ordinale(ordinale)['minijob_grenze']
+
+    # Überschreitungen der 11 Monate vor dem Start gehören noch in dasselbe Zeitjahr
+    vorher = np.isin(erster - 11 + np.arange(11), np.asarray(ueberschreitungen, dtype=np.int64))
+
+    rng = np.random.default_rng(seed)
+    anzahl_ueber = np.zeros(monate, dtype=np.int64)
+    erster_verlust = np.zeros(monate, dtype=np.int64)  # Pfade je Monat des ersten Statusverlusts
+    for start in range(0, pfade, blockgroesse):
+        n = min(blockgroesse, pfade - start)
+        stunden = rng.standard_normal((n, monate))
+        stunden *= streuung
+        stunden += mittel
+        np.clip(stunden, 0.0, max_stunden, out=stunden)
+        ueber = lohn * stunden > grenze
+        anzahl_ueber += ueber.sum(axis=0)
+
+        # Überschreitungen im Zeitjahr bis Monat t: kumuliert[t + 12] - kumuliert[t]
+        kumuliert = np.zeros((n, 12 + monate), dtype=np.int16)
+        kumuliert[:, 1:12] = np.cumsum(vorher)
+        np.cumsum(ueber, axis=1, dtype=np.int16, out=kumuliert[:, 12:])
+        kumuliert[:, 12:] += kumuliert[:, 11:12]
+        verlust = ueber & (kumuliert[:, 12:] - kumuliert[:, :monate] >= 3)
+
+        betroffen = verlust.any(axis=1)
+        erster_verlust += np.bincount(verlust[betroffen].argmax(axis=1), minlength=monate)
+
+    p_verlust_bis = np.cumsum(erster_verlust) / pfade
+    return {
+        'ordinale': ordinale,
+        'p_ueberschreitung': anzahl_ueber / pfade,
+        'p_verlust_bis': p_verlust_bis,
+        'p_verlust_zeitjahr': float(p_verlust_bis[min(12, monate) - 1]),
+        'erwartete_ueberschreitungen': float(anzahl_ueber.sum() / pfade),
+        'pfade': pfade
+    }
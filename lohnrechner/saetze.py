@@ -0,0 +1,101 @@
+"""Zeitabhängige Sätze: Mindestlohn, Minijob-Grenze und Abzugs-/Zuschlagssätze mit Gültigkeitsbeginn.
+
+Jeder Parameter hat eine eigene, aufsteigend sortierte Historie aus
+(gültig ab, Wert). Änderungen gelten immer ab einem Monatsersten, gesucht wird
+daher über Monatsordinale (Jahr * 12 + Monatsindex): bisect für einzelne
+Monate, np.searchsorted für ganze Spalten in einem Durchlauf.
+"""
+
+from bisect import bisect_right
+from datetime import date
+from functools import lru_cache
+from types import MappingProxyType
+
+# Parameter -> [(gültig ab, Wert), ...] aufsteigend nach Datum
+SATZ_HISTORIE = {
+    'mindestlohn': [
+        (date(2013, 1, 1), 0.0),  # vor 2015 kein gesetzlicher Mindestlohn
+        (date(2015, 1, 1), 8.50),
+        (date(2017, 1, 1), 8.84),
+        (date(2019, 1, 1), 9.19),
+        (date(2020, 1, 1), 9.35),
+        (date(2021, 1, 1), 9.50),
+        (date(2021, 7, 1), 9.60),
+        (date(2022, 1, 1), 9.82),
+        (date(2022, 7, 1), 10.45),
+        (date(2022, 10, 1), 12.00),
+        (date(2024, 1, 1), 12.41),
+        (date(2025, 1, 1), 12.82),
+        (date(2026, 1, 1), 13.90),
+        (date(2027, 1, 1), 14.60)
+    ],
+    'minijob_grenze': [
+        (date(2013, 1, 1), 450.0),
+        (date(2022, 10, 1), 520.0),  # ab hier dynamisch: Mindestlohn x 130 / 3, aufgerundet
+        (date(2024, 1, 1), 538.0),
+        (date(2025, 1, 1), 556.0),
+        (date(2026, 1, 1), 603.0),
+        (date(2027, 1, 1), 633.0)
+    ],
+    'rentenversicherung_minijob': [
+        (date(2013, 1, 1), 0.039),
+        (date(2015, 1, 1), 0.037),
+        (date(2018, 1, 1), 0.036)
+    ],
+    'sf_zuschlag_rate': [(date(2013, 1, 1), 0.30)],
+    'nacht_zuschlag_rate': [(date(2013, 1, 1), 0.25)],
+    'pauschale_abzuege_ueber_minijob': [(date(2013, 1, 1), 0.30)]
+}
+
+# Parameter, die in calculate_salary als `rates` übergeben werden (wie RATES)
+RATES_NAMEN = [
+    'rentenversicherung_minijob', 'sf_zuschlag_rate', 'nacht_zuschlag_rate', 'pauschale_abzuege_ueber_minijob'
+]
+
+def _als_ordinal(tag: date) -> int:
+    return tag.year * 12 + tag.month - 1
+
+# Parameter -> (Monatsordinale ab, Werte), für bisect und searchsorted
+_INDEX = {
+    name: ([_als_ordinal(ab) for ab, _ in historie], [wert for _, wert in historie])
+    for name, historie in SATZ_HISTORIE.items()
+}
+
+def _zu_frueh(name: str, ordinal: int) -> ValueError:
+    jahr, monat_index = divmod(int(ordinal), 12)
+    return ValueError(f"Kein Wert für {name} vor {SATZ_HISTORIE[name][0][0]:%m/%Y} (angefragt: {monat_index + 1:02d}/{jahr})")
+
+@lru_cache(maxsize=1024)
+def saetze_fuer_monat(jahr: int, monat: int) -> MappingProxyType:
+    """Alle Sätze, die im Monat (1-12) des Jahres gelten."""
+    if not 1 <= monat <= 12:
+        raise ValueError(f"Ungültiger Monat: {monat}")
+    ordinal = jahr * 12 + monat - 1
+    werte = {}
+    for name, (ab, wert) in _INDEX.items():
+        i = bisect_right(ab, ordinal) - 1
+        if i < 0:
+            raise _zu_frueh(name, ordinal)
+        werte[name] = wert[i]
+    return MappingProxyType(werte)
+
+def saetze_am(stichtag: date) -> MappingProxyType:
+    """Alle Sätze, die am Stichtag gelten."""
+    return saetze_fuer_monat(stichtag.year, stichtag.month)
+
+def rates_und_grenze(saetze) -> tuple:
+    """Teilt Sätze in (rates wie RATES, minijob_grenze) für die Berechnungsfunktionen."""
+    return {name: saetze[name] for name in RATES_NAMEN}, saetze['minijob_grenze']
+
+def saetze_fuer_ordinale(ordinale) -> dict:
+    """Vektorisiert: Sätze je Monatsordinal (Jahr * 12 + Monat - 1) als Arrays, ein searchsorted je Parameter."""
+    import numpy as np
+
+    ordinale = np.asarray(ordinale, dtype=np.int64)
+    werte = {}
+    for name, (ab, wert) in _INDEX.items():
+        i = np.searchsorted(np.asarray(ab, dtype=np.int64), ordinale, side='right') - 1
+        if ordinale.size and i.min() < 0:
+            raise _zu_frueh(name, ordinale[np.argmin(i)])
+        werte[name] = np.asarray(wert, dtype=np.float64)[i]
+    return werte
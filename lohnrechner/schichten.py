@@ -0,0 +1,124 @@
+"""Schichten zu Stunden mit SF- und Nacht-Zuschlag.
+
+Aus Schichten (Beginn/Ende) werden die Stunden mit SF- und Nacht-Zuschlag
+abgeleitet. Jede Schicht wird an Mitternacht in Tagesabschnitte geteilt; je
+Abschnitt ergeben sich die Nachtstunden als Schnitt mit den Nachtfenstern
+[00:00, NACHT_ENDE) und [NACHT_BEGINN, 24:00), die SF-Stunden als ganzer
+Abschnitt an Sonn- und Feiertagen. Alle Schritte laufen vektorisiert über
+sämtliche Schichten.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .feiertage import get_feiertags_index
+from .konstanten import EINGABE_FELDER
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+NACHT_BEGINN_STUNDE = 20
+NACHT_ENDE_STUNDE = 6
+
+@lru_cache(maxsize=256)
+def _feiertags_tage(von_jahr: int, bis_jahr: int, land: str) -> np.ndarray:
+    """Feiertage mehrerer Jahre als sortierte Tagesnummern seit 1970-01-01."""
+    tage = np.array(list(get_feiertags_index(von_jahr, bis_jahr, land)), dtype='datetime64[D]').astype(np.int64)
+    tage.setflags(write=False)
+    return tage
+
+def _ueberlappung(start, ende, fenster_start: int, fenster_ende: int) -> np.ndarray:
+    """Länge des Schnitts der Intervalle [start, ende) mit [fenster_start, fenster_ende)."""
+    return np.clip(np.minimum(ende, fenster_ende) - np.maximum(start, fenster_start), 0, None)
+
+def split_shifts(beginn, ende, land='NW') -> dict:
+    """Teilt Schichten an Mitternacht und berechnet je Tagesabschnitt die Minuten.
+
+    `beginn` und `ende` sind datetime64-Arrays, `land` ein Bundesland oder ein
+    Array mit einem Bundesland je Schicht. Rückgabe: Dict mit 'schicht' (Index
+    der Schicht), 'tag' (datetime64[D]) sowie 'minuten', 'sf_minuten' und
+    'nacht_minuten' je Abschnitt.
+    """
+    beginn = np.asarray(beginn, dtype='datetime64[m]').astype(np.int64)
+    ende = np.asarray(ende, dtype='datetime64[m]').astype(np.int64)
+    if np.any(ende < beginn):
+        raise ValueError("Schichtende liegt vor dem Schichtbeginn")
+    gueltig = ende > beginn
+
+    erster_tag = beginn // 1440
+    letzter_tag = (ende - 1) // 1440
+    anzahl_tage = np.where(gueltig, letzter_tag - erster_tag + 1, 0)
+
+    # Ein Abschnitt je Schicht und Kalendertag
+    schicht = np.repeat(np.arange(beginn.size), anzahl_tage)
+    versatz = np.arange(schicht.size) - np.repeat(np.cumsum(anzahl_tage) - anzahl_tage, anzahl_tage)
+    tag = erster_tag[schicht] + versatz
+    start = np.maximum(beginn[schicht] - tag * 1440, 0)
+    stop = np.minimum(ende[schicht] - tag * 1440, 1440)
+
+    minuten = stop - start
+    nacht_minuten = _ueberlappung(start, stop, 0, NACHT_ENDE_STUNDE * 60) \
+        + _ueberlappung(start, stop, NACHT_BEGINN_STUNDE * 60, 1440)
+
+    # 1970-01-01 war ein Donnerstag, Sonntag ist Wochentag 6
+    sf_tag = (tag + 3) % 7 == 6
+    laender = np.broadcast_to(np.asarray(land), beginn.shape)[schicht]
+    if tag.size:
+        jahre = tag.astype('datetime64[D]').astype('datetime64[Y]').astype(np.int64) + 1970
+        von_jahr, bis_jahr = int(jahre.min()), int(jahre.max())
+        for kuerzel in np.unique(laender):
+            im_land = laender == kuerzel
+            sf_tag[im_land] |= np.isin(tag[im_land], _feiertags_tage(von_jahr, bis_jahr, str(kuerzel)))
+
+    return {
+        'schicht': schicht,
+        'tag': tag.astype('datetime64[D]'),
+        'minuten': minuten,
+        'sf_minuten': np.where(sf_tag, minuten, 0),
+        'nacht_minuten': nacht_minuten
+    }
+
+def shifts_to_monthly(schichten: pd.DataFrame, land: str = 'NW') -> pd.DataFrame:
+    """Summiert Schichten je Mitarbeiter und Monat zu Eingaben für die Gehaltsberechnung.
+
+    Erwartet die Spalten 'mitarbeiter', 'beginn' und 'ende', optional 'land'
+    (sonst gilt `land`) und 'grundlohn'. Rückgabe: eine Zeile je (mitarbeiter,
+    jahr, monat) mit 'stunden', 'sf_zuschlag(_stunden)', 'nacht_zuschlag(_stunden)'
+    und, falls vorhanden, dem 'grundlohn' der zeitlich letzten Schicht des Monats
+    (die Reihenfolge der Zeilen spielt keine Rolle). Mit Grundlohn kann
+    das Ergebnis direkt an calculate_salary_frame übergeben werden.
+    """
+    import pandas as pd
+
+    beginn = schichten['beginn'].to_numpy(dtype='datetime64[m]')
+    abschnitte = split_shifts(
+        beginn,
+        schichten['ende'].to_numpy(dtype='datetime64[m]'),
+        schichten['land'].to_numpy() if 'land' in schichten.columns else land
+    )
+    monate = abschnitte['tag'].astype('datetime64[M]').astype(np.int64)
+    df = pd.DataFrame({
+        'mitarbeiter': schichten['mitarbeiter'].to_numpy()[abschnitte['schicht']],
+        'jahr': monate // 12 + 1970,
+        'monat': monate % 12 + 1,
+        'stunden': abschnitte['minuten'] / 60,
+        'sf_zuschlag_stunden': abschnitte['sf_minuten'] / 60,
+        'nacht_zuschlag_stunden': abschnitte['nacht_minuten'] / 60
+    })
+    if 'grundlohn' in schichten.columns:
+        df['grundlohn'] = schichten['grundlohn'].to_numpy()[abschnitte['schicht']]
+        # 'last' je Monat soll die zeitlich letzte Schicht sein, nicht die letzte in der Datei
+        df = df.iloc[np.argsort(beginn[abschnitte['schicht']], kind='stable')]
+
+    aggregation = {'stunden': 'sum', 'sf_zuschlag_stunden': 'sum', 'nacht_zuschlag_stunden': 'sum'}
+    if 'grundlohn' in df.columns:
+        aggregation['grundlohn'] = 'last'
+    monatlich = df.groupby(['mitarbeiter', 'jahr', 'monat'], sort=True).agg(aggregation).reset_index()
+    monatlich['sf_zuschlag'] = monatlich['sf_zuschlag_stunden'] > 0
+    monatlich['nacht_zuschlag'] = monatlich['nacht_zuschlag_stunden'] > 0
+    eingaben = [feld for feld in EINGABE_FELDER if feld in monatlich.columns]
+    return monatlich[['mitarbeiter', 'jahr', 'monat', *eingaben]]
@@ -0,0 +1,111 @@
+"""Kompakte Sitzungsdaten (monthly_data, manual_over_limits).
+
+Kompakte Ablage von monthly_data und manual_over_limits im Session State:
+ein strukturiertes NumPy-Array je Nutzer statt 12 Dicts mit String-Schlüsseln.
+Die Ansichten verhalten sich wie die bisherigen Dicts (monthly_data[monat]['stunden'],
+monthly_data[monat] = {...}, manual_over_limits[i]['year'] = ...) und liefern
+Python-Skalare, Schreibzugriffe gehen direkt in das Array.
+"""
+
+from collections.abc import MutableMapping, Sequence
+
+import numpy as np
+
+from .konstanten import EINGABE_FELDER, MONATE
+
+MONATSDATEN_DTYPE = np.dtype([
+    ('grundlohn', np.float64), ('stunden', np.float64),
+    ('sf_zuschlag', np.bool_), ('sf_zuschlag_stunden', np.float64),
+    ('nacht_zuschlag', np.bool_), ('nacht_zuschlag_stunden', np.float64)
+])
+
+UEBERSCHREITUNG_DTYPE = np.dtype([('month_index', np.int8), ('year', np.int16)])
+
+class DatensatzAnsicht(MutableMapping):
+    """Dict-Ansicht auf einen Datensatz eines strukturierten Arrays."""
+    __slots__ = ('_daten', '_index')
+
+    def __init__(self, daten: np.ndarray, index: int):
+        self._daten = daten
+        self._index = index
+
+    def __getitem__(self, feld):
+        if feld not in self._daten.dtype.fields:
+            raise KeyError(feld)
+        return self._daten[feld][self._index].item()
+
+    def __setitem__(self, feld, wert):
+        if feld not in self._daten.dtype.fields:
+            raise KeyError(feld)
+        self._daten[feld][self._index] = wert
+
+    def __delitem__(self, feld):
+        raise TypeError("Felder eines Datensatzes können nicht gelöscht werden")
+
+    def __iter__(self):
+        return iter(self._daten.dtype.names)
+
+    def __len__(self):
+        return len(self._daten.dtype.names)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+class MonatsDaten(MutableMapping):
+    """monthly_data als strukturiertes Array: Monatsname -> DatensatzAnsicht."""
+    __slots__ = ('array',)
+
+    def __init__(self, eintraege: dict = None):
+        self.array = np.zeros(len(MONATE), dtype=MONATSDATEN_DTYPE)
+        if eintraege:
+            self.update(eintraege)
+
+    def __getitem__(self, monat):
+        return DatensatzAnsicht(self.array, MONATE.index(monat))
+
+    def __setitem__(self, monat, data):
+        self.array[MONATE.index(monat)] = tuple(data[feld] for feld in EINGABE_FELDER)
+
+    def __delitem__(self, monat):
+        raise TypeError("Monate können nicht gelöscht werden")
+
+    def __iter__(self):
+        return iter(MONATE)
+
+    def __len__(self):
+        return len(MONATE)
+
+    def __repr__(self):
+        return repr({monat: dict(self[monat]) for monat in MONATE})
+
+class Ueberschreitungen(Sequence):
+    """manual_over_limits als strukturiertes Array: Liste von DatensatzAnsicht."""
+    __slots__ = ('array',)
+
+    def __init__(self, eintraege: list):
+        self.array = np.array(
+            [(ol['month_index'], ol['year']) for ol in eintraege], dtype=UEBERSCHREITUNG_DTYPE
+        )
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return DatensatzAnsicht(self.array, range(len(self.array))[i])
+
+    def __setitem__(self, i, ol):
+        self.array[i] = (ol['month_index'], ol['year'])
+
+    def __len__(self):
+        return len(self.array)
+
+    def __repr__(self):
+        return repr([dict(ol) for ol in self])
+
+def monatsdaten_array(monthly_data) -> np.ndarray:
+    """Liefert monthly_data als strukturiertes Array (ohne Kopie, wenn es schon MonatsDaten ist)."""
+    if isinstance(monthly_data, MonatsDaten):
+        return monthly_data.array
+    return np.array(
+        [tuple(data[feld] for feld in EINGABE_FELDER) for data in monthly_data.values()],
+        dtype=MONATSDATEN_DTYPE
+    )
@@ -0,0 +1,364 @@
+"""Speichern und Laden: CSV-Export der Sidebar, Parquet-Archiv und SQLite-Datenbank."""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import zipfile
+from contextlib import contextmanager
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .konstanten import CSV_SPALTEN, EINGABE_FELDER, MONATE
+from .sitzung import monatsdaten_array
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# --- CSV ---
+
+class CSVFormatFehler(ValueError):
+    """Die CSV-Datei hat nicht die erwarteten Spalten."""
+
+def export_monthly_csv(monthly_data: dict, manual_over_limits: list) -> bytes:
+    """Exportiert die Monatsdaten und die manuellen Überschreitungen als CSV."""
+    import pandas as pd
+
+    data_for_export = []
+    for month in MONATE:
+        data = monthly_data[month]
+
+        row = {
+            'Monat': month,
+            'Grundlohn': data['grundlohn'],
+            'Stunden': data['stunden'],
+            'SF_Zuschlag': data['sf_zuschlag'],
+            'SF_Zuschlag_Stunden': data['sf_zuschlag_stunden'],
+            'Nacht_Zuschlag': data['nacht_zuschlag'],
+            'Nacht_Zuschlag_Stunden': data['nacht_zuschlag_stunden'],
+            # Urlaubsinformationen entfernt
+        }
+        data_for_export.append(row)
+    
+    # Füge die manuellen Überschreitungsdaten als separate Zeile hinzu
+    ol_row = {'Monat': 'OverLimitData', 
+              'Grundlohn': 0, 'Stunden': 0, 
+              'SF_Zuschlag': False, 'SF_Zuschlag_Stunden': 0, 
+              'Nacht_Zuschlag': False, 'Nacht_Zuschlag_Stunden': 0,
+              # Urlaubsinformationen entfernt
+              }
+    for i in range(3):
+        ol_row[f'OL{i+1}_Month_Index'] = manual_over_limits[i]['month_index']
+        ol_row[f'OL{i+1}_Year'] = manual_over_limits[i]['year']
+    data_for_export.append(ol_row)
+
+    df = pd.DataFrame(data_for_export)
+    return df.to_csv(index=False).encode('utf-8')
+
+def import_monthly_csv(datei, jahr: int = None, land: str = 'NW') -> tuple:
+    """Liest einen CSV-Export wieder ein; übernommen werden nur gültige Zeilen (validate_payroll_frame).
+
+    Rückgabe: (Monatsdaten je Monat, Überschreitungen oder None, Fehlertabelle).
+    In der Fehlertabelle ist 'zeile' die Zeilennummer in der Datei (Kopfzeile = 1).
+    `jahr` bestimmt den Mindestlohn je Monat, mit `land` auch die Obergrenzen
+    der Zuschlagsstunden aus dem Kalender. Wirft CSVFormatFehler, wenn
+    Spalten der Monatsdaten fehlen.
+    """
+    import pandas as pd
+
+    from .pruefung import validate_payroll_frame
+
+    df = pd.read_csv(datei)
+    df.index += 2  # Zeilennummern der Datei
+    
+    # Prüfen auf die Zeile für Überschreitungsdaten
+    over_limits = None
+    ol_data_row = df[df['Monat'] == 'OverLimitData']
+    if not ol_data_row.empty:
+        over_limits = [{'month_index': -1, 'year': -1} for _ in range(3)]
+        for i in range(3):
+            if f'OL{i+1}_Month_Index' in ol_data_row.columns and f'OL{i+1}_Year' in ol_data_row.columns:
+                over_limits[i]['month_index'] = int(ol_data_row[f'OL{i+1}_Month_Index'].iloc[0])
+                over_limits[i]['year'] = int(ol_data_row[f'OL{i+1}_Year'].iloc[0])
+        df = df[df['Monat'] != 'OverLimitData'] 
+
+    # Überprüfen und Laden der monatlichen Daten
+    # Angepasste Spalten für den Import, da Urlaub entfernt wurde
+    required_columns_monthly = ['Monat', *CSV_SPALTEN]
+    if not all(col in df.columns for col in required_columns_monthly):
+        raise CSVFormatFehler("Fehler: Die geladene CSV-Datei hat nicht die erwarteten Spalten für die monatlichen Gehaltsdaten. Stellen Sie sicher, dass sie keine Urlaubsspalten enthält, wenn die Funktion entfernt wurde.")
+    
+    gueltig, fehler = validate_payroll_frame(df, jahr, land=land)
+    spalten = {feld: gueltig[spalte].tolist() for spalte, feld in CSV_SPALTEN.items()}
+    monthly_data = {
+        month: {feld: werte[i] for feld, werte in spalten.items()}
+        for i, month in enumerate(gueltig['Monat'])
+    }
+    return monthly_data, over_limits, fehler
+
+# --- PARQUET ---
+#
+# Ein Archiv (ZIP) mit zwei typisierten Parquet-Tabellen: 'monatsdaten.parquet'
+# (eine Zeile je Mitarbeiter-Monat) und 'ueberschreitungen.parquet' (eine Zeile
+# je manuell erfasster Überschreitung). Monate sind 1-12.
+
+PARQUET_MONATSDATEN = 'monatsdaten.parquet'
+PARQUET_UEBERSCHREITUNGEN = 'ueberschreitungen.parquet'
+
+def _parquet_schemata() -> tuple:
+    """Schemata der beiden Tabellen (pyarrow wird erst hier geladen)."""
+    import pyarrow as pa
+
+    schluessel = [
+        pa.field('mitarbeiter', pa.dictionary(pa.int32(), pa.string()), nullable=False),
+        pa.field('jahr', pa.int16(), nullable=False),
+        pa.field('monat', pa.int8(), nullable=False)
+    ]
+    monatsdaten = pa.schema(schluessel + [
+        pa.field('grundlohn', pa.float64(), nullable=False),
+        pa.field('stunden', pa.float64(), nullable=False),
+        pa.field('sf_zuschlag', pa.bool_(), nullable=False),
+        pa.field('sf_zuschlag_stunden', pa.float64(), nullable=False),
+        pa.field('nacht_zuschlag', pa.bool_(), nullable=False),
+        pa.field('nacht_zuschlag_stunden', pa.float64(), nullable=False)
+    ])
+    return monatsdaten, pa.schema(schluessel)
+
+def monthly_data_to_frame(monthly_data: dict, mitarbeiter: str = '', jahr: int = None) -> pd.DataFrame:
+    """Wandelt monthly_data (ein Nutzer, ein Jahr) in eine Tabelle mit Schlüsselspalten um."""
+    import pandas as pd
+
+    df = pd.DataFrame(monatsdaten_array(monthly_data), index=list(monthly_data))
+    df.insert(0, 'monat', [MONATE.index(monat) + 1 for monat in df.index])
+    df.insert(0, 'jahr', datetime.now().year if jahr is None else jahr)
+    df.insert(0, 'mitarbeiter', mitarbeiter)
+    return df.reset_index(drop=True)
+
+def over_limits_to_frame(manual_over_limits: list, mitarbeiter: str = '') -> pd.DataFrame:
+    """Wandelt die manuellen Überschreitungen in eine Ereignistabelle um (leere Einträge entfallen)."""
+    import pandas as pd
+
+    ereignisse = [ol for ol in manual_over_limits if ol['month_index'] != -1 and ol['year'] != -1]
+    return pd.DataFrame({
+        'mitarbeiter': [mitarbeiter] * len(ereignisse),
+        'jahr': [ol['year'] for ol in ereignisse],
+        'monat': [ol['month_index'] + 1 for ol in ereignisse]
+    })
+
+def save_parquet(ziel, monatsdaten: pd.DataFrame, ueberschreitungen: pd.DataFrame) -> None:
+    """Speichert Monatsdaten und Überschreitungen als Parquet-Archiv (Pfad oder Dateiobjekt)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with zipfile.ZipFile(ziel, 'w', compression=zipfile.ZIP_STORED) as archiv:
+        for name, df, schema in zip(
+            (PARQUET_MONATSDATEN, PARQUET_UEBERSCHREITUNGEN), (monatsdaten, ueberschreitungen), _parquet_schemata()
+        ):
+            df = df[schema.names].astype({'mitarbeiter': str})
+            tabelle = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+            with archiv.open(name, 'w') as datei:
+                pq.write_table(tabelle, datei, compression='zstd')
+
+def load_parquet(quelle) -> tuple:
+    """Lädt ein Parquet-Archiv. Rückgabe: (Monatsdaten, Überschreitungen) als typisierte DataFrames."""
+    import pyarrow.parquet as pq
+
+    tabellen = []
+    with zipfile.ZipFile(quelle) as archiv:
+        for name, schema in zip((PARQUET_MONATSDATEN, PARQUET_UEBERSCHREITUNGEN), _parquet_schemata()):
+            with archiv.open(name) as datei:
+                tabelle = pq.read_table(datei)
+            if not tabelle.schema.equals(schema):
+                raise ValueError(f"Unerwartetes Schema in {name}")
+            tabellen.append(tabelle.to_pandas())
+    return tuple(tabellen)
+
+def frame_to_session(monatsdaten: pd.DataFrame, ueberschreitungen: pd.DataFrame,
+                     mitarbeiter: str = None, jahr: int = None) -> tuple:
+    """Wählt einen Mitarbeiter und ein Jahr aus den Tabellen und baut daraus den Session State.
+
+    Ohne Angabe werden der erste Mitarbeiter und dessen letztes Jahr genommen.
+    Rückgabe: (monthly_data-Einträge, manual_over_limits mit drei Plätzen).
+    """
+    if mitarbeiter is None:
+        mitarbeiter = monatsdaten['mitarbeiter'].iloc[0] if len(monatsdaten) else ''
+    eigene = monatsdaten[monatsdaten['mitarbeiter'] == mitarbeiter]
+    if jahr is None and len(eigene):
+        jahr = eigene['jahr'].max()
+    eigene = eigene[eigene['jahr'] == jahr]
+
+    monthly_data = eigene.set_index(np.array(MONATE)[eigene['monat'].to_numpy() - 1])[EINGABE_FELDER].to_dict('index')
+
+    # Die jüngsten drei Überschreitungen füllen die drei Eingabeplätze
+    ereignisse = ueberschreitungen[ueberschreitungen['mitarbeiter'] == mitarbeiter].sort_values(['jahr', 'monat']).tail(3)
+    over_limits = [
+        {'month_index': int(ol_monat) - 1, 'year': int(ol_jahr)}
+        for ol_jahr, ol_monat in zip(ereignisse['jahr'], ereignisse['monat'])
+    ]
+    over_limits += [{'month_index': -1, 'year': -1} for _ in range(3 - len(over_limits))]
+    return monthly_data, over_limits
+
+# --- SQLITE ---
+#
+# Dauerhafte lokale Ablage aller Mitarbeiter und Jahre mit denselben Tabellen
+# wie im Parquet-Archiv. Beide Tabellen sind WITHOUT ROWID mit dem Schlüssel
+# (mitarbeiter, jahr, monat): die Zeilen liegen im Primärschlüssel-Index selbst,
+# die Historie eines Mitarbeiters ist ein zusammenhängender Bereich darin. Im
+# WAL-Modus lesen Sitzungen weiter, während eine andere schreibt.
+
+SQLITE_UMGEBUNGSVARIABLE = 'LOHNRECHNER_DB'
+SQLITE_STANDARD_PFAD = 'lohnrechner.sqlite3'
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS monatsdaten (
+    mitarbeiter TEXT NOT NULL,
+    jahr INTEGER NOT NULL,
+    monat INTEGER NOT NULL CHECK (monat BETWEEN 1 AND 12),
+    grundlohn REAL NOT NULL,
+    stunden REAL NOT NULL,
+    sf_zuschlag INTEGER NOT NULL,
+    sf_zuschlag_stunden REAL NOT NULL,
+    nacht_zuschlag INTEGER NOT NULL,
+    nacht_zuschlag_stunden REAL NOT NULL,
+    PRIMARY KEY (mitarbeiter, jahr, monat)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS ueberschreitungen (
+    mitarbeiter TEXT NOT NULL,
+    jahr INTEGER NOT NULL,
+    monat INTEGER NOT NULL CHECK (monat BETWEEN 1 AND 12),
+    PRIMARY KEY (mitarbeiter, jahr, monat)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ueberschreitungen_monat ON ueberschreitungen (jahr, monat);
+"""
+
+class LohnDatenbank:
+    """SQLite-Ablage für alle Sitzungen eines Prozesses.
+
+    Geschrieben wird über eine gemeinsame Verbindung, jeweils in einer
+    Transaktion; gelesen über einen Pool von Verbindungen, sodass Lesen nicht
+    auf Schreiben wartet. `pfad` muss eine Datei sein (Standard: Umgebungsvariable
+    LOHNRECHNER_DB bzw. SQLITE_STANDARD_PFAD).
+    """
+
+    def __init__(self, pfad: str = None):
+        import sqlite3
+
+        self.pfad = pfad or os.environ.get(SQLITE_UMGEBUNGSVARIABLE) or SQLITE_STANDARD_PFAD
+        self._schreiber = sqlite3.connect(self.pfad, timeout=30, isolation_level=None, check_same_thread=False)
+        self._schreiber.execute('PRAGMA journal_mode=WAL')
+        self._schreiber.execute('PRAGMA synchronous=NORMAL')  # im WAL-Modus sicher gegen Abstürze der Anwendung
+        self._schreiber.executescript(_SQLITE_SCHEMA)
+        self._sperre = threading.Lock()
+        self._leser = queue.SimpleQueue()
+
+    @contextmanager
+    def _transaktion(self):
+        with self._sperre:
+            self._schreiber.execute('BEGIN IMMEDIATE')
+            try:
+                yield self._schreiber
+            except BaseException:
+                self._schreiber.execute('ROLLBACK')
+                raise
+            self._schreiber.execute('COMMIT')
+
+    @contextmanager
+    def _lesen(self):
+        import sqlite3
+
+        try:
+            verbindung = self._leser.get_nowait()
+        except queue.Empty:
+            verbindung = sqlite3.connect(self.pfad, timeout=30, isolation_level=None, check_same_thread=False)
+            verbindung.execute('PRAGMA query_only=ON')
+        try:
+            yield verbindung
+        finally:
+            self._leser.put(verbindung)
+
+    def speichern(self, monatsdaten: pd.DataFrame, ueberschreitungen: pd.DataFrame = None) -> None:
+        """Schreibt Mitarbeiter-Monate (wie monthly_data_to_frame) in einer Transaktion, vorhandene Monate werden ersetzt.
+
+        Mit `ueberschreitungen` (wie over_limits_to_frame) werden je darin oder
+        in `monatsdaten` vorkommendem Mitarbeiter die Überschreitungen im
+        gespeicherten Zeitraum durch die übergebenen ersetzt: ab der ältesten
+        übergebenen Überschreitung (ohne solche ab Januar des ältesten Jahres)
+        bis Dezember des jüngsten Jahres bzw. zur jüngsten Überschreitung.
+        Ältere Ereignisse, die in den drei Eingabeplätzen keinen Platz hatten,
+        bleiben so erhalten.
+        """
+        import pandas as pd
+
+        spalten = ['mitarbeiter', 'jahr', 'monat', *EINGABE_FELDER]
+        with self._transaktion() as verbindung:
+            verbindung.executemany(
+                f"INSERT OR REPLACE INTO monatsdaten ({', '.join(spalten)}) VALUES ({', '.join('?' * len(spalten))})",
+                zip(*(monatsdaten[spalte].to_numpy().tolist() for spalte in spalten))
+            )
+            if ueberschreitungen is not None:
+                # Zeitraum je Mitarbeiter als Monatsordinale (Jahr * 12 + Monatsindex)
+                ereignisse = (ueberschreitungen['jahr'].astype(np.int64) * 12 + ueberschreitungen['monat'].astype(np.int64) - 1) \
+                    .groupby(ueberschreitungen['mitarbeiter']).agg(['min', 'max'])
+                jahre = monatsdaten['jahr'].astype(np.int64).groupby(monatsdaten['mitarbeiter']).agg(['min', 'max'])
+                von = ereignisse['min'].combine_first(jahre['min'] * 12)
+                bis = pd.concat([ereignisse['max'], jahre['max'] * 12 + 11], axis=1).max(axis=1).reindex(von.index)
+                verbindung.executemany(
+                    "DELETE FROM ueberschreitungen WHERE mitarbeiter = ? AND jahr * 12 + monat - 1 BETWEEN ? AND ?",
+                    zip(von.index.tolist(), von.astype(np.int64).tolist(), bis.astype(np.int64).tolist())
+                )
+                verbindung.executemany(
+                    "INSERT OR IGNORE INTO ueberschreitungen (mitarbeiter, jahr, monat) VALUES (?, ?, ?)",
+                    zip(*(ueberschreitungen[spalte].to_numpy().tolist() for spalte in ('mitarbeiter', 'jahr', 'monat')))
+                )
+
+    def historie(self, mitarbeiter: str, von_jahr: int = None, bis_jahr: int = None) -> tuple:
+        """Monatsdaten und Überschreitungen eines Mitarbeiters von `von_jahr` bis `bis_jahr` (einschließlich).
+
+        Je Tabelle eine Bereichsabfrage über den Primärschlüssel, in einem
+        gemeinsamen Lesevorgang. Rückgabe wie load_parquet, passend für frame_to_session.
+        """
+        import pandas as pd
+
+        bereich = (mitarbeiter, -1 if von_jahr is None else von_jahr, 9999 if bis_jahr is None else bis_jahr)
+        with self._lesen() as verbindung:
+            verbindung.execute('BEGIN')
+            try:
+                monate = verbindung.execute(
+                    f"SELECT jahr, monat, {', '.join(EINGABE_FELDER)} FROM monatsdaten "
+                    "WHERE mitarbeiter = ? AND jahr BETWEEN ? AND ? ORDER BY jahr, monat", bereich
+                ).fetchall()
+                ereignisse = verbindung.execute(
+                    "SELECT jahr, monat FROM ueberschreitungen "
+                    "WHERE mitarbeiter = ? AND jahr BETWEEN ? AND ? ORDER BY jahr, monat", bereich
+                ).fetchall()
+            finally:
+                verbindung.execute('COMMIT')
+
+        def als_frame(zeilen, spalten):
+            typen = {'jahr': np.int64, 'monat': np.int64, 'sf_zuschlag': bool, 'nacht_zuschlag': bool}
+            werte = list(zip(*zeilen)) or [()] * len(spalten)
+            return pd.DataFrame({
+                'mitarbeiter': mitarbeiter,
+                **{spalte: np.array(w, dtype=typen.get(spalte, np.float64)) for spalte, w in zip(spalten, werte)}
+            })
+
+        return als_frame(monate, ['jahr', 'monat', *EINGABE_FELDER]), als_frame(ereignisse, ['jahr', 'monat'])
+
+    def mitarbeiter(self) -> list:
+        """Alle Mitarbeiter mit gespeicherten Monaten, sortiert."""
+        with self._lesen() as verbindung:
+            zeilen = verbindung.execute("SELECT DISTINCT mitarbeiter FROM monatsdaten ORDER BY mitarbeiter")
+            return [zeile[0] for zeile in zeilen]
+
+    def schliessen(self) -> None:
+        """Schließt alle Verbindungen."""
+        with self._sperre:
+            self._schreiber.close()
+            while True:
+                try:
+                    self._leser.get_nowait().close()
+                except queue.Empty:
+                    break
@@ -0,0 +1,43 @@
+"""Was-wäre-wenn-Szenarien über ein Gitter aus Lohn, Stunden und Zuschlagsanteilen."""
+
+from functools import lru_cache
+
+import numpy as np
+
+from .batch import calculate_salary_batch
+from .konstanten import rates_version
+
+@lru_cache(maxsize=8)
+def _scenario_grid(loehne: tuple, stunden: tuple, sf_anteile: tuple, nacht_anteile: tuple, version: tuple) -> dict:
+    """Berechnet das Szenario-Gitter einmal je Gitter und Satzstand (siehe scenario_grid)."""
+    grenze, rates = version[0], dict(version[1])
+    lohn = np.asarray(loehne, dtype=np.float64)[:, None, None, None]
+    std = np.asarray(stunden, dtype=np.float64)[None, :, None, None]
+    sf = np.asarray(sf_anteile, dtype=np.float64)[None, None, :, None]
+    nacht = np.asarray(nacht_anteile, dtype=np.float64)[None, None, None, :]
+
+    ergebnis = calculate_salary_batch(
+        lohn, std, sf > 0, std * sf, nacht > 0, std * nacht, rates=rates, minijob_grenze=grenze
+    )
+    gitter = {
+        'netto': ergebnis['netto'],
+        'auslastung': ergebnis['brutto_grundlohn_fuer_grenze'] / grenze * 100
+    }
+    for werte in gitter.values():
+        werte.setflags(write=False)
+    return gitter
+
+def scenario_grid(loehne, stunden, sf_anteile=(0.0,), nacht_anteile=(0.0,),
+                  rates: dict = None, minijob_grenze: float = None) -> dict:
+    """Berechnet Netto und Auslastung der Minijob-Grenze (in %) für alle Kombinationen auf einmal.
+
+    Die Anteile geben an, welcher Teil der Stunden SF- bzw. Nacht-Zuschlag erhält.
+    Rückgabe: Arrays der Form (Löhne, Stunden, SF-Anteile, Nacht-Anteile), nur lesbar.
+    `rates` und `minijob_grenze` wie bei calculate_salary. Ergebnisse werden je
+    Gitter und rates_version(rates, minijob_grenze) zwischengespeichert.
+    """
+    return _scenario_grid(
+        tuple(map(float, loehne)), tuple(map(float, stunden)),
+        tuple(map(float, sf_anteile)), tuple(map(float, nacht_anteile)),
+        rates_version(rates, minijob_grenze)
+    )
@@ -0,0 +1,60 @@
+"""Monatsübersicht mit inkrementeller Neuberechnung."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .batch import calculate_salary_batch
+from .konstanten import EINGABE_FELDER, MONATE
+from .saetze import rates_und_grenze, saetze_fuer_ordinale
+from .sitzung import monatsdaten_array
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+UEBERSICHT_SPALTEN = {
+    'Brutto Grundlohn': 'brutto_grundlohn_fuer_grenze', # 'inkl. Urlaub' entfernt
+    'Zuschläge': 'zuschlage',
+    'Netto': 'netto'
+}
+
+def update_monthly_overview(monthly_data: dict, cache: dict, jahr: int = None) -> pd.DataFrame:
+    """Aktualisiert die Vergleichstabelle der Monatsübersicht inkrementell.
+
+    `cache` bleibt zwischen den Reruns erhalten (z. B. in st.session_state) und merkt
+    sich die zuletzt berechneten Eingaben. Neu berechnet werden nur Monate, deren
+    Eingaben sich geändert haben; deren Zeilen werden in der gecachten Tabelle
+    ersetzt. Mit `jahr` gelten je Monat die Sätze aus der Satztabelle, ein anderes
+    Jahr rechnet alle Monate neu. Rückgabe: Tabelle der Monate mit Stunden oder Zuschlägen.
+    """
+    import pandas as pd
+
+    df = cache.get('df')
+    if df is None or list(df.index) != list(monthly_data) or cache.get('jahr') != jahr:
+        df = pd.DataFrame(np.nan, index=pd.Index(list(monthly_data), name='Monat'), columns=list(UEBERSICHT_SPALTEN))
+        df['aktiv'] = False
+        cache['df'] = df
+        cache['eingaben'] = None
+        cache['jahr'] = jahr
+
+    werte = monatsdaten_array(monthly_data)
+    geaendert = np.ones(len(werte), dtype=bool) if cache['eingaben'] is None else werte != cache['eingaben']
+
+    if geaendert.any():
+        neu = werte[geaendert]
+        zeilen = np.flatnonzero(geaendert)
+        rates = grenze = None
+        if jahr is not None:
+            monate = np.array([MONATE.index(monat) for monat in monthly_data])[zeilen]
+            rates, grenze = rates_und_grenze(saetze_fuer_ordinale(jahr * 12 + monate))
+        ergebnis = calculate_salary_batch(*(neu[feld] for feld in EINGABE_FELDER), rates=rates, minijob_grenze=grenze)
+        for spalte, feld in UEBERSICHT_SPALTEN.items():
+            df.iloc[zeilen, df.columns.get_loc(spalte)] = ergebnis[feld]
+        df.iloc[zeilen, df.columns.get_loc('aktiv')] = ( # Urlaubsberechnung entfernt
+            (neu['stunden'] > 0) | (neu['sf_zuschlag_stunden'] > 0) | (neu['nacht_zuschlag_stunden'] > 0)
+        )
+        cache['eingaben'] = werte.copy()
+
+    return df.loc[df['aktiv'], list(UEBERSICHT_SPALTEN)]
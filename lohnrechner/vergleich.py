@@ -0,0 +1,194 @@
+"""Vergleich zweier Lohnläufe je (Mitarbeiter, Jahr, Monat): geänderte Beträge, Grenz- und Zeitjahr-Wechsel.
+
+Beide Läufe werden über einen Hash des Mitarbeiters in Partitionen geteilt;
+jeder Mitarbeiter liegt mit allen Monaten beider Läufe in genau einer
+Partition. Je Partition werden die Zeilen per Hash-Join (pd.merge) über den
+Schlüssel zusammengeführt und alle Vergleiche als Masken über die Spalten
+gerechnet. Im Speicher liegt neben den Eingaben nur eine Partition und die
+gefundenen Unterschiede. Beträge werden in ganzen Cent verglichen und ausgegeben,
+Rundungsrauschen unter einem halben Cent zählt also nicht als Änderung.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .batch import calculate_salary_frame, saetze_je_zeile
+from .festkomma import _in_hundertstel
+from .konstanten import ERGEBNIS_FELDER
+from .zeitjahr import ordinal_als_datum, zeitjahr_je_code
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+SCHLUESSEL = ['mitarbeiter', 'jahr', 'monat']
+
+# Beträge, die standardmäßig verglichen werden
+VERGLEICH_FELDER = [
+    'brutto_grundlohn_fuer_grenze', 'zuschlage', 'brutto_gesamt', 'rentenversicherung_abzug',
+    'pauschale_abzuege', 'gesamte_abzuege', 'netto'
+]
+
+def _vorbereiten(df: pd.DataFrame, felder: list, grenze) -> pd.DataFrame:
+    """Schlüssel, Vergleichsfelder, Überschreitung und Grenze je Zeile eines Laufs; fehlende Ergebnisse werden berechnet."""
+    fehlend = [spalte for spalte in SCHLUESSEL if spalte not in df.columns]
+    if fehlend:
+        raise KeyError(f"Fehlende Spalten für den Vergleich: {', '.join(fehlend)}")
+    benoetigt = [*felder, 'brutto_grundlohn_fuer_grenze']
+    if all(feld in df.columns for feld in benoetigt):
+        ergebnis = df
+    else:
+        ergebnis = calculate_salary_frame(df)
+        ergebnis = ergebnis.join(df[[feld for feld in felder if feld not in ERGEBNIS_FELDER]])
+    if grenze is None:
+        _, grenze = saetze_je_zeile(df)
+    teil = df[SCHLUESSEL].copy()
+    for feld in dict.fromkeys(benoetigt):
+        teil[feld] = ergebnis[feld].to_numpy()
+    teil['grenze'] = np.broadcast_to(np.asarray(grenze, dtype=np.float64), len(df))
+    return teil
+
+def _partitionen(mitarbeiter: pd.Series, anzahl: int) -> list:
+    """Zeilenpositionen je Partition (Hash des Mitarbeiters modulo anzahl), in einem Durchlauf sortiert."""
+    import pandas as pd
+
+    teil = pd.util.hash_pandas_object(mitarbeiter, index=False).to_numpy() % np.uint64(anzahl)
+    reihenfolge = np.argsort(teil, kind='stable')
+    grenzen = np.searchsorted(teil[reihenfolge], np.arange(anzahl + 1))
+    return [reihenfolge[von:bis] for von, bis in zip(grenzen[:-1], grenzen[1:])]
+
+def _zeitjahr(codes: np.ndarray, ordinale: np.ndarray, ueber: np.ndarray, anzahl_codes: int) -> tuple:
+    if codes.size == 0:
+        return np.zeros(anzahl_codes, dtype=np.int64), np.full(anzahl_codes, -1, dtype=np.int64)
+    return zeitjahr_je_code(codes, ordinale, ueber, anzahl_codes)
+
+def _partition_vergleichen(alt: pd.DataFrame, neu: pd.DataFrame, felder: list) -> dict:
+    import pandas as pd
+
+    zusammen = pd.merge(
+        alt, neu, on=SCHLUESSEL, how='outer', suffixes=('_alt', '_neu'), indicator=True, validate='one_to_one'
+    )
+    beide = (zusammen['_merge'] == 'both').to_numpy()
+    schluessel = zusammen[SCHLUESSEL]
+
+    # Geänderte Beträge in Cent, als lange Tabelle (eine Zeile je Feld und Mitarbeiter-Monat)
+    aenderungen = []
+    for feld in felder:
+        geaendert = np.flatnonzero(beide)
+        cent_alt = _in_hundertstel(zusammen[f'{feld}_alt'].to_numpy(dtype=np.float64)[geaendert])
+        cent_neu = _in_hundertstel(zusammen[f'{feld}_neu'].to_numpy(dtype=np.float64)[geaendert])
+        unterschied = cent_alt != cent_neu
+        if unterschied.any():
+            # Ausgegeben werden die verglichenen Centbeträge, nicht die ungerundeten Werte
+            aenderungen.append(schluessel.iloc[geaendert[unterschied]].assign(
+                feld=feld, alt=cent_alt[unterschied] / 100, neu=cent_neu[unterschied] / 100,
+                differenz=(cent_neu[unterschied] - cent_alt[unterschied]) / 100
+            ))
+
+    # Überschreitungen der Minijob-Grenze je Lauf, ebenfalls in Cent
+    brutto_alt = _in_hundertstel(np.nan_to_num(zusammen['brutto_grundlohn_fuer_grenze_alt'].to_numpy(dtype=np.float64)))
+    brutto_neu = _in_hundertstel(np.nan_to_num(zusammen['brutto_grundlohn_fuer_grenze_neu'].to_numpy(dtype=np.float64)))
+    ueber_alt = brutto_alt > _in_hundertstel(np.nan_to_num(zusammen['grenze_alt'].to_numpy(dtype=np.float64)))
+    ueber_neu = brutto_neu > _in_hundertstel(np.nan_to_num(zusammen['grenze_neu'].to_numpy(dtype=np.float64)))
+    gewechselt = np.flatnonzero(beide & (ueber_alt != ueber_neu))
+    grenzwechsel = schluessel.iloc[gewechselt].assign(
+        brutto_alt=brutto_alt[gewechselt] / 100,
+        brutto_neu=brutto_neu[gewechselt] / 100,
+        grenze_alt=zusammen['grenze_alt'].to_numpy()[gewechselt],
+        grenze_neu=zusammen['grenze_neu'].to_numpy()[gewechselt],
+        ueberschritten_neu=ueber_neu[gewechselt]
+    )
+
+    # Zeitjahr je Mitarbeiter und Lauf (Zeilen, die nur in einem Lauf vorkommen, zählen dort mit)
+    codes, namen = pd.factorize(zusammen['mitarbeiter'])
+    ordinale = zusammen['jahr'].to_numpy(dtype=np.int64) * 12 + zusammen['monat'].to_numpy(dtype=np.int64) - 1
+    vorhanden_alt = zusammen['_merge'].isin(['both', 'left_only']).to_numpy()
+    vorhanden_neu = zusammen['_merge'].isin(['both', 'right_only']).to_numpy()
+    anzahl_alt, verlust_alt = _zeitjahr(codes[vorhanden_alt], ordinale[vorhanden_alt], ueber_alt[vorhanden_alt], len(namen))
+    anzahl_neu, verlust_neu = _zeitjahr(codes[vorhanden_neu], ordinale[vorhanden_neu], ueber_neu[vorhanden_neu], len(namen))
+    geaendert = np.flatnonzero(verlust_alt != verlust_neu)
+    zeitjahr = pd.DataFrame({
+        'mitarbeiter': namen[geaendert],
+        'anzahl_alt': anzahl_alt[geaendert],
+        'anzahl_neu': anzahl_neu[geaendert],
+        'statusverlust_alt': ordinal_als_datum(verlust_alt[geaendert]),
+        'statusverlust_neu': ordinal_als_datum(verlust_neu[geaendert]),
+        'wechsel': np.select(
+            [verlust_alt[geaendert] < 0, verlust_neu[geaendert] < 0],
+            ["Statusverlust neu", "Statusverlust entfällt"], "Statusverlust verschoben"
+        )
+    })
+
+    return {
+        'felder': aenderungen,
+        'grenze': grenzwechsel,
+        'zeitjahr': zeitjahr,
+        'nur_alt': schluessel[(zusammen['_merge'] == 'left_only').to_numpy()],
+        'nur_neu': schluessel[(zusammen['_merge'] == 'right_only').to_numpy()],
+        'verglichen': int(beide.sum())
+    }
+
+def compare_runs(alt: pd.DataFrame, neu: pd.DataFrame, felder: list = None, grenze_alt=None, grenze_neu=None,
+                 partitionen: int = None, zeilen_je_partition: int = 1_000_000) -> dict:
+    """Vergleicht zwei Lohnläufe Zeile für Zeile über (mitarbeiter, jahr, monat).
+
+    Erwartet je Lauf die Schlüsselspalten und entweder die Ergebnisfelder (z. B.
+    aus "jahresabschluss --monate") oder EINGABE_FELDER; fehlende Ergebnisse
+    werden mit den Sätzen des jeweiligen Monats berechnet. Ohne `grenze_alt` bzw.
+    `grenze_neu` gilt je Zeile die Minijob-Grenze aus der Satztabelle. Ohne
+    `partitionen` wird so geteilt, dass eine Partition etwa
+    `zeilen_je_partition` Zeilen je Lauf hat.
+
+    Rückgabe: 'felder' (je geänderter Betrag: Schlüssel, feld, alt, neu,
+    differenz), 'grenze' (Wechsel über oder unter die Minijob-Grenze),
+    'zeitjahr' (Mitarbeiter mit geändertem Statusverlust), 'nur_alt' und
+    'nur_neu' (Schlüssel, die nur in einem Lauf vorkommen) sowie 'summen'.
+    Wirft ValueError, wenn ein Schlüssel in einem Lauf mehrfach vorkommt.
+    """
+    import pandas as pd
+
+    felder = list(VERGLEICH_FELDER if felder is None else felder)
+    alt = _vorbereiten(alt, felder, grenze_alt)
+    neu = _vorbereiten(neu, felder, grenze_neu)
+    if alt['mitarbeiter'].dtype != neu['mitarbeiter'].dtype:
+        alt['mitarbeiter'] = alt['mitarbeiter'].astype(str)
+        neu['mitarbeiter'] = neu['mitarbeiter'].astype(str)
+    partitionen = max(1, partitionen or -(-max(len(alt), len(neu)) // zeilen_je_partition))
+
+    teile = [
+        _partition_vergleichen(alt.iloc[zeilen_alt], neu.iloc[zeilen_neu], felder)
+        for zeilen_alt, zeilen_neu in zip(_partitionen(alt['mitarbeiter'], partitionen),
+                                          _partitionen(neu['mitarbeiter'], partitionen))
+    ]
+
+    def zusammen(name, spalten):
+        frames = [frame for teil in teile for frame in (teil[name] if name == 'felder' else [teil[name]])]
+        frames = [frame for frame in frames if len(frame)]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=spalten)
+
+    aenderungen = zusammen('felder', [*SCHLUESSEL, 'feld', 'alt', 'neu', 'differenz'])
+    aenderungen['feld'] = pd.Categorical(aenderungen['feld'], categories=felder)  # Reihenfolge wie `felder`
+    aenderungen = aenderungen.sort_values([*SCHLUESSEL, 'feld'], ignore_index=True, kind='stable')
+    grenzwechsel = zusammen('grenze', [*SCHLUESSEL, 'brutto_alt', 'brutto_neu', 'grenze_alt', 'grenze_neu', 'ueberschritten_neu'])
+    zeitjahr = zusammen('zeitjahr', ['mitarbeiter', 'anzahl_alt', 'anzahl_neu', 'statusverlust_alt', 'statusverlust_neu', 'wechsel'])
+    nur_alt = zusammen('nur_alt', SCHLUESSEL)
+    nur_neu = zusammen('nur_neu', SCHLUESSEL)
+    return {
+        'felder': aenderungen,
+        'grenze': grenzwechsel.sort_values(SCHLUESSEL, ignore_index=True, kind='stable'),
+        'zeitjahr': zeitjahr.sort_values('mitarbeiter', ignore_index=True, kind='stable'),
+        'nur_alt': nur_alt,
+        'nur_neu': nur_neu,
+        'summen': {
+            'verglichen': sum(teil['verglichen'] for teil in teile),
+            'geaenderte_monate': int(aenderungen[SCHLUESSEL].drop_duplicates().shape[0]),
+            'geaenderte_felder': len(aenderungen),
+            'grenzwechsel': len(grenzwechsel),
+            'zeitjahr_wechsel': len(zeitjahr),
+            'nur_alt': len(nur_alt),
+            'nur_neu': len(nur_neu),
+            'partitionen': partitionen
+        }
+    }
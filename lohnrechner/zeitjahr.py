@@ -0,0 +1,121 @@
+"""Zeitjahr-Regel: höchstens zwei Überschreitungen der Minijob-Grenze in 12 Monaten."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .batch import calculate_salary_frame
+from .saetze import saetze_fuer_ordinale
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+def zeitjahr_auswerten(ordinale) -> dict:
+    """Wertet sortierte Überschreitungsmonate (Ordinal = Jahr * 12 + Monatsindex) nach der Zeitjahr-Regel aus.
+
+    Ein Zeitjahr umfasst den betrachteten Monat und die elf Monate davor. Liegt eine
+    Überschreitung mit zwei weiteren in diesem Fenster, geht der Minijob-Status in
+    diesem Monat verloren. Ein einziger linearer Durchlauf über die Überschreitungen.
+    Rückgabe: 'verlust' (Ordinal oder None), 'start' (erste Überschreitung im
+    maßgeblichen Zeitjahr oder None) und 'anzahl' (Überschreitungen darin).
+    """
+    ordinale = np.unique(np.asarray(ordinale, dtype=np.int64))
+    if ordinale.size == 0:
+        return {'verlust': None, 'start': None, 'anzahl': 0}
+
+    dritte = np.flatnonzero(ordinale[2:] - ordinale[:-2] <= 11)
+    if dritte.size:
+        k = dritte[0] + 2
+        start = int(ordinale[k - 2])
+        return {'verlust': int(ordinale[k]), 'start': start, 'anzahl': int(k - np.searchsorted(ordinale, start) + 1)}
+
+    # Kein Statusverlust: maßgeblich ist das Zeitjahr bis zur letzten Überschreitung
+    im_zeitjahr = ordinale[ordinale >= ordinale[-1] - 11]
+    return {'verlust': None, 'start': int(im_zeitjahr[0]), 'anzahl': int(im_zeitjahr.size)}
+
+def evaluate_zeitjahr(brutto_werte, start_jahr: int, start_monat_index: int,
+                      grenze: float = None) -> dict:
+    """Wertet eine lückenlose Folge monatlicher Brutto-Grundlöhne ab (start_jahr, start_monat_index) aus.
+
+    Ohne `grenze` gilt je Monat die Minijob-Grenze aus der Satztabelle.
+    Rückgabe wie zeitjahr_auswerten, Monate jedoch als (Jahr, Monatsindex), dazu
+    die Liste aller Überschreitungen.
+    """
+    erster = start_jahr * 12 + start_monat_index
+    brutto_werte = np.asarray(brutto_werte, dtype=np.float64)
+    if grenze is None:
+        grenze = saetze_fuer_ordinale(erster + np.arange(brutto_werte.size))['minijob_grenze']
+    ordinale = erster + np.flatnonzero(brutto_werte > grenze)
+    auswertung = zeitjahr_auswerten(ordinale)
+    als_monat = lambda ordinal: None if ordinal is None else divmod(int(ordinal), 12)
+    return {
+        'ueberschreitungen': [divmod(int(o), 12) for o in ordinale],
+        'verlust': als_monat(auswertung['verlust']),
+        'start': als_monat(auswertung['start']),
+        'anzahl': auswertung['anzahl']
+    }
+
+def evaluate_zeitjahr_frame(df: pd.DataFrame, mitarbeiter: str = 'mitarbeiter',
+                            grenze: float = None) -> pd.DataFrame:
+    """Zeitjahr-Prüfung für eine ganze Belegschaft in einem vektorisierten Durchlauf.
+
+    Erwartet eine Zeile je Mitarbeiter-Monat mit den Spalten `mitarbeiter`, 'jahr',
+    'monat' (1-12) und 'brutto_grundlohn_fuer_grenze' (fehlt sie, wird sie aus den
+    Spalten in EINGABE_FELDER berechnet). Ohne `grenze` gilt je Zeile die
+    Minijob-Grenze ihres Monats aus der Satztabelle. Mehrere Zeilen für denselben
+    Mitarbeiter-Monat zählen als eine Überschreitung. Rückgabe je Mitarbeiter: Anzahl der
+    Überschreitungsmonate und das Datum des Statusverlusts (NaT, falls keiner).
+    """
+    import pandas as pd
+
+    if 'brutto_grundlohn_fuer_grenze' in df.columns:
+        brutto = df['brutto_grundlohn_fuer_grenze'].to_numpy(dtype=np.float64)
+    else:
+        brutto = calculate_salary_frame(df)['brutto_grundlohn_fuer_grenze'].to_numpy()
+
+    codes, namen = pd.factorize(df[mitarbeiter], sort=True)
+    ordinale = df['jahr'].to_numpy(dtype=np.int64) * 12 + df['monat'].to_numpy(dtype=np.int64) - 1
+    if grenze is None:
+        grenze = saetze_fuer_ordinale(ordinale)['minijob_grenze']
+    anzahl, verlust = zeitjahr_je_code(codes, ordinale, brutto > grenze, len(namen))
+
+    return pd.DataFrame({
+        'anzahl_ueberschreitungen': anzahl,
+        'statusverlust': ordinal_als_datum(verlust)
+    }, index=pd.Index(namen, name=mitarbeiter))
+
+def zeitjahr_je_code(codes: np.ndarray, ordinale: np.ndarray, ueber: np.ndarray, anzahl_codes: int) -> tuple:
+    """Kern von evaluate_zeitjahr_frame auf Ganzzahl-Codes (0 .. anzahl_codes - 1), ohne pandas.
+
+    Doppelte (Code, Ordinal) werden einmal gezählt. Rückgabe: (Überschreitungsmonate
+    je Code, Ordinal des Statusverlusts je Code oder -1).
+    """
+    codes_ueber = codes[ueber]
+    ordinale_ueber = ordinale[ueber]
+    reihenfolge = np.lexsort((ordinale_ueber, codes_ueber))
+    codes_ueber = codes_ueber[reihenfolge]
+    ordinale_ueber = ordinale_ueber[reihenfolge]
+    # Mehrfache Zeilen für denselben Mitarbeiter-Monat zählen wie in zeitjahr_auswerten nur einmal
+    einmalig = np.ones(codes_ueber.size, dtype=bool)
+    einmalig[1:] = (codes_ueber[1:] != codes_ueber[:-1]) | (ordinale_ueber[1:] != ordinale_ueber[:-1])
+    codes_ueber = codes_ueber[einmalig]
+    ordinale_ueber = ordinale_ueber[einmalig]
+
+    # Dritte Überschreitung innerhalb von 12 Monaten beim selben Mitarbeiter
+    dritte = np.zeros(codes_ueber.size, dtype=bool)
+    dritte[2:] = (codes_ueber[2:] == codes_ueber[:-2]) & (ordinale_ueber[2:] - ordinale_ueber[:-2] <= 11)
+    treffer = np.flatnonzero(dritte)
+    _, erste = np.unique(codes_ueber[treffer], return_index=True)
+
+    verlust = np.full(anzahl_codes, -1, dtype=np.int64)
+    verlust[codes_ueber[treffer[erste]]] = ordinale_ueber[treffer[erste]]
+    return np.bincount(codes_ueber, minlength=anzahl_codes), verlust
+
+def ordinal_als_datum(ordinale: np.ndarray) -> np.ndarray:
+    """Monatsordinale -> datetime64[ns] (Monatsanfang), NaT für negative Werte."""
+    ordinale = np.asarray(ordinale, dtype=np.int64)
+    datum = (ordinale - 1970 * 12).astype('datetime64[M]').astype('datetime64[ns]')
+    datum[ordinale < 0] = np.datetime64('NaT')
+    return datum
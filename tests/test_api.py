@@ -0,0 +1,63 @@
+import asyncio
+import json
+
+import pytest
+
+from lohnrechner.api import APIFehler, LohnAPI, _gehalt, _gehalt_batch
+
+def _anfrage(pfad: str, body: bytes) -> tuple:
+    gesendet = []
+
+    async def empfangen():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def senden(nachricht):
+        gesendet.append(nachricht)
+
+    asyncio.run(LohnAPI()({'type': 'http', 'method': 'POST', 'path': pfad}, empfangen, senden))
+    return gesendet[0]['status'], json.loads(gesendet[1]['body'])
+
+@pytest.mark.parametrize('daten', [
+    {'grundlohn': 5, 'stunden': 3},
+    {'grundlohn': [13.0], 'stunden': 3},
+    {'grundlohn': [13.0], 'stunden': [10.0], 'jahr': 2025},
+    {'grundlohn': [[13.0]], 'stunden': [[10.0]]},
+    {'grundlohn': [13.0], 'stunden': [float('nan')]},
+    {'grundlohn': [13.0], 'stunden': [None]},
+    {'zeilen': 5},
+    {'zeilen': [5]},
+    {'zeilen': [{'grundlohn': float('inf'), 'stunden': 10}]},
+])
+def test_batch_falsche_form_ist_400(daten):
+    with pytest.raises(APIFehler) as fehler:
+        _gehalt_batch(daten)
+    assert fehler.value.status == 400
+
+def test_nan_ueber_http_ist_400():
+    status, antwort = _anfrage('/gehalt/batch', b'{"grundlohn": [13.0], "stunden": [NaN]}')
+    assert status == 400 and 'fehler' in antwort
+    status, antwort = _anfrage('/gehalt', b'{"grundlohn": Infinity, "stunden": 10}')
+    assert status == 400 and 'fehler' in antwort
+
+def test_gehalt_cache_bleibt_unveraendert():
+    daten = {'grundlohn': 13.0, 'stunden': 10.0}
+    erstes = _gehalt(daten)
+    netto = erstes['netto']
+    erstes['netto'] = -1.0
+    assert _gehalt(daten)['netto'] == netto
+
+def test_batch_zeitraum_je_zeile():
+    zeile_2026 = {'grundlohn': 14, 'stunden': 42, 'jahr': 2026}
+    zeile_ohne = {'grundlohn': 14, 'stunden': 42}
+    gemischt = _gehalt_batch({'zeilen': [zeile_2026, zeile_ohne]})
+    assert gemischt['pauschale_abzuege'][0] == _gehalt(zeile_2026)['pauschale_abzuege'] == 0.0
+    assert gemischt['pauschale_abzuege'][1] == _gehalt(zeile_ohne)['pauschale_abzuege'] > 0
+
+@pytest.mark.parametrize('daten', [
+    {'ueberschreitungen': [{'jahr': 2025, 'monat': 13}]},
+    {'ueberschreitungen': [{'jahr': 2025, 'monat': 0}]},
+    {'brutto': [600.0], 'start_jahr': 2025, 'start_monat': 13},
+])
+def test_zeitjahr_monat_ausserhalb_ist_400(daten):
+    status, antwort = _anfrage('/zeitjahr', json.dumps(daten).encode())
+    assert status == 400 and 'fehler' in antwort
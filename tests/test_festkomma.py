@@ -0,0 +1,73 @@
+import random
+from decimal import ROUND_HALF_UP, Decimal
+
+import pytest
+
+from lohnrechner.festkomma import calculate_salary_exact
+from lohnrechner.konstanten import MINIJOB_GRENZE, RATES
+
+CENT = Decimal('0.01')
+
+def _runden(wert: Decimal) -> Decimal:
+    return wert.quantize(CENT, rounding=ROUND_HALF_UP)
+
+def _referenz(grundlohn, stunden, sf_zuschlag, sf_stunden, nacht_zuschlag, nacht_stunden) -> dict:
+    """Rechnung mit Decimal, je Komponente einmal kaufmännisch gerundet (wie in festkomma beschrieben)."""
+    satz = {name: Decimal(str(wert)) for name, wert in RATES.items()}
+    grenze = Decimal(str(MINIJOB_GRENZE))
+    grundlohn, stunden = Decimal(grundlohn), Decimal(stunden)
+    sf_stunden, nacht_stunden = min(Decimal(sf_stunden), stunden), min(Decimal(nacht_stunden), stunden)
+
+    brutto = _runden(grundlohn * stunden)
+    zuschlage = (_runden(grundlohn * sf_stunden * satz['sf_zuschlag_rate']) if sf_zuschlag else 0) \
+        + (_runden(grundlohn * nacht_stunden * satz['nacht_zuschlag_rate']) if nacht_zuschlag else 0)
+    if brutto <= grenze:
+        rv, pauschal = _runden(brutto * satz['rentenversicherung_minijob']), Decimal(0)
+    else:
+        rv, pauschal = Decimal(0), _runden(brutto * satz['pauschale_abzuege_ueber_minijob'])
+    rest = max(Decimal(0), grenze - brutto)
+    return {
+        'brutto_grundlohn_fuer_grenze': brutto,
+        'zuschlage': zuschlage,
+        'brutto_gesamt': brutto + zuschlage,
+        'rentenversicherung_abzug': rv,
+        'pauschale_abzuege': pauschal,
+        'gesamte_abzuege': rv + pauschal,
+        'netto': brutto + zuschlage - rv - pauschal,
+        'freibetrag_rest': rest,
+        'rest_stunden': int(rest // grundlohn) if grundlohn > 0 else 0
+    }
+
+def _zufaellige_eingaben(anzahl: int):
+    zufall = random.Random(8)
+    for _ in range(anzahl):
+        stunden = f"{zufall.randint(0, 6000) / 100:.2f}"
+        yield (
+            f"{zufall.randint(0, 3000) / 100:.2f}", stunden,
+            zufall.random() < 0.7, f"{zufall.randint(0, 6000) / 100:.2f}",
+            zufall.random() < 0.7, f"{zufall.randint(0, 6000) / 100:.2f}"
+        )
+
+HALBE_CENT = [
+    ('12.82', '43', True, '5', True, '5'),  # Nacht: 12,82 x 5 x 0,25 = 16,025
+    ('12.82', '5', False, '0', True, '5'),
+    ('12.41', '1.5', True, '1.5', True, '1.5'),
+    ('13.90', '40', True, '0.5', False, '0'),
+]
+
+@pytest.mark.parametrize('eingaben', [*HALBE_CENT, *_zufaellige_eingaben(500)])
+def test_exakt_wie_decimal(eingaben):
+    grundlohn, stunden, sf_zuschlag, sf_stunden, nacht_zuschlag, nacht_stunden = eingaben
+    ergebnis = calculate_salary_exact(
+        float(grundlohn), float(stunden), sf_zuschlag, float(sf_stunden), nacht_zuschlag, float(nacht_stunden)
+    )
+    for feld, erwartet in _referenz(*eingaben).items():
+        if feld == 'rest_stunden':
+            assert ergebnis[feld] == erwartet
+        else:
+            assert round(ergebnis[feld] * 100) == int(erwartet * 100), feld
+
+def test_halber_cent_wird_aufgerundet():
+    ergebnis = calculate_salary_exact(12.82, 43, True, 5, True, 5)
+    assert ergebnis['zuschlage'] == 35.26
+    assert ergebnis['brutto_gesamt'] == pytest.approx(ergebnis['brutto_grundlohn_fuer_grenze'] + 35.26)
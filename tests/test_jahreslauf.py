@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from lohnrechner.festkomma import _in_hundertstel, calculate_salary_exact
+from lohnrechner.jahreslauf import SUMMEN_FELDER, run_year_end
+
+def test_summen_centgenau_und_stimmig():
+    df = pd.DataFrame({
+        'mitarbeiter': ['m0'] * 12 + ['m1'] * 12,
+        'jahr': 2025,
+        'monat': list(range(1, 13)) * 2,
+        'grundlohn': 12.82,
+        'stunden': np.tile([43.0, 20.0, 37.5], 8),
+        'sf_zuschlag': True,
+        'sf_zuschlag_stunden': 5.0,
+        'nacht_zuschlag': True,
+        'nacht_zuschlag_stunden': 5.0
+    })
+    ergebnis = run_year_end(df, workers=1, shards=2)
+    for mitarbeiter, zeilen in df.groupby('mitarbeiter'):
+        einzeln = [calculate_salary_exact(*zeile) for zeile in zeilen[[
+            'grundlohn', 'stunden', 'sf_zuschlag', 'sf_zuschlag_stunden', 'nacht_zuschlag', 'nacht_zuschlag_stunden'
+        ]].itertuples(index=False)]
+        for feld in SUMMEN_FELDER:
+            erwartet = sum(_in_hundertstel(e[feld]) for e in einzeln)
+            assert _in_hundertstel(ergebnis['mitarbeiter'].loc[mitarbeiter, feld]) == erwartet, feld
+
+    summen = ergebnis['summen']
+    assert summen['brutto_gesamt_cent'] == summen['brutto_grundlohn_fuer_grenze_cent'] + summen['zuschlage_cent']
+    assert summen['netto_cent'] == summen['brutto_gesamt_cent'] - summen['gesamte_abzuege_cent']
+    assert ergebnis['monate']['zuschlage'].iloc[0] == 35.26  # 19,23 + 16,025 -> 16,03
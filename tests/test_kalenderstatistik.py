@@ -0,0 +1,29 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from lohnrechner.kalenderstatistik import KALENDER_FELDER, kalender_statistik_je_zeile, kalender_statistik_monat
+from lohnrechner.konstanten import CSV_SPALTEN
+from lohnrechner.pruefung import validate_payroll_frame
+from lohnrechner.speicher import import_monthly_csv
+
+def test_je_zeile_wie_monat():
+    ergebnis = kalender_statistik_je_zeile([2024, 2025, 2025], [2, 5, 12], np.array(['NW', 'BY', 'SN'], dtype=object))
+    for i, (jahr, monat, land) in enumerate([(2024, 2, 'NW'), (2025, 5, 'BY'), (2025, 12, 'SN')]):
+        erwartet = kalender_statistik_monat(jahr, monat, land)
+        assert {feld: ergebnis[feld][i] for feld in KALENDER_FELDER} == erwartet
+
+def test_leere_eingabe():
+    ergebnis = kalender_statistik_je_zeile(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+    assert all(ergebnis[feld].shape == (0,) for feld in KALENDER_FELDER)
+    ergebnis = kalender_statistik_je_zeile([], [], np.zeros(0, dtype=object))
+    assert all(ergebnis[feld].shape == (0,) for feld in KALENDER_FELDER)
+
+def test_leerer_frame_pruefen_und_importieren():
+    spalten = ['Monat', *CSV_SPALTEN]
+    gueltig, fehler = validate_payroll_frame(pd.DataFrame(columns=spalten), 2025)
+    assert gueltig.empty and fehler.empty
+
+    monatsdaten, ueberschreitungen, fehler = import_monthly_csv(io.StringIO(','.join(spalten) + '\n'), 2025)
+    assert monatsdaten == {} and ueberschreitungen is None and fehler.empty
@@ -0,0 +1,55 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from lohnrechner.batch import calculate_salary_batch
+from lohnrechner.konstanten import MINIJOB_GRENZE, RATES
+from lohnrechner.planer import plan_year
+
+def _fall(seed: int) -> dict:
+    """Kleiner Zufallsfall: wenige Monate mit Verfügbarkeit, Stundenlöhne nahe der Grenze."""
+    rng = np.random.default_rng(seed)
+    schritt = [1.0, 0.5, 2.0][seed % 3]
+    einheiten = np.zeros(12, dtype=np.int64)
+    monate = rng.choice(12, size=5, replace=False)
+    einheiten[monate] = rng.integers(1, 4, size=5)
+    fall = {
+        'schritt': schritt,
+        'verfuegbarkeit': einheiten * schritt,
+        'grundlohn': np.round(rng.uniform(150, 300, 12) / schritt, 2),
+        'stundenbudget': float(rng.integers(0, einheiten.sum() + 1) * schritt),
+        'erlaubte_ueberschreitungen': int(rng.integers(0, 3)),
+        'rates': None,
+        'minijob_grenze': None
+    }
+    if seed % 2:
+        # Sätze und Grenze je Monat verschieden
+        fall['minijob_grenze'] = rng.choice([520.0, 556.0, 603.0], size=12)
+        fall['rates'] = {**RATES, 'rentenversicherung_minijob': rng.choice([0.036, 0.037, 0.039], size=12)}
+    return fall
+
+def _erschoepfend(fall: dict) -> float:
+    """Bestes Jahresnetto über alle zulässigen Stundenverteilungen."""
+    schritt = fall['schritt']
+    auswahl = [np.arange(int(round(v / schritt)) + 1) * schritt for v in fall['verfuegbarkeit']]
+    stunden = np.array(list(itertools.product(*auswahl)))
+    ergebnis = calculate_salary_batch(
+        fall['grundlohn'], stunden, False, 0.0, False, 0.0, rates=fall['rates'], minijob_grenze=fall['minijob_grenze']
+    )
+    grenze = MINIJOB_GRENZE if fall['minijob_grenze'] is None else fall['minijob_grenze']
+    zulaessig = (stunden.sum(axis=1) <= fall['stundenbudget'] + 1e-9) \
+        & ((ergebnis['brutto_grundlohn_fuer_grenze'] > grenze).sum(axis=1) <= fall['erlaubte_ueberschreitungen'])
+    return ergebnis['netto'].sum(axis=1)[zulaessig].max()
+
+@pytest.mark.parametrize('seed', range(25))
+def test_plan_wie_erschoepfende_suche(seed):
+    fall = _fall(seed)
+    plan = plan_year(
+        fall['stundenbudget'], fall['verfuegbarkeit'], fall['grundlohn'], fall['erlaubte_ueberschreitungen'],
+        schritt=fall['schritt'], rates=fall['rates'], minijob_grenze=fall['minijob_grenze']
+    )
+    assert plan['netto_gesamt'][0] == pytest.approx(_erschoepfend(fall))
+    assert plan['stunden'][0].sum() <= fall['stundenbudget'] + 1e-9
+    assert np.all(plan['stunden'][0] <= fall['verfuegbarkeit'] + 1e-9)
+    assert plan['ueberschreitungen'][0] <= fall['erlaubte_ueberschreitungen']
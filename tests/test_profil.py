@@ -0,0 +1,36 @@
+import threading
+
+from lohnrechner.profil import Profiler
+
+def test_misst_nur_aktive_laeufe_des_threads():
+    profil = Profiler()
+    quadrat = profil.gemessen('quadrat')(lambda x: x * x)
+
+    profil.neuer_lauf()
+    assert quadrat(3) == 9 and profil.spannen() == []
+    profil.lauf_beenden()
+
+    bereit, fertig = threading.Event(), threading.Event()
+
+    def anderer_thread():
+        profil.neuer_lauf(aktiv=True)
+        bereit.set()
+        fertig.wait()
+        profil.lauf_beenden()
+
+    thread = threading.Thread(target=anderer_thread)
+    thread.start()
+    bereit.wait()
+    profil.neuer_lauf()
+    quadrat(2)
+    assert profil.spannen() == []  # ein aktiver Lauf in einem anderen Thread misst hier nicht mit
+    profil.lauf_beenden()
+    fertig.set()
+    thread.join()
+
+    profil.neuer_lauf(aktiv=True)
+    profil.neuer_lauf(aktiv=True)  # nicht beendeter Lauf, z. B. nach st.rerun
+    quadrat(2)
+    assert [spanne['aufrufe'] for spanne in profil.spannen()] == [1]
+    profil.lauf_beenden()
+    assert profil._aktive_laeufe == 0
@@ -0,0 +1,12 @@
+import numpy as np
+import pytest
+
+from lohnrechner.saetze import saetze_fuer_monat, saetze_fuer_ordinale
+
+@pytest.mark.parametrize('jahr, monat, satz', [
+    (2013, 1, 0.039), (2014, 12, 0.039), (2015, 1, 0.037), (2017, 12, 0.037), (2018, 1, 0.036), (2025, 6, 0.036)
+])
+def test_rentenversicherung_minijob_historie(jahr, monat, satz):
+    assert saetze_fuer_monat(jahr, monat)['rentenversicherung_minijob'] == satz
+    ordinale = np.array([jahr * 12 + monat - 1])
+    assert saetze_fuer_ordinale(ordinale)['rentenversicherung_minijob'][0] == satz
@@ -0,0 +1,15 @@
+import pandas as pd
+
+from lohnrechner.schichten import shifts_to_monthly
+
+def test_grundlohn_der_zeitlich_letzten_schicht():
+    schichten = pd.DataFrame({
+        'mitarbeiter': ['a', 'a', 'a'],
+        'beginn': pd.to_datetime(['2025-03-20 08:00', '2025-03-03 08:00', '2025-03-10 08:00']),
+        'ende': pd.to_datetime(['2025-03-20 12:00', '2025-03-03 12:00', '2025-03-10 12:00']),
+        'grundlohn': [14.0, 12.82, 13.5]
+    })
+    monatlich = shifts_to_monthly(schichten)
+    assert monatlich['grundlohn'].tolist() == [14.0]
+    assert monatlich['stunden'].tolist() == [12.0]
+    assert shifts_to_monthly(schichten.iloc[::-1])['grundlohn'].tolist() == [14.0]
@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+
+from lohnrechner.speicher import LohnDatenbank, frame_to_session, monthly_data_to_frame, over_limits_to_frame
+
+MONAT = {'grundlohn': 13.0, 'stunden': 10.0, 'sf_zuschlag': False, 'sf_zuschlag_stunden': 0.0,
+         'nacht_zuschlag': False, 'nacht_zuschlag_stunden': 0.0}
+
+@pytest.fixture
+def datenbank(tmp_path):
+    datenbank = LohnDatenbank(str(tmp_path / 'lohn.sqlite3'))
+    yield datenbank
+    datenbank.schliessen()
+
+def _ereignisse(datenbank, mitarbeiter='anna') -> list:
+    _, ereignisse = datenbank.historie(mitarbeiter)
+    return list(zip(ereignisse['jahr'].tolist(), ereignisse['monat'].tolist()))
+
+def _speichern(datenbank, jahr, over_limits, mitarbeiter='anna'):
+    datenbank.speichern(
+        monthly_data_to_frame({'Januar': MONAT}, mitarbeiter, jahr), over_limits_to_frame(over_limits, mitarbeiter)
+    )
+
+def test_laden_und_speichern_behaelt_aeltere_ueberschreitungen(datenbank):
+    alle = [(2023, 11), (2024, 3), (2024, 5), (2024, 7)]
+    datenbank.speichern(
+        monthly_data_to_frame({'Januar': MONAT}, 'anna', 2024),
+        pd.DataFrame({'mitarbeiter': 'anna', 'jahr': [j for j, _ in alle], 'monat': [m for _, m in alle]})
+    )
+    _speichern(datenbank, 2024, [], 'bert')
+
+    monatsdaten, ereignisse = datenbank.historie('anna', 2022, 2024)
+    _, over_limits = frame_to_session(monatsdaten, ereignisse, 'anna', 2024)
+    assert len([ol for ol in over_limits if ol['year'] != -1]) == 3
+    _speichern(datenbank, 2024, over_limits)
+    assert _ereignisse(datenbank) == alle
+
+    # Ein entfernter Platz wird im gespeicherten Zeitraum gelöscht, andere Mitarbeiter bleiben unberührt
+    _speichern(datenbank, 2024, over_limits[:2])
+    assert _ereignisse(datenbank) == alle[:3]
+    _speichern(datenbank, 2024, [])
+    assert _ereignisse(datenbank) == [(2023, 11)]
+    _speichern(datenbank, 2024, [{'month_index': 0, 'year': 2024}], 'bert')
+    assert _ereignisse(datenbank, 'bert') == [(2024, 1)] and _ereignisse(datenbank) == [(2023, 11)]
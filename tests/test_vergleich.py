@@ -0,0 +1,22 @@
+import pandas as pd
+
+from lohnrechner.vergleich import compare_runs
+
+def _lauf(brutto: list, netto: list) -> pd.DataFrame:
+    return pd.DataFrame({
+        'mitarbeiter': ['anna', 'bert'], 'jahr': 2025, 'monat': 3,
+        'brutto_grundlohn_fuer_grenze': brutto, 'zuschlage': 0.0, 'brutto_gesamt': brutto,
+        'rentenversicherung_abzug': 0.0, 'pauschale_abzuege': 0.0, 'gesamte_abzuege': 0.0, 'netto': netto
+    })
+
+def test_differenzen_in_verglichenen_cent():
+    alt = _lauf([555.996, 400.0], [419.21400000000006, 400.0])
+    neu = _lauf([556.014, 400.0], [419.2, 400.004])
+    ergebnis = compare_runs(alt, neu, grenze_alt=556.0, grenze_neu=556.0)
+
+    netto = ergebnis['felder'][ergebnis['felder']['feld'] == 'netto']
+    assert netto[['mitarbeiter', 'alt', 'neu', 'differenz']].values.tolist() == [['anna', 419.21, 419.2, -0.01]]
+    # 555,996 und 556,014 sind auf Cent 556,00 und 556,01: nur die zweite liegt über der Grenze
+    grenze = ergebnis['grenze']
+    assert grenze[['mitarbeiter', 'brutto_alt', 'brutto_neu', 'ueberschritten_neu']].values.tolist() \
+        == [['anna', 556.0, 556.01, True]]
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from lohnrechner.zeitjahr import evaluate_zeitjahr_frame, ordinal_als_datum, zeitjahr_auswerten
+
+def test_doppelte_monate_zaehlen_einmal():
+    df = pd.DataFrame({
+        'mitarbeiter': ['a', 'a', 'a'],
+        'jahr': [2025, 2025, 2025],
+        'monat': [1, 1, 2],
+        'brutto_grundlohn_fuer_grenze': [1000.0, 1000.0, 1000.0]
+    })
+    ergebnis = evaluate_zeitjahr_frame(df)
+    assert ergebnis.loc['a', 'anzahl_ueberschreitungen'] == 2
+    assert pd.isna(ergebnis.loc['a', 'statusverlust'])
+    assert zeitjahr_auswerten([2025 * 12, 2025 * 12, 2025 * 12 + 1])['verlust'] is None
+
+def test_frame_wie_skalar():
+    rng = np.random.default_rng(0)
+    n = 5000
+    df = pd.DataFrame({
+        'mitarbeiter': rng.integers(0, 200, n),
+        'jahr': rng.integers(2023, 2026, n),
+        'monat': rng.integers(1, 13, n),  # doppelte Mitarbeiter-Monate sind gewollt
+        'brutto_grundlohn_fuer_grenze': np.where(rng.random(n) < 0.15, 1000.0, 100.0)
+    })
+    ergebnis = evaluate_zeitjahr_frame(df)
+
+    ueber = df[df['brutto_grundlohn_fuer_grenze'] > 600]
+    for mitarbeiter, zeile in ergebnis.iterrows():
+        teil = ueber[ueber['mitarbeiter'] == mitarbeiter]
+        ordinale = (teil['jahr'] * 12 + teil['monat'] - 1).to_numpy()
+        erwartet = zeitjahr_auswerten(ordinale)
+        assert zeile['anzahl_ueberschreitungen'] == np.unique(ordinale).size
+        if erwartet['verlust'] is None:
+            assert pd.isna(zeile['statusverlust'])
+        else:
+            assert zeile['statusverlust'] == ordinal_als_datum([erwartet['verlust']])[0]